@@ -6,9 +6,16 @@ into Python AST nodes that can be compiled and executed.
 """
 
 import ast
+import copy
+import hashlib
+import itertools
+import operator
 import os
+import pickle
+import sys
 from contextvars import ContextVar
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Optional, cast
 
 from spork.compiler.macros import (
@@ -23,6 +30,7 @@ from spork.compiler.macros import (
 
 # Import from compiler modules
 from spork.compiler.reader import (
+    SourceList,
     SourceLocation,
     copy_location,
     get_source_location,
@@ -77,10 +85,28 @@ _gensym_counter = 0
 
 
 def gensym(prefix="__spork_"):
-    """Generate a unique symbol name for temporary variables."""
+    """
+    Generate a unique symbol name for temporary variables.
+
+    Names are interned so every Name node that refers to the same temp
+    shares one string object.
+    """
     global _gensym_counter
     _gensym_counter += 1
-    return f"{prefix}{_gensym_counter}"
+    return sys.intern(f"{prefix}{_gensym_counter}")
+
+
+def gensym_batch(prefixes):
+    """
+    Generate one unique symbol name per prefix, bumping the counter once.
+
+    Equivalent to [gensym(p) for p in prefixes].
+    """
+    global _gensym_counter
+    base = _gensym_counter
+    _gensym_counter += len(prefixes)
+    intern = sys.intern
+    return [intern(f"{p}{base + i}") for i, p in enumerate(prefixes, 1)]
 
 
 # === Type Annotation Compilation ===
@@ -109,21 +135,11 @@ def compile_type_annotation(type_expr):
         name = type_expr.name
         # Check for dotted name like typing.List
         if "." in name:
-            # Split into parts and build attribute chain
-            parts = name.split(".")
-            # Start with the first part as a Name
-            result = ast.Name(id=normalize_name(parts[0]), ctx=ast.Load())
-            # Chain the rest as Attribute accesses
-            for part in parts[1:]:
-                result = ast.Attribute(
-                    value=result,
-                    attr=normalize_name(part),
-                    ctx=ast.Load(),
-                )
-            return result
+            # Build attribute chain from the normalized parts
+            return _attr_chain(_dotted_parts(name))
         else:
             # Simple type: int, str, MyClass, etc.
-            return ast.Name(id=normalize_name(name), ctx=ast.Load())
+            return ast.Name(id=normalize_name(name), ctx=_LOAD)
 
     elif isinstance(type_expr, list) and len(type_expr) >= 1:
         # Generic type: (List int) -> List[int]
@@ -147,14 +163,14 @@ def compile_type_annotation(type_expr):
             # Create a tuple of type args
             slice_node = ast.Tuple(
                 elts=[compile_type_annotation(arg) for arg in type_args],
-                ctx=ast.Load(),
+                ctx=_LOAD,
             )
 
         # Create subscript: List[int] or Dict[str, int]
         return ast.Subscript(
             value=base_node,
             slice=slice_node,
-            ctx=ast.Load(),
+            ctx=_LOAD,
         )
 
     else:
@@ -275,10 +291,46 @@ def extract_decorators_and_type(decorated_list):
     return decorators, is_async, is_generator, return_type
 
 
+def compile_decorator_list(decorators):
+    """
+    Compile decorator forms from extract_decorators_and_type to AST nodes.
+
+    - ^staticmethod -> @staticmethod
+    - ^(route "/api") -> @route("/api")
+    """
+    if not decorators:
+        return []
+    for dec in decorators:
+        if not (isinstance(dec, Symbol) or (isinstance(dec, list) and dec)):
+            raise SyntaxError(f"Invalid decorator expression: {dec!r}")
+    _normalize = normalize_name
+    return [
+        ast.Name(id=_normalize(dec.name), ctx=_LOAD)
+        if isinstance(dec, Symbol)
+        else compile_expr(dec)
+        for dec in decorators
+    ]
+
+
 @dataclass
 class CompilationContext:
     """Context for tracking nested function definitions and namespace during compilation."""
 
+    __slots__ = (
+        "nested_functions",
+        "current_ns",
+        "current_file",
+        "ns_aliases",
+        "ns_refers",
+        "require_stmts",
+        "scope_stack",
+        "nonlocal_stack",
+        "source_hash",
+        "type_pattern_cache",
+        "keyword_constants",
+        "pending_constants",
+    )
+
     def __init__(self):
         self.nested_functions: list[ast.FunctionDef] = []
         self.current_ns: Optional[str] = None  # Current namespace name
@@ -288,6 +340,14 @@ class CompilationContext:
         self.require_stmts: list[ast.stmt] = []  # Import statements from :require
         self.scope_stack: list[set] = []
         self.nonlocal_stack: list[set] = []
+        self.source_hash: Optional[str] = None  # Hash of the source being compiled
+        # Compiled (isinstance type, annotation) pairs for ^Type patterns
+        self.type_pattern_cache: dict[str, tuple[ast.expr, ast.expr]] = {}
+        # Keyword name -> module-level constant for pattern keywords
+        # (None outside compile_module, where nothing would define them)
+        self.keyword_constants: Optional[dict[str, str]] = None
+        # Module-level constant definitions not yet emitted
+        self.pending_constants: list[ast.stmt] = []
 
     def add_function(self, func_def):
         """Add a nested function definition to be injected later."""
@@ -299,6 +359,47 @@ class CompilationContext:
         self.nested_functions.clear()
         return funcs
 
+    def hoist_keyword(self, name):
+        """
+        Return the module-level constant holding Keyword(name), queueing its
+        definition the first time the keyword is seen.
+        """
+        var = self.keyword_constants.get(name)
+        if var is None:
+            if name.isidentifier():
+                var = f"__kw_{name}"
+            else:
+                var = f"__kwx_{name.encode('utf-8').hex()}"
+            self.keyword_constants[name] = var
+            self.pending_constants.append(
+                ast.Assign(
+                    targets=[ast.Name(id=var, ctx=_STORE)],
+                    value=ast.Call(
+                        func=ast.Name(id="Keyword", ctx=_LOAD),
+                        args=[ast.Constant(value=name)],
+                        keywords=[],
+                    ),
+                )
+            )
+        return var
+
+    def hoist_constant(self, prefix, value):
+        """
+        Queue a module-level `<gensym> = value` definition and return the
+        generated name. Only valid while keyword_constants is not None.
+        """
+        var = gensym(prefix)
+        self.pending_constants.append(
+            ast.Assign(targets=[ast.Name(id=var, ctx=_STORE)], value=value)
+        )
+        return var
+
+    def get_and_clear_constants(self):
+        """Get all queued module-level constant definitions and clear the list."""
+        stmts = self.pending_constants[:]
+        self.pending_constants.clear()
+        return stmts
+
     def add_require_stmt(self, stmt):
         """Add an import statement from :require processing."""
         self.require_stmts.append(stmt)
@@ -358,7 +459,7 @@ class CompilationContext:
         return set()
 
 
-@dataclass
+@dataclass(slots=True)
 class LoopContext:
     """Context for tracking loop variables during loop/recur compilation."""
 
@@ -417,6 +518,40 @@ def flatten_stmts(stmts):
     return result
 
 
+def _extend_stmt(out, s):
+    """
+    Add a compiled statement result (a node, a possibly nested list of
+    nodes, or None) to out; the common single-node case skips
+    flatten_stmts.
+    """
+    if isinstance(s, list):
+        out.extend(flatten_stmts(s))
+    elif s is not None:
+        out.append(s)
+
+
+def _set_locations(nodes, loc):
+    """
+    Give every node in nodes the source location loc, like calling
+    set_location on each, checking loc once for the whole group.
+    """
+    if loc is None or loc.line <= 0:
+        return nodes
+    line, col = loc.line, loc.col
+    if loc.end_line > 0:
+        end_line, end_col = loc.end_line, loc.end_col
+        for node in nodes:
+            node.lineno = line
+            node.col_offset = col
+            node.end_lineno = end_line
+            node.end_col_offset = end_col
+    else:
+        for node in nodes:
+            node.lineno = line
+            node.col_offset = col
+    return nodes
+
+
 def contains_yield(nodes):
     """
     Check if any of the given AST nodes (or their children) contain
@@ -436,6 +571,88 @@ def contains_yield(nodes):
     return False
 
 
+# === Expression contexts ===
+
+# Load/Store carry no state, so every generated node shares one instance of
+# each (as the operator tables below share their operator nodes)
+_LOAD = ast.Load()
+_STORE = ast.Store()
+
+
+def _load(name):
+    """Build a Name node reading name."""
+    return ast.Name(id=name, ctx=_LOAD)
+
+
+def _store(name):
+    """Build a Name node assigning name."""
+    return ast.Name(id=name, ctx=_STORE)
+
+
+def _attr_call(receiver, method, args=()):
+    """Build a receiver.method(*args) call node; receiver is an expression."""
+    return ast.Call(
+        func=ast.Attribute(value=receiver, attr=method, ctx=_LOAD),
+        args=list(args),
+        keywords=[],
+    )
+
+
+@lru_cache(maxsize=4096)
+def _dotted_parts(name):
+    """Split a dotted symbol name into its normalized parts: a.b-c -> (a, b_c)."""
+    return tuple(map(normalize_name, name.split(".")))
+
+
+def _attr_chain(parts):
+    """Build a Load of parts[0].parts[1]... from normalized name parts."""
+    node = _load(parts[0])
+    for attr in parts[1:]:
+        node = ast.Attribute(value=node, attr=attr, ctx=_LOAD)
+    return node
+
+
+# Parameter list of the zero-argument wrapper functions behind if/let/try/do,
+# loop and comprehension expressions; never mutated, so it is shared too
+_EMPTY_ARGS = ast.arguments(
+    posonlyargs=[],
+    args=[],
+    vararg=None,
+    kwonlyargs=[],
+    kw_defaults=[],
+    kwarg=None,
+    defaults=[],
+)
+
+
+def _one_arg(name):
+    """
+    Parameter list of a wrapper function taking the single positional
+    parameter name (match targets, catch handlers).
+    """
+    return ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name, annotation=None)],
+        vararg=None,
+        kwonlyargs=[],
+        kw_defaults=[],
+        kwarg=None,
+        defaults=[],
+    )
+
+
+def _interned(names):
+    """
+    Intern the names of a head-name table (a dict or a set of names). The
+    reader interns symbol names, so a lookup with a parsed head name finds
+    its key by identity instead of comparing characters; this matters for
+    names like "set!" or "async-with" that Python does not intern itself.
+    """
+    if isinstance(names, dict):
+        return {sys.intern(name): value for name, value in names.items()}
+    return frozenset(sys.intern(name) for name in names)
+
+
 # === Operator mappings ===
 
 BINARY_OPS = {
@@ -472,6 +689,117 @@ BOOL_OPS = {
     "or": ast.Or(),
 }
 
+# Operator of the `not x` UnaryOps built throughout pattern matching
+_NOT_OP = ast.Not()
+
+
+# === Constant folding ===
+
+# Returned by _fold_operator when a form is left to runtime
+_NOT_FOLDED = object()
+
+# Literal value types an operator form may be folded over
+_FOLD_TYPES = frozenset({bool, int, float, str, type(None)})
+
+# Longest string a fold may produce; longer results stay runtime expressions
+_MAX_FOLDED_STR = 4096
+
+
+def _fold_mul(a, b):
+    """Multiply, refusing string repeats longer than _MAX_FOLDED_STR."""
+    if isinstance(a, str) or isinstance(b, str):
+        text, count = (a, b) if isinstance(a, str) else (b, a)
+        if isinstance(count, int) and len(text) * count > _MAX_FOLDED_STR:
+            raise OverflowError("folded string too long")
+    return a * b
+
+
+def _fold_mod(a, b):
+    """Modulo of numbers only; string formatting is left to runtime."""
+    if isinstance(a, str):
+        raise TypeError("not folding string formatting")
+    return a % b
+
+
+# Arithmetic folded left-to-right like the BinOp chain; ** and the shifts
+# are left to runtime, where literal operands can build huge values
+_FOLD_BINARY = _interned(
+    {
+        "+": operator.add,
+        "-": operator.sub,
+        "*": _fold_mul,
+        "/": operator.truediv,
+        "//": operator.floordiv,
+        "%": _fold_mod,
+        "|": operator.or_,
+        "^": operator.xor,
+        "&": operator.and_,
+    }
+)
+
+# Comparisons folded like a Python comparison chain; is/is-not depend on
+# object identity and are left to runtime
+_FOLD_COMPARE = _interned(
+    {
+        "=": operator.eq,
+        "!=": operator.ne,
+        "not=": operator.ne,
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+        "in": lambda a, b: a in b,
+        "not-in": lambda a, b: a not in b,
+    }
+)
+
+
+def _fold_operator(head_name, operands):
+    """
+    Evaluate an operator form at compile time when every operand compiled
+    to a literal Constant, e.g. (+ (* 2 3) 4) -> 10 or (= 1 1) -> True.
+
+    Returns the value, or _NOT_FOLDED when an operand is not a literal or
+    evaluating raises (such as division by zero), so the error still
+    happens at runtime.
+    """
+    values = []
+    for node in operands:
+        if type(node) is not ast.Constant or type(node.value) not in _FOLD_TYPES:
+            return _NOT_FOLDED
+        values.append(node.value)
+    try:
+        if head_name in _FOLD_BINARY:
+            op = _FOLD_BINARY[head_name]
+            result = values[0]
+            for value in values[1:]:
+                result = op(result, value)
+        elif head_name in _FOLD_COMPARE:
+            op = _FOLD_COMPARE[head_name]
+            for left, right in zip(values, values[1:]):
+                result = op(left, right)
+                if not result:
+                    break
+        elif head_name == "and":
+            for result in values:
+                if not result:
+                    break
+        elif head_name == "or":
+            for result in values:
+                if result:
+                    break
+        elif head_name == "not":
+            result = not values[0]
+        else:
+            return _NOT_FOLDED
+    except (ArithmeticError, TypeError, ValueError):
+        return _NOT_FOLDED
+    if type(result) not in _FOLD_TYPES:
+        return _NOT_FOLDED
+    if isinstance(result, str) and len(result) > _MAX_FOLDED_STR:
+        return _NOT_FOLDED
+    return result
+
 
 # === Quote and Quasiquote ===
 
@@ -489,7 +817,7 @@ def compile_quote(form):
     # Symbols become Symbol(...) constructor calls
     if isinstance(form, Symbol):
         return ast.Call(
-            func=ast.Name(id="Symbol", ctx=ast.Load()),
+            func=ast.Name(id="Symbol", ctx=_LOAD),
             args=[ast.Constant(value=form.name)],
             keywords=[],
         )
@@ -497,7 +825,7 @@ def compile_quote(form):
     # Keywords become Keyword(...) constructor calls
     if isinstance(form, Keyword):
         return ast.Call(
-            func=ast.Name(id="Keyword", ctx=ast.Load()),
+            func=ast.Name(id="Keyword", ctx=_LOAD),
             args=[ast.Constant(value=form.name)],
             keywords=[],
         )
@@ -510,7 +838,7 @@ def compile_quote(form):
         result = ast.Constant(value=None)
         for item in reversed(form):
             result = ast.Call(
-                func=ast.Name(id="cons", ctx=ast.Load()),
+                func=ast.Name(id="cons", ctx=_LOAD),
                 args=[compile_quote(item), result],
                 keywords=[],
             )
@@ -520,7 +848,7 @@ def compile_quote(form):
     if isinstance(form, VectorLiteral):
         elements = [compile_quote(item) for item in form.items]
         return ast.Call(
-            func=ast.Name(id="vec", ctx=ast.Load()),
+            func=ast.Name(id="vec", ctx=_LOAD),
             args=elements,
             keywords=[],
         )
@@ -536,7 +864,7 @@ def compile_quote(form):
                 args.append(compile_quote(k))
             args.append(compile_quote(v))
         return ast.Call(
-            func=ast.Name(id="hash_map", ctx=ast.Load()),
+            func=ast.Name(id="hash_map", ctx=_LOAD),
             args=args,
             keywords=[],
         )
@@ -544,9 +872,9 @@ def compile_quote(form):
     # SetLiterals become hash_set(...) calls for PSet
     if isinstance(form, SetLiteral):
         elements = [compile_quote(item) for item in form.items]
-        list_node = ast.List(elts=elements, ctx=ast.Load())
+        list_node = ast.List(elts=elements, ctx=_LOAD)
         return ast.Call(
-            func=ast.Name(id="hash_set", ctx=ast.Load()),
+            func=ast.Name(id="hash_set", ctx=_LOAD),
             args=[list_node],
             keywords=[],
         )
@@ -597,14 +925,14 @@ def compile_quasiquote(form, gensym_map=None):
                 gensym_map[name] = f"__{base}_{_auto_gensym_counter}__"
             name = gensym_map[name]
         return ast.Call(
-            func=ast.Name(id="Symbol", ctx=ast.Load()),
+            func=ast.Name(id="Symbol", ctx=_LOAD),
             args=[ast.Constant(value=name)],
             keywords=[],
         )
 
     if isinstance(form, Keyword):
         return ast.Call(
-            func=ast.Name(id="Keyword", ctx=ast.Load()),
+            func=ast.Name(id="Keyword", ctx=_LOAD),
             args=[ast.Constant(value=form.name)],
             keywords=[],
         )
@@ -629,11 +957,11 @@ def compile_quasiquote(form, gensym_map=None):
 
         # Build the result list
         if not result_parts:
-            return ast.List(elts=[], ctx=ast.Load())
+            return ast.List(elts=[], ctx=_LOAD)
 
         # If no splicing, just return a list
         if all(kind == "item" for kind, _ in result_parts):
-            return ast.List(elts=[expr for _, expr in result_parts], ctx=ast.Load())
+            return ast.List(elts=[expr for _, expr in result_parts], ctx=_LOAD)
 
         # If there's splicing, we need to concatenate lists
         # Start with an empty list and extend/append as needed
@@ -645,19 +973,19 @@ def compile_quasiquote(form, gensym_map=None):
                 current_items.append(expr)
             else:  # splice
                 if current_items:
-                    list_parts.append(ast.List(elts=current_items, ctx=ast.Load()))
+                    list_parts.append(ast.List(elts=current_items, ctx=_LOAD))
                     current_items = []
                 # Convert the spliced expression to a list if needed
                 list_parts.append(
                     ast.Call(
-                        func=ast.Name(id="list", ctx=ast.Load()),
+                        func=ast.Name(id="list", ctx=_LOAD),
                         args=[expr],
                         keywords=[],
                     )
                 )
 
         if current_items:
-            list_parts.append(ast.List(elts=current_items, ctx=ast.Load()))
+            list_parts.append(ast.List(elts=current_items, ctx=_LOAD))
 
         # Sum all the list parts together
         if len(list_parts) == 1:
@@ -673,7 +1001,7 @@ def compile_quasiquote(form, gensym_map=None):
         # Recursively quasiquote the items
         items_expr = compile_quasiquote(form.items, gensym_map)
         return ast.Call(
-            func=ast.Name(id="VectorLiteral", ctx=ast.Load()),
+            func=ast.Name(id="VectorLiteral", ctx=_LOAD),
             args=[items_expr],
             keywords=[],
         )
@@ -684,10 +1012,10 @@ def compile_quasiquote(form, gensym_map=None):
         for k, v in form.pairs:
             key_expr = compile_quasiquote(k, gensym_map)
             val_expr = compile_quasiquote(v, gensym_map)
-            pairs.append(ast.Tuple(elts=[key_expr, val_expr], ctx=ast.Load()))
-        pairs_list = ast.List(elts=pairs, ctx=ast.Load())
+            pairs.append(ast.Tuple(elts=[key_expr, val_expr], ctx=_LOAD))
+        pairs_list = ast.List(elts=pairs, ctx=_LOAD)
         return ast.Call(
-            func=ast.Name(id="MapLiteral", ctx=ast.Load()),
+            func=ast.Name(id="MapLiteral", ctx=_LOAD),
             args=[pairs_list],
             keywords=[],
         )
@@ -695,9 +1023,9 @@ def compile_quasiquote(form, gensym_map=None):
     # SetLiterals become hash_set(...) calls
     if isinstance(form, SetLiteral):
         elements = [compile_quasiquote(item, gensym_map) for item in form.items]
-        list_node = ast.List(elts=elements, ctx=ast.Load())
+        list_node = ast.List(elts=elements, ctx=_LOAD)
         return ast.Call(
-            func=ast.Name(id="hash_set", ctx=ast.Load()),
+            func=ast.Name(id="hash_set", ctx=_LOAD),
             args=[list_node],
             keywords=[],
         )
@@ -708,22 +1036,34 @@ def compile_quasiquote(form, gensym_map=None):
 # === Analysis & Lowering ===
 
 
-def compile_module(forms, filename="<string>"):
+def compile_module(forms, filename="<string>", source_hash=None):
     """
     Phase 3 & 4: Analyze and Lower
     Compile forms into a Python AST module.
+
+    If source_hash is given and the AST cache is enabled, top-level defn
+    forms are looked up in the on-disk cache (see compile_defn_cached).
     """
     # Reset the compilation context for this compilation
-    _compile_context_var.set(CompilationContext())
+    ctx = CompilationContext()
+    ctx.source_hash = source_hash
+    ctx.keyword_constants = {}
+    _compile_context_var.set(ctx)
 
     body: list[ast.stmt] = []
-    for form in forms:
-        stmts = compile_toplevel(form)
-        # Get any nested functions that were generated during this form's compilation
-        nested = get_compile_context().get_and_clear_functions()
-        # Add nested functions before the statements that reference them
-        body.extend(nested)
-        body.extend(flatten_stmts([stmts]))
+    try:
+        for form in forms:
+            stmts = compile_toplevel(form)
+            ctx = get_compile_context()
+            # Define module-level constants first needed by this form
+            body.extend(ctx.get_and_clear_constants())
+            # Get any nested functions that were generated during this form's compilation
+            nested = ctx.get_and_clear_functions()
+            # Add nested functions before the statements that reference them
+            body.extend(nested)
+            _extend_stmt(body, stmts)
+    finally:
+        get_compile_context().keyword_constants = None
 
     mod = ast.Module(body=body, type_ignores=[])
     ast.fix_missing_locations(mod)
@@ -802,7 +1142,7 @@ def compile_ns(args, form_loc=None):
                         # This will be: __spork_require__("my.lib.helpers")
                         load_call = ast.Expr(
                             value=ast.Call(
-                                func=ast.Name(id="__spork_require__", ctx=ast.Load()),
+                                func=ast.Name(id="__spork_require__", ctx=_LOAD),
                                 args=[ast.Constant(value=req_ns)],
                                 keywords=[],
                             )
@@ -815,11 +1155,9 @@ def compile_ns(args, form_loc=None):
                         ctx.ns_aliases[alias] = req_ns
                         # Generate: alias = __spork_ns_env__("req_ns")
                         alias_assign = ast.Assign(
-                            targets=[
-                                ast.Name(id=normalize_name(alias), ctx=ast.Store())
-                            ],
+                            targets=[ast.Name(id=normalize_name(alias), ctx=_STORE)],
                             value=ast.Call(
-                                func=ast.Name(id="__spork_ns_env__", ctx=ast.Load()),
+                                func=ast.Name(id="__spork_ns_env__", ctx=_LOAD),
                                 args=[ast.Constant(value=req_ns)],
                                 keywords=[],
                             ),
@@ -833,13 +1171,11 @@ def compile_ns(args, form_loc=None):
                             # Generate: __spork_refer_all__("req_ns", locals())
                             refer_call = ast.Expr(
                                 value=ast.Call(
-                                    func=ast.Name(
-                                        id="__spork_refer_all__", ctx=ast.Load()
-                                    ),
+                                    func=ast.Name(id="__spork_refer_all__", ctx=_LOAD),
                                     args=[
                                         ast.Constant(value=req_ns),
                                         ast.Call(
-                                            func=ast.Name(id="locals", ctx=ast.Load()),
+                                            func=ast.Name(id="locals", ctx=_LOAD),
                                             args=[],
                                             keywords=[],
                                         ),
@@ -867,14 +1203,10 @@ def compile_ns(args, form_loc=None):
                                 # sym = __spork_ns_get__("req_ns", "sym")
                                 sym_assign = ast.Assign(
                                     targets=[
-                                        ast.Name(
-                                            id=normalize_name(sym), ctx=ast.Store()
-                                        )
+                                        ast.Name(id=normalize_name(sym), ctx=_STORE)
                                     ],
                                     value=ast.Call(
-                                        func=ast.Name(
-                                            id="__spork_ns_get__", ctx=ast.Load()
-                                        ),
+                                        func=ast.Name(id="__spork_ns_get__", ctx=_LOAD),
                                         args=[
                                             ast.Constant(value=req_ns),
                                             ast.Constant(value=sym),
@@ -1086,6 +1418,137 @@ def compile_ns(args, form_loc=None):
     return stmts
 
 
+# === Persistent defn AST cache ===
+
+# Directory for pickled defn ASTs, or None when the cache is disabled
+_ast_cache_dir: Optional[str] = None
+
+# Hit/miss counters for the current build
+_ast_cache_stats = {"hits": 0, "misses": 0}
+
+
+def enable_ast_cache(cache_dir):
+    """Enable the on-disk defn AST cache, storing entries under cache_dir."""
+    global _ast_cache_dir
+    _ast_cache_dir = os.fspath(cache_dir)
+    reset_ast_cache_stats()
+
+
+def disable_ast_cache():
+    """Disable the on-disk defn AST cache."""
+    global _ast_cache_dir
+    _ast_cache_dir = None
+
+
+def get_ast_cache_stats() -> dict[str, int]:
+    """Return a copy of the AST cache hit/miss counters."""
+    return dict(_ast_cache_stats)
+
+
+def reset_ast_cache_stats():
+    """Reset the AST cache hit/miss counters."""
+    _ast_cache_stats["hits"] = 0
+    _ast_cache_stats["misses"] = 0
+
+
+@lru_cache(maxsize=None)
+def _compiler_digest():
+    """
+    Hash of every module in the spork.compiler package. The reader, the
+    builtin macros and codegen all shape the generated AST, so editing any
+    of them invalidates the AST cache.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            h.update(name.encode("utf-8"))
+            with open(os.path.join(package_dir, name), "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def _defn_cache_key(form, source_hash):
+    """
+    Build the cache key for a top-level defn form.
+
+    The generated AST depends on more than the form itself: gensym and
+    anonymous function names come from process-global counters, so the
+    counter values at entry are part of the key. So are the compiler
+    version and a hash of the spork.compiler sources, so entries written
+    by a different compiler are never reused. A hit therefore yields exactly the
+    AST a fresh compile would have produced.
+    """
+    from spork import __version__
+    from spork.compiler.loader import COMPILER_CACHE_VERSION
+
+    loc = get_source_location(form)
+    h = hashlib.sha256()
+    for part in (
+        source_hash,
+        __version__,
+        COMPILER_CACHE_VERSION,
+        _compiler_digest(),
+        sys.version,
+        repr(form),
+        repr(loc and (loc.line, loc.col, loc.end_line, loc.end_col)),
+        str(_fn_counter),
+        str(_gensym_counter),
+    ):
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def compile_defn_cached(form, source_hash):
+    """
+    Compile a top-level (defn ...) form, reusing a pickled AST when possible.
+
+    Entries live in the directory given to enable_ast_cache() as
+    <key>.pkl and hold the compiled function node together with the name
+    counters after compilation and the module-level constants it introduced.
+    Unreadable or stale entries are treated as misses; failures to write
+    the cache never fail the compile.
+    """
+    global _fn_counter, _gensym_counter
+
+    assert _ast_cache_dir is not None
+    key = _defn_cache_key(form, source_hash)
+    path = os.path.join(_ast_cache_dir, key + ".pkl")
+    ctx = get_compile_context()
+
+    try:
+        with open(path, "rb") as f:
+            func, fn_counter, gensym_counter, keywords, constants = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+    else:
+        _ast_cache_stats["hits"] += 1
+        _fn_counter = fn_counter
+        _gensym_counter = gensym_counter
+        ctx.keyword_constants.update(keywords)
+        ctx.pending_constants.extend(constants)
+        return func
+
+    _ast_cache_stats["misses"] += 1
+    known_keywords = len(ctx.keyword_constants)
+    known_constants = len(ctx.pending_constants)
+    func = compile_defn(form[1:], get_source_location(form))
+    keywords = dict(list(ctx.keyword_constants.items())[known_keywords:])
+    constants = ctx.pending_constants[known_constants:]
+
+    try:
+        os.makedirs(_ast_cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((func, _fn_counter, _gensym_counter, keywords, constants), f)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        pass
+
+    return func
+
+
 def compile_toplevel(form):
     """Compile a top-level form."""
     form_loc = get_source_location(form)
@@ -1101,6 +1564,9 @@ def compile_toplevel(form):
         if is_symbol(head, "def"):
             return compile_def(form[1:], form_loc)
         if is_symbol(head, "defn"):
+            source_hash = get_compile_context().source_hash
+            if _ast_cache_dir is not None and source_hash is not None:
+                return compile_defn_cached(form, source_hash)
             return compile_defn(form[1:], form_loc)
         if is_symbol(head, "defclass"):
             return compile_defclass(form[1:], form_loc)
@@ -1114,6 +1580,10 @@ def compile_toplevel(form):
             return compile_while(form[1:], form_loc)
         if is_symbol(head, "let"):
             return compile_let_stmt(form[1:], form_loc)
+        if is_symbol(head, "if"):
+            # The value is discarded, so no conditional expression or
+            # wrapper function is needed
+            return compile_if_stmt(form[1:], form_loc)
         if is_symbol(head, "with"):
             return compile_with(form[1:], form_loc)
         if is_symbol(head, "async-with"):
@@ -1129,7 +1599,7 @@ def compile_toplevel(form):
             stmts = []
             for f in inner:
                 s = compile_stmt(f)
-                stmts.extend(flatten_stmts([s]))
+                _extend_stmt(stmts, s)
             return stmts
     # fallback: expression statement
     expr = compile_expr(form)
@@ -1153,7 +1623,7 @@ def _compile_std_import(
     # Call __spork_require__ to load the namespace
     require_call = ast.Expr(
         value=ast.Call(
-            func=ast.Name(id="__spork_require__", ctx=ast.Load()),
+            func=ast.Name(id="__spork_require__", ctx=_LOAD),
             args=[ast.Constant(value=module_name)],
             keywords=[],
         )
@@ -1164,9 +1634,9 @@ def _compile_std_import(
     # Bind to alias (or last segment of module name)
     bind_name = alias if alias else module_name.split(".")[-1]
     bind_stmt = ast.Assign(
-        targets=[ast.Name(id=normalize_name(bind_name), ctx=ast.Store())],
+        targets=[ast.Name(id=normalize_name(bind_name), ctx=_STORE)],
         value=ast.Call(
-            func=ast.Name(id="__spork_ns_env__", ctx=ast.Load()),
+            func=ast.Name(id="__spork_ns_env__", ctx=_LOAD),
             args=[ast.Constant(value=module_name)],
             keywords=[],
         ),
@@ -1346,7 +1816,7 @@ def _make_specialized_vector_call(constructor, vector_literal):
 
     # Build: vec_f64(args...) or vec_i64(args...)
     # These are available directly in the runtime environment
-    func = ast.Name(id=constructor, ctx=ast.Load())
+    func = ast.Name(id=constructor, ctx=_LOAD)
 
     return ast.Call(func=func, args=args, keywords=[])
 
@@ -1407,7 +1877,7 @@ def compile_def(args, form_loc=None):
     if type_annotation is not None and isinstance(pattern, Symbol):
         var_name = normalize_name(pattern.name)
         stmt = ast.AnnAssign(
-            target=ast.Name(id=var_name, ctx=ast.Store()),
+            target=ast.Name(id=var_name, ctx=_STORE),
             annotation=type_annotation,
             value=value,
             simple=1,  # Required for module-level annotations
@@ -1550,16 +2020,7 @@ def compile_defclass(args, form_loc=None):
         class_body.append(ast.Pass())
 
     # Compile decorator expressions
-    decorator_list = []
-    for dec in decorators:
-        if isinstance(dec, Symbol):
-            # Simple decorator: ^dataclass -> @dataclass
-            decorator_list.append(ast.Name(id=normalize_name(dec.name), ctx=ast.Load()))
-        elif isinstance(dec, list) and dec:
-            # Decorator with args: ^(decorator arg) -> @decorator(arg)
-            decorator_list.append(compile_expr(dec))
-        else:
-            raise SyntaxError(f"Invalid decorator expression: {dec!r}")
+    decorator_list = compile_decorator_list(decorators)
 
     node = ast.ClassDef(
         name=class_name,
@@ -1604,7 +2065,7 @@ def compile_field(args):
     type_expr = compile_expr(type_form)
 
     # Create annotated assignment: name: type or name: type = default
-    target = ast.Name(id=field_name, ctx=ast.Store())
+    target = ast.Name(id=field_name, ctx=_STORE)
 
     if default_form is not None:
         # name: type = default
@@ -1840,26 +2301,26 @@ def compile_pattern_dispatch_clause(
             _, pattern, type_expr = param_info
             # Get rest of args
             value_expr = ast.Subscript(
-                value=ast.Name(id="__args__", ctx=ast.Load()),
+                value=_load("__args__"),
                 slice=ast.Slice(
                     lower=ast.Constant(value=arg_index),
                     upper=None,
                     step=None,
                 ),
-                ctx=ast.Load(),
+                ctx=_LOAD,
             )
             # Type check if present
             if type_expr is not None:
-                type_ast = compile_expr(type_expr)
+                type_ast, type_annotation = compile_type_pattern_type(type_expr)
                 check = ast.If(
                     test=ast.BoolOp(
                         op=ast.And(),
                         values=[
-                            ast.Name(id=ok_var, ctx=ast.Load()),
+                            _load(ok_var),
                             ast.UnaryOp(
-                                op=ast.Not(),
+                                op=_NOT_OP,
                                 operand=ast.Call(
-                                    func=ast.Name(id="isinstance", ctx=ast.Load()),
+                                    func=_load("isinstance"),
                                     args=[value_expr, type_ast],
                                     keywords=[],
                                 ),
@@ -1868,7 +2329,7 @@ def compile_pattern_dispatch_clause(
                     ),
                     body=[
                         ast.Assign(
-                            targets=[ast.Name(id=ok_var, ctx=ast.Store())],
+                            targets=[_store(ok_var)],
                             value=ast.Constant(value=False),
                         )
                     ],
@@ -1876,20 +2337,27 @@ def compile_pattern_dispatch_clause(
                 )
                 stmts.append(check)
                 # Set current type annotation for bindings created by pattern check
-                current_type_annotation = compile_type_annotation(type_expr)
+                current_type_annotation = type_annotation
+                known_sequence = _is_sequence_pattern_type(type_ast)
             else:
                 current_type_annotation = None
+                known_sequence = False
             # Pattern match - pass type annotation for bindings
             stmts.extend(
                 compile_pattern_check(
-                    pattern, value_expr, ok_var, bindings_list, current_type_annotation
+                    pattern,
+                    value_expr,
+                    ok_var,
+                    bindings_list,
+                    current_type_annotation,
+                    known_sequence,
                 )
             )
 
         elif param_info[0] == "**":
             # Kwargs: pattern
             _, pattern, _ = param_info
-            value_expr = ast.Name(id="__kwargs__", ctx=ast.Load())
+            value_expr = _load("__kwargs__")
             stmts.extend(
                 compile_pattern_check(pattern, value_expr, ok_var, bindings_list)
             )
@@ -1898,22 +2366,22 @@ def compile_pattern_dispatch_clause(
             # Regular parameter: (pattern, _, type_expr)
             pattern, _, type_expr = param_info
             value_expr = ast.Subscript(
-                value=ast.Name(id="__args__", ctx=ast.Load()),
+                value=_load("__args__"),
                 slice=ast.Constant(value=arg_index),
-                ctx=ast.Load(),
+                ctx=_LOAD,
             )
             # Type check if present
             if type_expr is not None:
-                type_ast = compile_expr(type_expr)
+                type_ast, type_annotation = compile_type_pattern_type(type_expr)
                 check = ast.If(
                     test=ast.BoolOp(
                         op=ast.And(),
                         values=[
-                            ast.Name(id=ok_var, ctx=ast.Load()),
+                            _load(ok_var),
                             ast.UnaryOp(
-                                op=ast.Not(),
+                                op=_NOT_OP,
                                 operand=ast.Call(
-                                    func=ast.Name(id="isinstance", ctx=ast.Load()),
+                                    func=_load("isinstance"),
                                     args=[value_expr, type_ast],
                                     keywords=[],
                                 ),
@@ -1922,7 +2390,7 @@ def compile_pattern_dispatch_clause(
                     ),
                     body=[
                         ast.Assign(
-                            targets=[ast.Name(id=ok_var, ctx=ast.Store())],
+                            targets=[_store(ok_var)],
                             value=ast.Constant(value=False),
                         )
                     ],
@@ -1930,13 +2398,20 @@ def compile_pattern_dispatch_clause(
                 )
                 stmts.append(check)
                 # Set current type annotation for bindings created by pattern check
-                current_type_annotation = compile_type_annotation(type_expr)
+                current_type_annotation = type_annotation
+                known_sequence = _is_sequence_pattern_type(type_ast)
             else:
                 current_type_annotation = None
+                known_sequence = False
             # Pattern match - pass type annotation for bindings
             stmts.extend(
                 compile_pattern_check(
-                    pattern, value_expr, ok_var, bindings_list, current_type_annotation
+                    pattern,
+                    value_expr,
+                    ok_var,
+                    bindings_list,
+                    current_type_annotation,
+                    known_sequence,
                 )
             )
             arg_index += 1
@@ -1945,31 +2420,7 @@ def compile_pattern_dispatch_clause(
     match_body = []
 
     # Add bindings - now with type annotations when present
-    for binding in bindings_list:
-        if len(binding) == 3:
-            name, val_expr, type_annotation = binding
-        else:
-            # Backward compatibility
-            name, val_expr = binding
-            type_annotation = None
-
-        if type_annotation is not None:
-            # Emit annotated assignment: x: int = value
-            match_body.append(
-                ast.AnnAssign(
-                    target=ast.Name(id=normalize_name(name), ctx=ast.Store()),
-                    annotation=type_annotation,
-                    value=val_expr,
-                    simple=1,
-                )
-            )
-        else:
-            match_body.append(
-                ast.Assign(
-                    targets=[ast.Name(id=normalize_name(name), ctx=ast.Store())],
-                    value=val_expr,
-                )
-            )
+    match_body.extend(_make_binding_stmt(binding) for binding in bindings_list)
 
     # Save nested functions count before compiling body/guard
     ctx = get_compile_context()
@@ -1983,40 +2434,36 @@ def compile_pattern_dispatch_clause(
         body_stmts = []
         for f in body_forms[:-1]:
             s = compile_stmt(f)
-            body_stmts.extend(flatten_stmts([s]))
+            _extend_stmt(body_stmts, s)
 
         # Last form - return it
         last_form = body_forms[-1]
         if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
             head_name = last_form[0].name
             if head_name == "let":
-                body_stmts.extend(
-                    flatten_stmts([compile_let_stmt_with_return(last_form[1:])])
-                )
+                _extend_stmt(body_stmts, compile_let_stmt_with_return(last_form[1:]))
             elif head_name == "do":
-                body_stmts.extend(
-                    flatten_stmts([compile_do_stmt_with_return(last_form[1:])])
-                )
-            elif head_name in ("while", "for", "set!"):
-                body_stmts.extend(flatten_stmts([compile_stmt(last_form)]))
+                _extend_stmt(body_stmts, compile_do_stmt_with_return(last_form[1:]))
+            elif head_name in _TAIL_STMT_ONLY:
+                _extend_stmt(body_stmts, compile_stmt(last_form))
                 if not is_generator:
-                    body_stmts.append(ast.Return(value=ast.Constant(value=None)))
+                    body_stmts.append(ast.Return(value=None))
             elif head_name == "return":
-                body_stmts.extend(flatten_stmts([compile_stmt(last_form)]))
+                _extend_stmt(body_stmts, compile_stmt(last_form))
             else:
                 if is_generator:
-                    body_stmts.extend(flatten_stmts([compile_stmt(last_form)]))
+                    _extend_stmt(body_stmts, compile_stmt(last_form))
                 else:
                     body_stmts.append(ast.Return(value=compile_expr(last_form)))
         else:
             if is_generator:
-                body_stmts.extend(flatten_stmts([compile_stmt(last_form)]))
+                _extend_stmt(body_stmts, compile_stmt(last_form))
             else:
                 body_stmts.append(ast.Return(value=compile_expr(last_form)))
 
         # Extract nested functions
         nested_funcs = ctx.nested_functions[saved_funcs_count:]
-        ctx.nested_functions = ctx.nested_functions[:saved_funcs_count]
+        del ctx.nested_functions[saved_funcs_count:]
         match_body.extend(nested_funcs)
 
         # Wrap body in guard check
@@ -2030,46 +2477,42 @@ def compile_pattern_dispatch_clause(
         # No guard - compile body directly
         for f in body_forms[:-1]:
             s = compile_stmt(f)
-            match_body.extend(flatten_stmts([s]))
+            _extend_stmt(match_body, s)
 
         last_form = body_forms[-1]
         if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
             head_name = last_form[0].name
             if head_name == "let":
-                match_body.extend(
-                    flatten_stmts([compile_let_stmt_with_return(last_form[1:])])
-                )
+                _extend_stmt(match_body, compile_let_stmt_with_return(last_form[1:]))
             elif head_name == "do":
-                match_body.extend(
-                    flatten_stmts([compile_do_stmt_with_return(last_form[1:])])
-                )
-            elif head_name in ("while", "for", "set!"):
-                match_body.extend(flatten_stmts([compile_stmt(last_form)]))
+                _extend_stmt(match_body, compile_do_stmt_with_return(last_form[1:]))
+            elif head_name in _TAIL_STMT_ONLY:
+                _extend_stmt(match_body, compile_stmt(last_form))
                 if not is_generator:
-                    match_body.append(ast.Return(value=ast.Constant(value=None)))
+                    match_body.append(ast.Return(value=None))
             elif head_name == "return":
-                match_body.extend(flatten_stmts([compile_stmt(last_form)]))
+                _extend_stmt(match_body, compile_stmt(last_form))
             else:
                 if is_generator:
-                    match_body.extend(flatten_stmts([compile_stmt(last_form)]))
+                    _extend_stmt(match_body, compile_stmt(last_form))
                 else:
                     match_body.append(ast.Return(value=compile_expr(last_form)))
         else:
             if is_generator:
-                match_body.extend(flatten_stmts([compile_stmt(last_form)]))
+                _extend_stmt(match_body, compile_stmt(last_form))
             else:
                 match_body.append(ast.Return(value=compile_expr(last_form)))
 
         # Extract nested functions
         nested_funcs = ctx.nested_functions[saved_funcs_count:]
-        ctx.nested_functions = ctx.nested_functions[:saved_funcs_count]
+        del ctx.nested_functions[saved_funcs_count:]
         # Insert nested funcs at beginning of match_body
         match_body = list(nested_funcs) + match_body
 
     # Wrap in: if ok_var: <match_body>
     if match_body:
         inner_if = ast.If(
-            test=ast.Name(id=ok_var, ctx=ast.Load()),
+            test=_load(ok_var),
             body=match_body,  # type: ignore
             orelse=[],
         )
@@ -2092,7 +2535,7 @@ def compile_arity_body(params, body_forms):
     # Compile all but the last form as statements
     for f in body_forms[:-1]:
         stmts = compile_stmt(f)
-        body_nodes.extend(flatten_stmts([stmts]))
+        _extend_stmt(body_nodes, stmts)
 
     # Last form: try to return it as an expression, but handle let/do specially
     last_form = body_forms[-1]
@@ -2102,23 +2545,23 @@ def compile_arity_body(params, body_forms):
 
         if head_name == "let":
             let_stmts = compile_let_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([let_stmts]))
+            _extend_stmt(body_nodes, let_stmts)
         elif head_name == "do":
             do_stmts = compile_do_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([do_stmts]))
+            _extend_stmt(body_nodes, do_stmts)
         elif head_name == "try":
             try_stmts = compile_try_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([try_stmts]))
+            _extend_stmt(body_nodes, try_stmts)
         elif head_name == "with":
             with_stmt = compile_with_stmt_with_return(last_form[1:])
             body_nodes.append(with_stmt)
-        elif head_name in ("while", "for", "set!"):
+        elif head_name in _TAIL_STMT_ONLY:
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
-            body_nodes.append(ast.Return(value=ast.Constant(value=None)))
+            _extend_stmt(body_nodes, stmts)
+            body_nodes.append(ast.Return(value=None))
         elif head_name == "return":
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             body_nodes.append(ast.Return(value=compile_expr(last_form)))
     else:
@@ -2223,72 +2666,35 @@ def compile_multi_arity_defn(
     # __n__ = len(__args__)
     body_nodes.append(
         ast.Assign(
-            targets=[ast.Name(id="__n__", ctx=ast.Store())],
+            targets=[ast.Name(id="__n__", ctx=_STORE)],
             value=ast.Call(
-                func=ast.Name(id="len", ctx=ast.Load()),
-                args=[ast.Name(id="__args__", ctx=ast.Load())],
+                func=ast.Name(id="len", ctx=_LOAD),
+                args=[ast.Name(id="__args__", ctx=_LOAD)],
                 keywords=[],
             ),
         )
     )
 
-    # Build if/elif chain for dispatch
-    dispatch_cases = []
-
-    for params, body_forms, min_args, _, has_kwargs in fixed_arities:
-        # Condition: __n__ == min_args
-        test = ast.Compare(
-            left=ast.Name(id="__n__", ctx=ast.Load()),
-            ops=[ast.Eq()],
-            comparators=[ast.Constant(value=min_args)],
-        )
-
-        # Generate body for this arity
-        arity_body = compile_arity_dispatch_body(
-            params, body_forms, has_kwargs, is_generator
+    # Generate the body of each arity, fixed arities by arg count first
+    fixed_cases = [
+        (
+            min_args,
+            compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator),
         )
-        dispatch_cases.append((test, arity_body))
-
-    # Add variadic arity if present
+        for params, body_forms, min_args, _, has_kwargs in fixed_arities
+    ]
+    variadic_case = None
     if variadic_arities:
-        params, body_forms, min_args, has_vararg, has_kwargs = variadic_arities[0]
-        # Condition: __n__ >= min_args
-        test = ast.Compare(
-            left=ast.Name(id="__n__", ctx=ast.Load()),
-            ops=[ast.GtE()],
-            comparators=[ast.Constant(value=min_args)],
+        params, body_forms, min_args, _, has_kwargs = variadic_arities[0]
+        variadic_case = (
+            min_args,
+            compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator),
         )
-        arity_body = compile_arity_dispatch_body(
-            params, body_forms, has_kwargs, is_generator
-        )
-        dispatch_cases.append((test, arity_body))
 
-    # Build the if/elif/else chain
-    if dispatch_cases:
-        # Start with the else clause (error)
+    # Dispatch on __n__, raising TypeError when no arity matches
+    if arities:
         error_msg = f"{fn_name} called with wrong number of arguments"
-        else_body = [
-            ast.Raise(
-                exc=ast.Call(
-                    func=ast.Name(id="TypeError", ctx=ast.Load()),
-                    args=[ast.Constant(value=error_msg)],
-                    keywords=[],
-                ),
-                cause=None,
-            )
-        ]
-
-        # Build from the end
-        current_else: list[ast.stmt] = list(else_body)
-        for test, arity_body in reversed(dispatch_cases):
-            current_if = ast.If(
-                test=test,
-                body=arity_body,
-                orelse=current_else,
-            )
-            current_else = [current_if]
-
-        body_nodes.append(current_else[0])
+        body_nodes.append(_arity_dispatch(fixed_cases, variadic_case, error_msg))
 
     # Check for yield without ^generator annotation
     if contains_yield(body_nodes) and not is_generator:
@@ -2298,19 +2704,7 @@ def compile_multi_arity_defn(
         )
 
     # Compile decorator expressions
-    decorator_list = []
-    if decorators:
-        for dec in decorators:
-            if isinstance(dec, Symbol):
-                # Simple decorator: ^staticmethod -> @staticmethod
-                decorator_list.append(
-                    ast.Name(id=normalize_name(dec.name), ctx=ast.Load())
-                )
-            elif isinstance(dec, list) and dec:
-                # Decorator with args: ^(route "/api") -> @route("/api")
-                decorator_list.append(compile_expr(dec))
-            else:
-                raise SyntaxError(f"Invalid decorator expression: {dec!r}")
+    decorator_list = compile_decorator_list(decorators)
 
     if is_async:
         func = ast.AsyncFunctionDef(
@@ -2423,10 +2817,10 @@ def compile_multi_arity_pattern_defn(
     # __n__ = len(__args__)
     body_nodes.append(
         ast.Assign(
-            targets=[ast.Name(id="__n__", ctx=ast.Store())],
+            targets=[ast.Name(id="__n__", ctx=_STORE)],
             value=ast.Call(
-                func=ast.Name(id="len", ctx=ast.Load()),
-                args=[ast.Name(id="__args__", ctx=ast.Load())],
+                func=ast.Name(id="len", ctx=_LOAD),
+                args=[ast.Name(id="__args__", ctx=_LOAD)],
                 keywords=[],
             ),
         )
@@ -2440,7 +2834,7 @@ def compile_multi_arity_pattern_defn(
         group = arity_groups[arity]
         # Condition: __n__ == arity
         test = ast.Compare(
-            left=ast.Name(id="__n__", ctx=ast.Load()),
+            left=ast.Name(id="__n__", ctx=_LOAD),
             ops=[ast.Eq()],
             comparators=[ast.Constant(value=arity)],
         )
@@ -2460,7 +2854,7 @@ def compile_multi_arity_pattern_defn(
         has_kwargs,
     ) in variadic_clauses:
         test = ast.Compare(
-            left=ast.Name(id="__n__", ctx=ast.Load()),
+            left=ast.Name(id="__n__", ctx=_LOAD),
             ops=[ast.GtE()],
             comparators=[ast.Constant(value=min_arity)],
         )
@@ -2478,16 +2872,7 @@ def compile_multi_arity_pattern_defn(
         error_msg = (
             f"{fn_name} called with wrong number of arguments or no matching pattern"
         )
-        else_body = [
-            ast.Raise(
-                exc=ast.Call(
-                    func=ast.Name(id="MatchError", ctx=ast.Load()),
-                    args=[ast.Constant(value=error_msg)],
-                    keywords=[],
-                ),
-                cause=None,
-            )
-        ]
+        else_body = [_make_match_error_raise(error_msg)]
 
         # Build from the end
         current_else: list[ast.stmt] = list(else_body)
@@ -2509,17 +2894,7 @@ def compile_multi_arity_pattern_defn(
         )
 
     # Compile decorator expressions
-    decorator_list = []
-    if decorators:
-        for dec in decorators:
-            if isinstance(dec, Symbol):
-                decorator_list.append(
-                    ast.Name(id=normalize_name(dec.name), ctx=ast.Load())
-                )
-            elif isinstance(dec, list) and dec:
-                decorator_list.append(compile_expr(dec))
-            else:
-                raise SyntaxError(f"Invalid decorator expression: {dec!r}")
+    decorator_list = compile_decorator_list(decorators)
 
     if is_async:
         func = ast.AsyncFunctionDef(
@@ -2565,7 +2940,7 @@ def compile_arity_pattern_group(clauses, fn_name, is_generator=False):
         # Initialize ok flag
         stmts.append(
             ast.Assign(
-                targets=[ast.Name(id=ok_var, ctx=ast.Store())],
+                targets=[ast.Name(id=ok_var, ctx=_STORE)],
                 value=ast.Constant(value=True),
             )
         )
@@ -2577,113 +2952,90 @@ def compile_arity_pattern_group(clauses, fn_name, is_generator=False):
         stmts.extend(clause_stmts)
 
     # If no clause matched, raise MatchError
-    stmts.append(
-        ast.Raise(
-            exc=ast.Call(
-                func=ast.Name(id="MatchError", ctx=ast.Load()),
-                args=[ast.Constant(value=f"No matching clause for {fn_name}")],
-                keywords=[],
-            ),
-            cause=None,
-        )
-    )
+    stmts.append(_make_match_error_raise(f"No matching clause for {fn_name}"))
 
     return stmts
 
 
-def compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator=False):
-    """
-    Compile the body of an arity case in dispatch.
+def _assign(
+    target_name: str, value: ast.expr, annotation: Optional[ast.expr] = None
+) -> ast.stmt:
+    """Build `name: annotation = value`, or plain `name = value` without one."""
+    target = ast.Name(id=target_name, ctx=_STORE)
+    if annotation is not None:
+        return ast.AnnAssign(
+            target=target, annotation=annotation, value=value, simple=1
+        )
+    return ast.Assign(targets=[target], value=value)
 
-    Generates parameter unpacking from __args__ and then the body.
-    Now supports type annotations via ^type syntax (Phase 4).
 
-    When a parameter has a type annotation like ^int x, this generates:
-        x: int = __args__[0]
-    instead of:
-        x = __args__[0]
+def _args_subscript(index: int) -> ast.Subscript:
+    """Build `__args__[index]` for unpacking a dispatched positional argument."""
+    return ast.Subscript(
+        value=ast.Name(id="__args__", ctx=_LOAD),
+        slice=ast.Constant(value=index),
+        ctx=_LOAD,
+    )
+
+
+def compile_dispatch_params(params):
+    """
+    Unpack dispatch parameters from __args__ and __kwargs__.
+
+    Handles ^type annotations, & rest, ** kwargs, the * marker and
+    destructuring patterns. Returns a list of assignment statements.
     """
     body_nodes = []
 
     # Unpack parameters from __args__
-    items = params.items
-    i = 0
+    items = iter(params)
     arg_index = 0
 
     # Track pending type annotation from ^type syntax
     pending_type_annotation = None
 
-    while i < len(items):
-        item = items[i]
-
+    for item in items:
         # Check for type annotation (^type before parameter)
         if isinstance(item, Decorated):
             pending_type_annotation = compile_type_annotation(item.expr)
-            i += 1
             continue
 
         if is_symbol(item, "&"):
             # Vararg: rest = __args__[arg_index:]
-            vararg_item = items[i + 1]
+            vararg_item = next(items, None)
+            if vararg_item is None:
+                raise SyntaxError("& must be followed by a parameter")
 
             # Use pending type annotation if available
             vararg_annotation = pending_type_annotation
             pending_type_annotation = None
 
+            value_expr = ast.Subscript(
+                value=ast.Name(id="__args__", ctx=_LOAD),
+                slice=ast.Slice(
+                    lower=ast.Constant(value=arg_index),
+                    upper=None,
+                    step=None,
+                ),
+                ctx=_LOAD,
+            )
             if isinstance(vararg_item, Symbol):
-                vararg_name = normalize_name(vararg_item.name)
-                value_expr = ast.Subscript(
-                    value=ast.Name(id="__args__", ctx=ast.Load()),
-                    slice=ast.Slice(
-                        lower=ast.Constant(value=arg_index),
-                        upper=None,
-                        step=None,
-                    ),
-                    ctx=ast.Load(),
-                )
-                if vararg_annotation is not None:
-                    # Emit annotated assignment: rest: Type = __args__[idx:]
-                    body_nodes.append(
-                        ast.AnnAssign(
-                            target=ast.Name(id=vararg_name, ctx=ast.Store()),
-                            annotation=vararg_annotation,
-                            value=value_expr,
-                            simple=1,
-                        )
-                    )
-                else:
-                    body_nodes.append(
-                        ast.Assign(
-                            targets=[ast.Name(id=vararg_name, ctx=ast.Store())],
-                            value=value_expr,
-                        )
-                    )
-            else:
-                # Destructuring vararg
-                temp = gensym("__vararg_")
+                # rest: Type = __args__[idx:]
                 body_nodes.append(
-                    ast.Assign(
-                        targets=[ast.Name(id=temp, ctx=ast.Store())],
-                        value=ast.Subscript(
-                            value=ast.Name(id="__args__", ctx=ast.Load()),
-                            slice=ast.Slice(
-                                lower=ast.Constant(value=arg_index),
-                                upper=None,
-                                step=None,
-                            ),
-                            ctx=ast.Load(),
-                        ),
+                    _assign(
+                        normalize_name(vararg_item.name), value_expr, vararg_annotation
                     )
                 )
-                body_nodes.extend(
-                    compile_destructure(vararg_item, ast.Name(id=temp, ctx=ast.Load()))
-                )
-            i += 2
+            else:
+                # Destructuring vararg
+                body_nodes.extend(compile_destructure(vararg_item, value_expr))
 
         elif is_symbol(item, "**"):
             # Kwargs: kwargs = spork_kwargs_map(__kwargs__)
             # Convert Python dict to Spork Map with Keyword keys
-            kwargs_item = items[i + 1]
+            kwargs_item = next(items, None)
+            if kwargs_item is None:
+                raise SyntaxError("** must be followed by a parameter")
 
             # Use pending type annotation if available
             kwargs_annotation = pending_type_annotation
@@ -2691,46 +3043,26 @@ def compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator=Fal
 
             # Wrap __kwargs__ with spork_kwargs_map to convert to Spork Map
             converted_kwargs = ast.Call(
-                func=ast.Name(id="spork_kwargs_map", ctx=ast.Load()),
-                args=[ast.Name(id="__kwargs__", ctx=ast.Load())],
+                func=ast.Name(id="spork_kwargs_map", ctx=_LOAD),
+                args=[ast.Name(id="__kwargs__", ctx=_LOAD)],
                 keywords=[],
             )
 
             if isinstance(kwargs_item, Symbol):
-                kwargs_name = normalize_name(kwargs_item.name)
-                if kwargs_annotation is not None:
-                    body_nodes.append(
-                        ast.AnnAssign(
-                            target=ast.Name(id=kwargs_name, ctx=ast.Store()),
-                            annotation=kwargs_annotation,
-                            value=converted_kwargs,
-                            simple=1,
-                        )
-                    )
-                else:
-                    body_nodes.append(
-                        ast.Assign(
-                            targets=[ast.Name(id=kwargs_name, ctx=ast.Store())],
-                            value=converted_kwargs,
-                        )
+                body_nodes.append(
+                    _assign(
+                        normalize_name(kwargs_item.name),
+                        converted_kwargs,
+                        kwargs_annotation,
                     )
+                )
             else:
                 # Destructuring kwargs
-                temp = gensym("__kwargs_")
-                body_nodes.append(
-                    ast.Assign(
-                        targets=[ast.Name(id=temp, ctx=ast.Store())],
-                        value=converted_kwargs,
-                    )
-                )
-                body_nodes.extend(
-                    compile_destructure(kwargs_item, ast.Name(id=temp, ctx=ast.Load()))
-                )
-            i += 2
+                body_nodes.extend(compile_destructure(kwargs_item, converted_kwargs))
 
         elif is_symbol(item, "*"):
             # Keyword-only marker - skip (handled by kwargs in multi-arity)
-            i += 1
+            pass
 
         else:
             # Regular positional arg
@@ -2743,56 +3075,127 @@ def compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator=Fal
             param_annotation = pending_type_annotation
             pending_type_annotation = None
 
+            value_expr = _args_subscript(arg_index)
             if isinstance(param_item, Symbol):
-                param_name = normalize_name(param_item.name)
-                value_expr = ast.Subscript(
-                    value=ast.Name(id="__args__", ctx=ast.Load()),
-                    slice=ast.Constant(value=arg_index),
-                    ctx=ast.Load(),
-                )
-                if param_annotation is not None:
-                    # Emit annotated assignment: x: int = __args__[0]
-                    body_nodes.append(
-                        ast.AnnAssign(
-                            target=ast.Name(id=param_name, ctx=ast.Store()),
-                            annotation=param_annotation,
-                            value=value_expr,
-                            simple=1,
-                        )
-                    )
-                else:
-                    body_nodes.append(
-                        ast.Assign(
-                            targets=[ast.Name(id=param_name, ctx=ast.Store())],
-                            value=value_expr,
-                        )
-                    )
-            elif is_destructuring_pattern(param_item):
-                # Destructuring pattern
-                temp = gensym("__param_")
+                # x: int = __args__[0]
                 body_nodes.append(
-                    ast.Assign(
-                        targets=[ast.Name(id=temp, ctx=ast.Store())],
-                        value=ast.Subscript(
-                            value=ast.Name(id="__args__", ctx=ast.Load()),
-                            slice=ast.Constant(value=arg_index),
-                            ctx=ast.Load(),
-                        ),
+                    _assign(
+                        normalize_name(param_item.name), value_expr, param_annotation
                     )
                 )
-                body_nodes.extend(
-                    compile_destructure(param_item, ast.Name(id=temp, ctx=ast.Load()))
-                )
+            elif is_destructuring_pattern(param_item):
+                # Destructuring pattern (compile_destructure holds it in a temp)
+                body_nodes.extend(compile_destructure(param_item, value_expr))
             else:
                 raise SyntaxError(f"Invalid parameter: {param_item}")
 
             arg_index += 1
-            i += 1
+
+    return body_nodes
+
+
+# Minimum number of fixed arities, with no variadic one, dispatched by a
+# binary if-tree on __n__ instead of an if/elif chain
+_ARITY_TREE_MIN_CASES = 4
+
+
+def _arity_error(error_msg):
+    """Build the `raise TypeError(error_msg)` of an arity dispatch miss."""
+    return ast.Raise(
+        exc=ast.Call(
+            func=_load("TypeError"),
+            args=[ast.Constant(value=error_msg)],
+            keywords=[],
+        ),
+        cause=None,
+    )
+
+
+def _arity_tree(fixed_cases, lo, hi, error_msg):
+    """
+    Build a binary if-tree selecting among fixed_cases[lo:hi], (count, body)
+    pairs sorted by count, by comparing __n__ against the counts.
+    """
+    if hi - lo == 1:
+        count, body = fixed_cases[lo]
+        test = ast.Compare(
+            left=_load("__n__"), ops=[ast.Eq()], comparators=[ast.Constant(value=count)]
+        )
+        return [ast.If(test=test, body=body, orelse=[_arity_error(error_msg)])]
+    mid = (lo + hi) // 2
+    test = ast.Compare(
+        left=_load("__n__"),
+        ops=[ast.Lt()],
+        comparators=[ast.Constant(value=fixed_cases[mid][0])],
+    )
+    return [
+        ast.If(
+            test=test,
+            body=_arity_tree(fixed_cases, lo, mid, error_msg),
+            orelse=_arity_tree(fixed_cases, mid, hi, error_msg),
+        )
+    ]
+
+
+def _arity_dispatch(fixed_cases, variadic_case, error_msg):
+    """
+    Build the statement dispatching a multi-arity function on __n__.
+
+    fixed_cases holds (count, body) pairs sorted by count and variadic_case
+    is (min_args, body) or None. The bodies are tested in turn with
+    `__n__ == count`, then `__n__ >= min_args`, and a miss raises TypeError.
+    With many fixed arities and no variadic one, a binary if-tree over the
+    counts takes about log2(k) + 1 comparisons per call instead of up to k.
+    """
+    if variadic_case is None and len(fixed_cases) >= _ARITY_TREE_MIN_CASES:
+        return _arity_tree(fixed_cases, 0, len(fixed_cases), error_msg)[0]
+
+    current_else: list[ast.stmt] = [_arity_error(error_msg)]
+    if variadic_case is not None:
+        min_args, body = variadic_case
+        test = ast.Compare(
+            left=_load("__n__"),
+            ops=[ast.GtE()],
+            comparators=[ast.Constant(value=min_args)],
+        )
+        current_else = [ast.If(test=test, body=body, orelse=current_else)]
+    for count, body in reversed(fixed_cases):
+        test = ast.Compare(
+            left=_load("__n__"), ops=[ast.Eq()], comparators=[ast.Constant(value=count)]
+        )
+        current_else = [ast.If(test=test, body=body, orelse=current_else)]
+    return current_else[0]
+
+
+def compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator=False):
+    """
+    Compile the body of an arity case in dispatch.
+
+    Generates parameter unpacking from __args__ and then the body.
+    Now supports type annotations via ^type syntax (Phase 4).
+
+    When a parameter has a type annotation like ^int x, this generates:
+        x: int = __args__[0]
+    instead of:
+        x = __args__[0]
+    """
+    # Fast path: only plain positional names, so no annotations, markers or
+    # destructuring to look for
+    if all(
+        isinstance(item, Symbol) and item.name not in ("&", "**", "*")
+        for item in params.items
+    ):
+        body_nodes = [
+            _assign(normalize_name(item.name), _args_subscript(index))
+            for index, item in enumerate(params.items)
+        ]
+    else:
+        body_nodes = compile_dispatch_params(params.items)
 
     # Compile the body
     for f in body_forms[:-1]:
         stmts = compile_stmt(f)
-        body_nodes.extend(flatten_stmts([stmts]))
+        _extend_stmt(body_nodes, stmts)
 
     last_form = body_forms[-1]
     if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
@@ -2800,31 +3203,31 @@ def compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator=Fal
 
         if head_name == "let":
             let_stmts = compile_let_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([let_stmts]))
+            _extend_stmt(body_nodes, let_stmts)
         elif head_name == "do":
             do_stmts = compile_do_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([do_stmts]))
+            _extend_stmt(body_nodes, do_stmts)
         elif head_name == "try":
             try_stmts = compile_try_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([try_stmts]))
+            _extend_stmt(body_nodes, try_stmts)
         elif head_name == "with":
             with_stmt = compile_with_stmt_with_return(last_form[1:])
             body_nodes.append(with_stmt)
-        elif head_name in ("while", "for", "async-for", "set!"):
+        elif head_name in _TAIL_STMT_ONLY:
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
             # Only add return None if not a generator
             if not is_generator:
-                body_nodes.append(ast.Return(value=ast.Constant(value=None)))
+                body_nodes.append(ast.Return(value=None))
         elif head_name == "return":
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             # Regular expression - check if generator
             if is_generator:
                 # Generator function - just add the statement, no return
                 stmts = compile_stmt(last_form)
-                body_nodes.extend(flatten_stmts([stmts]))
+                _extend_stmt(body_nodes, stmts)
             else:
                 # Regular function - add return
                 body_nodes.append(ast.Return(value=compile_expr(last_form)))
@@ -2833,7 +3236,7 @@ def compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator=Fal
         if is_generator:
             # Generator function - compile as statement, no return
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             # Regular function - return it
             body_nodes.append(ast.Return(value=compile_expr(last_form)))
@@ -2909,7 +3312,7 @@ def compile_defn(args, form_loc=None):
     # Compile all but the last form as statements
     for f in body_forms[:-1]:
         stmts = compile_stmt(f)
-        body_nodes.extend(flatten_stmts([stmts]))
+        _extend_stmt(body_nodes, stmts)
 
     # Last form: try to return it as an expression, but handle let/do specially
     last_form = body_forms[-1]
@@ -2921,15 +3324,15 @@ def compile_defn(args, form_loc=None):
         if head_name == "let":
             # Compile let as statements, with last body form returned
             let_stmts = compile_let_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([let_stmts]))
+            _extend_stmt(body_nodes, let_stmts)
         elif head_name == "do":
             # Compile do as statements, with last form returned
             do_stmts = compile_do_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([do_stmts]))
+            _extend_stmt(body_nodes, do_stmts)
         elif head_name == "try":
             # Compile try as statements, with last body form returned
             try_stmts = compile_try_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([try_stmts]))
+            _extend_stmt(body_nodes, try_stmts)
         elif head_name == "with":
             # Compile with as statements, with last body form returned
             with_stmt = compile_with_stmt_with_return(last_form[1:])
@@ -2937,27 +3340,27 @@ def compile_defn(args, form_loc=None):
         elif head_name == "loop":
             # Compile loop as statements, with last body form returned
             loop_stmts = compile_loop_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([loop_stmts]))
-        elif head_name in ("while", "for", "async-for", "set!"):
+            _extend_stmt(body_nodes, loop_stmts)
+        elif head_name in _TAIL_STMT_ONLY:
             # Pure statement forms - no return value
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
             # Only add return None if not a generator
             if not is_generator:
-                ret_node = ast.Return(value=ast.Constant(value=None))
+                ret_node = ast.Return(value=None)
                 last_loc = get_source_location(last_form)
                 set_location(ret_node, last_loc)
                 body_nodes.append(ret_node)
         elif head_name == "return":
             # Already a return statement
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             # Regular expression - check if generator
             if is_generator:
                 # Generator function - just add the statement, no return
                 stmts = compile_stmt(last_form)
-                body_nodes.extend(flatten_stmts([stmts]))
+                _extend_stmt(body_nodes, stmts)
             else:
                 # Regular function - add return
                 ret_node = ast.Return(value=compile_expr(last_form))
@@ -2969,7 +3372,7 @@ def compile_defn(args, form_loc=None):
         if is_generator:
             # Generator function - compile as statement, no return
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             # Regular function - return it
             ret_node = ast.Return(value=compile_expr(last_form))
@@ -2990,16 +3393,7 @@ def compile_defn(args, form_loc=None):
         )
 
     # Compile decorator expressions
-    decorator_list = []
-    for dec in decorators:
-        if isinstance(dec, Symbol):
-            # Simple decorator: ^staticmethod -> @staticmethod
-            decorator_list.append(ast.Name(id=normalize_name(dec.name), ctx=ast.Load()))
-        elif isinstance(dec, list) and dec:
-            # Decorator with args: ^(route "/api") -> @route("/api")
-            decorator_list.append(compile_expr(dec))
-        else:
-            raise SyntaxError(f"Invalid decorator expression: {dec!r}")
+    decorator_list = compile_decorator_list(decorators)
 
     if is_async:
         func = ast.AsyncFunctionDef(
@@ -3115,10 +3509,10 @@ def compile_params(items):
                 destructure_stmts.insert(
                     0,
                     ast.Assign(
-                        targets=[ast.Name(id=kwarg_name, ctx=ast.Store())],
+                        targets=[ast.Name(id=kwarg_name, ctx=_STORE)],
                         value=ast.Call(
-                            func=ast.Name(id="spork_kwargs_map", ctx=ast.Load()),
-                            args=[ast.Name(id=kwarg_name, ctx=ast.Load())],
+                            func=ast.Name(id="spork_kwargs_map", ctx=_LOAD),
+                            args=[ast.Name(id=kwarg_name, ctx=_LOAD)],
                             keywords=[],
                         ),
                     ),
@@ -3129,15 +3523,15 @@ def compile_params(items):
                 kwarg = ast.arg(arg=temp, annotation=None)
                 # Convert before destructuring
                 convert_stmt = ast.Assign(
-                    targets=[ast.Name(id=temp, ctx=ast.Store())],
+                    targets=[ast.Name(id=temp, ctx=_STORE)],
                     value=ast.Call(
-                        func=ast.Name(id="spork_kwargs_map", ctx=ast.Load()),
-                        args=[ast.Name(id=temp, ctx=ast.Load())],
+                        func=ast.Name(id="spork_kwargs_map", ctx=_LOAD),
+                        args=[ast.Name(id=temp, ctx=_LOAD)],
                         keywords=[],
                     ),
                 )
                 destructure_stmts.insert(0, convert_stmt)
-                temp_load = ast.Name(id=temp, ctx=ast.Load())
+                temp_load = ast.Name(id=temp, ctx=_LOAD)
                 destructure_stmts.extend(compile_destructure(kwarg_item, temp_load))
             continue
 
@@ -3169,7 +3563,7 @@ def compile_params(items):
                 # E.g. (defn f [& [first & rest]])
                 temp = gensym("__vararg_")
                 vararg = ast.arg(arg=temp, annotation=None)
-                temp_load = ast.Name(id=temp, ctx=ast.Load())
+                temp_load = ast.Name(id=temp, ctx=_LOAD)
                 destructure_stmts.extend(compile_destructure(vararg_item, temp_load))
             continue
 
@@ -3213,7 +3607,7 @@ def compile_params(items):
             py_arg = ast.arg(arg=temp, annotation=param_annotation)
 
             # Create destructuring logic for body
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
+            temp_load = ast.Name(id=temp, ctx=_LOAD)
             destructure_stmts.extend(compile_destructure(param_item, temp_load))
         else:
             raise SyntaxError(f"Invalid parameter format: {param_item}")
@@ -3253,6 +3647,43 @@ def compile_params(items):
     return args_node, destructure_stmts
 
 
+def _destructure_source(pattern, value_expr, stmts, loc):
+    """
+    Return a Load expression for the value being destructured.
+
+    A plain name is read directly, unless the pattern rebinds that name
+    before it has finished reading from it. Anything else is evaluated
+    once into a fresh temp, whose assignment is appended to stmts.
+    """
+    if isinstance(value_expr, ast.Name):
+        if value_expr.id not in _destructure_target_names(pattern):
+            return value_expr
+    temp = gensym("__destructure_")
+    assign_stmt = ast.Assign(targets=[ast.Name(id=temp, ctx=_STORE)], value=value_expr)
+    set_location(assign_stmt, loc)
+    stmts.append(assign_stmt)
+    return ast.Name(id=temp, ctx=_LOAD)
+
+
+def _destructure_target_names(pattern):
+    """Collect the names a compile_destructure pattern assigns to."""
+    names = set()
+    if isinstance(pattern, Symbol):
+        if pattern.name != "&":
+            names.add(normalize_name(pattern.name))
+    elif isinstance(pattern, VectorLiteral):
+        for item in pattern.items:
+            names.update(_destructure_target_names(item))
+    elif isinstance(pattern, MapLiteral):
+        for key, value in pattern.pairs:
+            if isinstance(key, Keyword) and key.name == "keys":
+                if isinstance(value, VectorLiteral):
+                    names.update(_destructure_target_names(value))
+            else:
+                names.update(_destructure_target_names(key))
+    return names
+
+
 def compile_destructure(pattern, value_expr, form_loc=None):
     """
     Compile destructuring assignment.
@@ -3276,7 +3707,7 @@ def compile_destructure(pattern, value_expr, form_loc=None):
 
     if isinstance(pattern, Symbol):
         # Simple binding
-        target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
+        target = ast.Name(id=normalize_name(pattern.name), ctx=_STORE)
         copy_location(target, pattern)
         stmt = ast.Assign(targets=[target], value=value_expr)
         set_location(stmt, loc)
@@ -3301,13 +3732,8 @@ def compile_destructure(pattern, value_expr, form_loc=None):
                 break
         has_rest = rest_idx >= 0
 
-        # Use a temp var for the value to avoid re-evaluation
-        temp = gensym("__destructure_")
-        temp_name = ast.Name(id=temp, ctx=ast.Store())
-        assign_stmt = ast.Assign(targets=[temp_name], value=value_expr)
-        set_location(assign_stmt, loc)
-        stmts.append(assign_stmt)
-        temp_load = ast.Name(id=temp, ctx=ast.Load())
+        # Evaluate the value once (plain names are read directly)
+        temp_load = _destructure_source(pattern, value_expr, stmts, loc)
 
         if has_rest:
             # Generate: first N bindings from value[:N], rest binding from value[N:]
@@ -3319,7 +3745,7 @@ def compile_destructure(pattern, value_expr, form_loc=None):
             # Bind pre-rest elements using nth for persistent structure support
             for i, sub_pattern in enumerate(pre_rest):
                 elem = ast.Call(
-                    func=ast.Name(id="nth", ctx=ast.Load()),
+                    func=ast.Name(id="nth", ctx=_LOAD),
                     args=[temp_load, ast.Constant(value=i)],
                     keywords=[],
                 )
@@ -3329,12 +3755,12 @@ def compile_destructure(pattern, value_expr, form_loc=None):
             # Note: drop signature is (drop n coll), and we realize it with vec
             # to get a persistent vector instead of a lazy generator
             drop_call = ast.Call(
-                func=ast.Name(id="drop", ctx=ast.Load()),
+                func=ast.Name(id="drop", ctx=_LOAD),
                 args=[ast.Constant(value=len(pre_rest)), temp_load],
                 keywords=[],
             )
             rest_val = ast.Call(
-                func=ast.Name(id="vec", ctx=ast.Load()),
+                func=ast.Name(id="vec", ctx=_LOAD),
                 args=[drop_call],
                 keywords=[],
             )
@@ -3343,7 +3769,7 @@ def compile_destructure(pattern, value_expr, form_loc=None):
             # Simple sequence destructuring using nth
             for i, sub_pattern in enumerate(items):
                 elem = ast.Call(
-                    func=ast.Name(id="nth", ctx=ast.Load()),
+                    func=ast.Name(id="nth", ctx=_LOAD),
                     args=[temp_load, ast.Constant(value=i)],
                     keywords=[],
                 )
@@ -3362,13 +3788,8 @@ def compile_destructure(pattern, value_expr, form_loc=None):
             set_location(stmt, loc)
             return [stmt]
 
-        # Use a temp var for the value to avoid re-evaluation
-        temp = gensym("__destructure_")
-        temp_name = ast.Name(id=temp, ctx=ast.Store())
-        assign_stmt = ast.Assign(targets=[temp_name], value=value_expr)
-        set_location(assign_stmt, loc)
-        stmts.append(assign_stmt)
-        temp_load = ast.Name(id=temp, ctx=ast.Load())
+        # Evaluate the value once (plain names are read directly)
+        temp_load = _destructure_source(pattern, value_expr, stmts, loc)
 
         # Check for :keys syntax: {:keys [x y]} means bind x to map["x"], y to map["y"]
         for key, value in pattern.pairs:
@@ -3380,12 +3801,12 @@ def compile_destructure(pattern, value_expr, form_loc=None):
                             raise SyntaxError(":keys must contain symbols")
                         # Create Keyword object for lookup
                         key_expr = ast.Call(
-                            func=ast.Name(id="Keyword", ctx=ast.Load()),
+                            func=ast.Name(id="Keyword", ctx=_LOAD),
                             args=[ast.Constant(value=sym.name)],
                             keywords=[],
                         )
                         elem = ast.Call(
-                            func=ast.Name(id="get", ctx=ast.Load()),
+                            func=ast.Name(id="get", ctx=_LOAD),
                             args=[temp_load, key_expr],
                             keywords=[],
                         )
@@ -3398,7 +3819,7 @@ def compile_destructure(pattern, value_expr, form_loc=None):
                 if isinstance(value, Keyword):
                     # Create Keyword object for lookup
                     lookup_expr = ast.Call(
-                        func=ast.Name(id="Keyword", ctx=ast.Load()),
+                        func=ast.Name(id="Keyword", ctx=_LOAD),
                         args=[ast.Constant(value=value.name)],
                         keywords=[],
                     )
@@ -3409,7 +3830,7 @@ def compile_destructure(pattern, value_expr, form_loc=None):
                         f"Dict destructuring key must be a keyword or string, got {type(value)}"
                     )
                 elem = ast.Call(
-                    func=ast.Name(id="get", ctx=ast.Load()),
+                    func=ast.Name(id="get", ctx=_LOAD),
                     args=[temp_load, lookup_expr],
                     keywords=[],
                 )
@@ -3429,10 +3850,19 @@ def is_destructuring_pattern(form):
     return isinstance(form, (VectorLiteral, MapLiteral))
 
 
-def make_keyword_expr(name: str) -> ast.Call:
-    """Create an AST expression that constructs a Keyword object."""
+def make_keyword_expr(name: str) -> ast.expr:
+    """
+    Create an AST expression for a Keyword object used in a pattern.
+
+    Inside compile_module this is a load of a module-level constant, so
+    generated match code does not allocate a Keyword per match; elsewhere
+    it constructs the Keyword inline.
+    """
+    ctx = get_compile_context()
+    if ctx.keyword_constants is not None:
+        return ast.Name(id=ctx.hoist_keyword(name), ctx=_LOAD)
     return ast.Call(
-        func=ast.Name(id="Keyword", ctx=ast.Load()),
+        func=ast.Name(id="Keyword", ctx=_LOAD),
         args=[ast.Constant(value=name)],
         keywords=[],
     )
@@ -3461,6 +3891,41 @@ def is_literal_pattern(pattern):
     return False
 
 
+def case_discriminator(pattern):
+    """
+    Return the hashable literal a match case is keyed on, or None if the case
+    cannot take part in a literal switch (non-literal, guarded, or nil).
+    """
+    if isinstance(pattern, Symbol):
+        if pattern.name == "true":
+            return True
+        if pattern.name == "false":
+            return False
+        return None
+    if pattern is None or not is_literal_pattern(pattern):
+        return None
+    return pattern
+
+
+def compile_literal_pattern_value(pattern):
+    """Compile a literal pattern to the AST value it is compared against."""
+    if pattern is None:
+        return ast.Constant(value=None)
+    if isinstance(pattern, bool):
+        return ast.Constant(value=pattern)
+    if isinstance(pattern, Symbol):
+        if pattern.name == "nil":
+            return ast.Constant(value=None)
+        if pattern.name == "true":
+            return ast.Constant(value=True)
+        if pattern.name == "false":
+            return ast.Constant(value=False)
+        raise SyntaxError(f"Unknown literal symbol: {pattern.name}")
+    if isinstance(pattern, Keyword):
+        return make_keyword_expr(pattern.name)
+    return ast.Constant(value=pattern)
+
+
 def is_type_pattern(pattern):
     """
     Check if pattern is a type pattern: (^Type pat) or (^Type pat :when guard).
@@ -3472,18 +3937,18 @@ def is_type_pattern(pattern):
     return isinstance(first, Decorated)
 
 
-def is_guarded_pattern(pattern):
+def _find_when(pattern, start):
     """
-    Check if pattern has a guard: (pat :when guard-expr).
-    Returns True if the pattern is a list with :when as second-to-last element.
+    Return the index of the first :when keyword in pattern at or after start,
+    or -1 if there is none. Raises SyntaxError if :when has no guard after it.
     """
-    if not isinstance(pattern, list) or len(pattern) < 3:
-        return False
-    # Check for :when keyword
-    for item in pattern:
-        if isinstance(item, Keyword) and item.name == "when":
-            return True
-    return False
+    for i in range(start, len(pattern)):
+        item = pattern[i]
+        if type(item) is Keyword and item.name == "when":
+            if i + 1 >= len(pattern):
+                raise SyntaxError(":when must be followed by a guard expression")
+            return i
+    return -1
 
 
 def parse_guarded_pattern(pattern):
@@ -3495,20 +3960,12 @@ def parse_guarded_pattern(pattern):
     if not isinstance(pattern, list) or len(pattern) < 3:
         return pattern, None
 
-    # Look for :when keyword
-    for i, item in enumerate(pattern):
-        if isinstance(item, Keyword) and item.name == "when":
-            if i + 1 >= len(pattern):
-                raise SyntaxError(":when must be followed by a guard expression")
-            # Everything before :when is the pattern, after is the guard
-            if i == 1:
-                inner_pattern = pattern[0]
-            else:
-                inner_pattern = pattern[:i]
-            guard_expr = pattern[i + 1]
-            return inner_pattern, guard_expr
-
-    return pattern, None
+    # :when can't be the first element; everything before it is the pattern
+    i = _find_when(pattern, 1)
+    if i < 0:
+        return pattern, None
+    inner_pattern = pattern[0] if i == 1 else pattern[:i]
+    return inner_pattern, pattern[i + 1]
 
 
 def parse_type_pattern(pattern):
@@ -3534,23 +3991,237 @@ def parse_type_pattern(pattern):
         return type_expr, pattern[1], None
     else:
         # (^Type pat :when guard) or (^Type pat1 pat2 ...)
-        # Check for :when
-        for i, item in enumerate(pattern[1:], start=1):
-            if isinstance(item, Keyword) and item.name == "when":
-                if i + 1 >= len(pattern):
-                    raise SyntaxError(":when must be followed by a guard expression")
-                inner_pattern = pattern[1] if i == 2 else pattern[1:i]
-                guard_expr = pattern[i + 1]
-                return type_expr, inner_pattern, guard_expr
+        i = _find_when(pattern, 1)
+        if i >= 0:
+            inner_pattern = pattern[1] if i == 2 else pattern[1:i]
+            return type_expr, inner_pattern, pattern[i + 1]
         # No guard, pattern is everything after type
-        if len(pattern) == 2:
-            return type_expr, pattern[1], None
-        else:
-            return type_expr, pattern[1], None
+        return type_expr, pattern[1], None
+
+
+def compile_type_pattern_type(type_expr):
+    """
+    Compile the type of a ^Type pattern to (isinstance_arg, annotation).
+
+    Bare type symbols such as ^int or ^MyRecord tend to repeat across many
+    match cases, so their compiled nodes are cached on the compilation
+    context and handed out as shallow copies relocated to this occurrence.
+    Only plain Name results are cached: a shallow copy of a dotted type
+    would share its inner nodes, and their locations, with the first site.
+    """
+    if not isinstance(type_expr, Symbol):
+        return compile_expr(type_expr), compile_type_annotation(type_expr)
+
+    cache = get_compile_context().type_pattern_cache
+    cached = cache.get(type_expr.name)
+    if cached is None:
+        compiled = (compile_expr(type_expr), compile_type_annotation(type_expr))
+        if all(isinstance(node, ast.Name) for node in compiled):
+            cache[type_expr.name] = compiled
+        return compiled
+
+    type_ast, annotation = cached
+    type_ast = copy_location(copy.copy(type_ast), type_expr)
+    return type_ast, copy.copy(annotation)
+
+
+# Type pattern names whose isinstance check proves a value supports len()
+# and positional indexing, e.g. the (^list [a b]) in a match case
+_SEQUENCE_PATTERN_TYPES = frozenset({"list", "tuple", "Vector"})
+
+
+def _is_sequence_pattern_type(type_ast):
+    """Check if a compiled pattern type proves the value is a sequence."""
+    return isinstance(type_ast, ast.Name) and type_ast.id in _SEQUENCE_PATTERN_TYPES
+
+
+def _make_match_error_raise(message):
+    """
+    Build `raise MatchError(message)` for a match or dispatch with no
+    matching case. Each site gets its own nodes: a shared subtree would
+    carry the location of wherever fix_missing_locations reached it first.
+    """
+    return ast.Raise(
+        exc=ast.Call(
+            func=_load("MatchError"),
+            args=[ast.Constant(value=message)],
+            keywords=[],
+        ),
+        cause=None,
+    )
+
+
+def _make_binding_stmt(binding):
+    """
+    Build the assignment for one pattern binding.
+
+    binding is (name, value_expr[, type_annotation]); name may also be a
+    tuple of names, bound together as `a, b, c = value_expr`.
+    """
+    if len(binding) == 3:
+        name, val_expr, type_annotation = binding
+    else:
+        # Backward compatibility with 2-tuple format
+        name, val_expr = binding
+        type_annotation = None
+
+    if isinstance(name, tuple):
+        target = ast.Tuple(
+            elts=[ast.Name(id=normalize_name(n), ctx=_STORE) for n in name],
+            ctx=_STORE,
+        )
+        return ast.Assign(targets=[target], value=val_expr)
+    if type_annotation is not None:
+        # Emit annotated assignment: x: int = value
+        return ast.AnnAssign(
+            target=ast.Name(id=normalize_name(name), ctx=_STORE),
+            annotation=type_annotation,
+            value=val_expr,
+            simple=1,
+        )
+    return ast.Assign(
+        targets=[ast.Name(id=normalize_name(name), ctx=_STORE)],
+        value=val_expr,
+    )
+
+
+def _make_fail_check(ok_var, failed_test, loc=None):
+    """
+    Build `if ok_var and <failed_test>: ok_var = False`.
+
+    When ok_var is None the check bails out of the enclosing single-pass
+    loop instead: `if <failed_test>: break`.
+    """
+    if ok_var is None:
+        check = ast.If(test=failed_test, body=[ast.Break()], orelse=[])
+        set_location(check, loc)
+        return check
+    check = ast.If(
+        test=ast.BoolOp(
+            op=ast.And(),
+            values=[ast.Name(id=ok_var, ctx=_LOAD), failed_test],
+        ),
+        body=[
+            ast.Assign(
+                targets=[ast.Name(id=ok_var, ctx=_STORE)],
+                value=ast.Constant(value=False),
+            )
+        ],
+        orelse=[],
+    )
+    set_location(check, loc)
+    return check
+
+
+def _make_hasattr_call(value_expr, attr):
+    """Build `hasattr(value_expr, attr)`."""
+    return ast.Call(
+        func=ast.Name(id="hasattr", ctx=_LOAD),
+        args=[value_expr, ast.Constant(value=attr)],
+        keywords=[],
+    )
+
+
+def _make_len_check(ok_var, temp_load, op, n, loc=None, known_iterable=False):
+    """
+    Build the sequence-shape check for vector patterns:
+        if ok_var and not _match_seq_len_eq(t, n): ok_var = False
+
+    When t is statically known to be a sequence only the length is tested:
+        if ok_var and len(t) != n: ok_var = False
+    (or len(t) < n when op is GtE, for patterns with & rest).
+    """
+    if known_iterable:
+        failed = ast.Compare(
+            left=ast.Call(
+                func=ast.Name(id="len", ctx=_LOAD),
+                args=[temp_load],
+                keywords=[],
+            ),
+            ops=[ast.Lt() if isinstance(op, ast.GtE) else ast.NotEq()],
+            comparators=[ast.Constant(value=n)],
+        )
+        return _make_fail_check(ok_var, failed, loc)
+    failed = ast.UnaryOp(
+        op=_NOT_OP,
+        operand=ast.Call(
+            func=ast.Name(id="_match_seq_len_eq", ctx=_LOAD),
+            args=[temp_load, ast.Constant(value=n)],
+            keywords=[],
+        ),
+    )
+    return _make_fail_check(ok_var, failed, loc)
+
+
+def _make_empty_seq_check(ok_var, value_expr, loc=None, known_iterable=False):
+    """
+    Build the check for an empty vector pattern []. Lists, tuples and
+    Vectors are empty exactly when falsy, so they skip the length helper:
+        if ok_var and (v if type(v) in _MATCH_SEQ_TYPES
+                       else not _match_seq_len_eq(v, 0)): ok_var = False
+    When v is statically known to be a sequence this is just `if ok_var and v`.
+    """
+    if known_iterable:
+        return _make_fail_check(ok_var, value_expr, loc)
+    if not isinstance(value_expr, ast.Name):
+        # Avoid evaluating a non-trivial expression twice
+        return _make_len_check(ok_var, value_expr, ast.Eq(), 0, loc)
+    failed = ast.IfExp(
+        test=ast.Compare(
+            left=ast.Call(
+                func=ast.Name(id="type", ctx=_LOAD),
+                args=[value_expr],
+                keywords=[],
+            ),
+            ops=[ast.In()],
+            comparators=[ast.Name(id="_MATCH_SEQ_TYPES", ctx=_LOAD)],
+        ),
+        body=value_expr,
+        orelse=_make_len_check(None, value_expr, ast.Eq(), 0).test,
+    )
+    return _make_fail_check(ok_var, failed, loc)
+
+
+def _make_literal_run_check(ok_var, temp_load, literal_run, loc=None):
+    """
+    Build one check for consecutive literal sub-patterns of a vector pattern:
+        if ok_var and (t[i], t[j], ...) != (lit_i, lit_j, ...): ok_var = False
+    A literal tuple holding keywords is hoisted to a module-level constant
+    when possible; an all-constant tuple is folded by Python's compiler.
+    """
+    elements = ast.Tuple(
+        elts=[
+            ast.Subscript(value=temp_load, slice=idx_const, ctx=_LOAD)
+            for idx_const, _ in literal_run
+        ],
+        ctx=_LOAD,
+    )
+    literals = ast.Tuple(
+        elts=[compile_literal_pattern_value(pattern) for _, pattern in literal_run],
+        ctx=_LOAD,
+    )
+    ctx = get_compile_context()
+    if ctx.keyword_constants is not None and not all(
+        isinstance(elt, ast.Constant) for elt in literals.elts
+    ):
+        literals = ast.Name(
+            id=ctx.hoist_constant("__match_literals_", literals), ctx=_LOAD
+        )
+    failed = ast.Compare(left=elements, ops=[ast.NotEq()], comparators=[literals])
+    return _make_fail_check(ok_var, failed, loc)
+
+
+# Work-stack marker for :keys entries, whose value slot holds (name, expr)
+_KEYS_BINDING = object()
 
 
 def compile_pattern_check(
-    pattern, value_expr, ok_var, bindings_list, type_annotation=None
+    pattern,
+    value_expr,
+    ok_var,
+    bindings_list,
+    type_annotation=None,
+    known_iterable=False,
 ):
     """
     Compile pattern matching checks and bindings.
@@ -3558,676 +4229,490 @@ def compile_pattern_check(
     Args:
         pattern: The pattern to match
         value_expr: AST expression for the value being matched
-        ok_var: Name of the boolean flag variable (e.g., "__match_ok__")
-        bindings_list: List to append (name, value_expr, type_annotation) tuples for bindings
+        ok_var: Name of the boolean flag variable (e.g., "__match_ok__"), or
+            None to emit `break` on failure (the caller wraps the checks in a
+            single-pass `while True` loop)
+        bindings_list: List to append (name, value_expr, type_annotation) tuples
+            for bindings; name is a tuple of names for a whole-sequence unpack
         type_annotation: Optional compiled type AST to attach to symbol bindings
+        known_iterable: True if value_expr is statically known to be a
+            sequence, so vector patterns can skip the iterable probe
 
     Returns:
         List of AST statements that:
-        1. Check if pattern matches (setting ok_var to False if not)
+        1. Check if pattern matches (setting ok_var to False, or breaking, if not)
         2. Bind variables if pattern matches (with type annotations when present)
     """
     stmts = []
-    loc = get_source_location(pattern)
-
-    # Wildcard: always matches, binds nothing
-    if is_wildcard_pattern(pattern):
-        return stmts
+    # Nested patterns are walked with an explicit stack of
+    # (pattern, value_expr, type_annotation, known_iterable) items rather
+    # than recursion. Sub-patterns are pushed in reverse so they pop in
+    # source order, giving the same depth-first statement order as a
+    # recursive walk.
+    work = [(pattern, value_expr, type_annotation, known_iterable)]
+    while work:
+        pattern, value_expr, type_annotation, known_iterable = work.pop()
+        if pattern is _KEYS_BINDING:
+            # :keys entries bind their symbol directly
+            bindings_list.append(value_expr)
+            continue
+        loc = get_source_location(pattern)
 
-    # Literal patterns: match by value equality
-    if is_literal_pattern(pattern):
-        # Convert pattern to its Python value
-        if pattern is None:
-            literal_val = ast.Constant(value=None)
-        elif isinstance(pattern, bool):
-            literal_val = ast.Constant(value=pattern)
-        elif isinstance(pattern, Symbol):
-            if pattern.name == "nil":
-                literal_val = ast.Constant(value=None)
-            elif pattern.name == "true":
-                literal_val = ast.Constant(value=True)
-            elif pattern.name == "false":
-                literal_val = ast.Constant(value=False)
-            else:
-                raise SyntaxError(f"Unknown literal symbol: {pattern.name}")
-        elif isinstance(pattern, Keyword):
-            literal_val = make_keyword_expr(pattern.name)
-        else:
-            literal_val = ast.Constant(value=pattern)
-
-        # if ok_var and value != literal: ok_var = False
-        check = ast.If(
-            test=ast.BoolOp(
-                op=ast.And(),
-                values=[
-                    ast.Name(id=ok_var, ctx=ast.Load()),
-                    ast.Compare(
-                        left=value_expr,
-                        ops=[ast.NotEq()],
-                        comparators=[literal_val],
-                    ),
-                ],
-            ),
-            body=[
-                ast.Assign(
-                    targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                    value=ast.Constant(value=False),
-                )
-            ],
-            orelse=[],
-        )
-        set_location(check, loc)
-        stmts.append(check)
-        return stmts
+        # Wildcard: always matches, binds nothing
+        if is_wildcard_pattern(pattern):
+            continue
 
-    # Symbol pattern: bind the value (with type annotation if present)
-    if isinstance(pattern, Symbol):
-        bindings_list.append((pattern.name, value_expr, type_annotation))
-        return stmts
+        # Literal patterns: match by value equality
+        if is_literal_pattern(pattern):
+            literal_val = compile_literal_pattern_value(pattern)
 
-    # Type pattern: (^Type pat)
-    if is_type_pattern(pattern):
-        type_expr, inner_pattern, guard = parse_type_pattern(pattern)
-
-        # Compile the type expression
-        type_ast = compile_expr(type_expr)
-
-        # if ok_var and not isinstance(value, type): ok_var = False
-        check = ast.If(
-            test=ast.BoolOp(
-                op=ast.And(),
-                values=[
-                    ast.Name(id=ok_var, ctx=ast.Load()),
-                    ast.UnaryOp(
-                        op=ast.Not(),
-                        operand=ast.Call(
-                            func=ast.Name(id="isinstance", ctx=ast.Load()),
-                            args=[value_expr, type_ast],
-                            keywords=[],
-                        ),
-                    ),
-                ],
-            ),
-            body=[
-                ast.Assign(
-                    targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                    value=ast.Constant(value=False),
-                )
-            ],
-            orelse=[],
-        )
-        set_location(check, loc)
-        stmts.append(check)
-
-        # Recursively match inner pattern against the same value
-        # Pass the type annotation from this type pattern to inner bindings
-        inner_type_annotation = compile_type_annotation(type_expr)
-        stmts.extend(
-            compile_pattern_check(
-                inner_pattern, value_expr, ok_var, bindings_list, inner_type_annotation
+            # if ok_var and value != literal: ok_var = False
+            failed = ast.Compare(
+                left=value_expr, ops=[ast.NotEq()], comparators=[literal_val]
             )
-        )
+            stmts.append(_make_fail_check(ok_var, failed, loc))
+            continue
 
-        # Handle guard if present (for type patterns with inline guards)
-        if guard is not None:
-            # The guard will be handled at the outer level
-            pass
+        # Symbol pattern: bind the value (with type annotation if present)
+        if isinstance(pattern, Symbol):
+            bindings_list.append((pattern.name, value_expr, type_annotation))
+            continue
 
-        return stmts
+        # Type pattern: (^Type pat)
+        if is_type_pattern(pattern):
+            type_expr, inner_pattern, guard = parse_type_pattern(pattern)
 
-    # VectorLiteral pattern: [p1 p2 ... pn] or [p1 p2 ... pk & rest]
-    if isinstance(pattern, VectorLiteral):
-        items = pattern.items
-        if not items:
-            # Empty vector: check length == 0
-            check = ast.If(
-                test=ast.BoolOp(
-                    op=ast.And(),
-                    values=[
-                        ast.Name(id=ok_var, ctx=ast.Load()),
-                        ast.UnaryOp(
-                            op=ast.Not(),
-                            operand=ast.BoolOp(
-                                op=ast.And(),
-                                values=[
-                                    ast.Call(
-                                        func=ast.Name(id="hasattr", ctx=ast.Load()),
-                                        args=[
-                                            value_expr,
-                                            ast.Constant(value="__iter__"),
-                                        ],
-                                        keywords=[],
-                                    ),
-                                    ast.Compare(
-                                        left=ast.Call(
-                                            func=ast.Name(id="len", ctx=ast.Load()),
-                                            args=[value_expr],
-                                            keywords=[],
-                                        ),
-                                        ops=[ast.Eq()],
-                                        comparators=[ast.Constant(value=0)],
-                                    ),
-                                ],
-                            ),
-                        ),
-                    ],
+            # Compile the type expression
+            type_ast, inner_type_annotation = compile_type_pattern_type(type_expr)
+
+            # if ok_var and not isinstance(value, type): ok_var = False
+            failed = ast.UnaryOp(
+                op=_NOT_OP,
+                operand=ast.Call(
+                    func=ast.Name(id="isinstance", ctx=_LOAD),
+                    args=[value_expr, type_ast],
+                    keywords=[],
                 ),
-                body=[
-                    ast.Assign(
-                        targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                        value=ast.Constant(value=False),
-                    )
-                ],
-                orelse=[],
             )
-            set_location(check, loc)
-            stmts.append(check)
-            return stmts
+            stmts.append(_make_fail_check(ok_var, failed, loc))
+
+            # Match inner pattern against the same value, passing the type
+            # annotation from this type pattern to inner bindings. A builtin
+            # sequence type already proves the value is indexable.
+            if _is_sequence_pattern_type(type_ast):
+                known_iterable = True
+            work.append(
+                (inner_pattern, value_expr, inner_type_annotation, known_iterable)
+            )
 
-        # Check for & rest
-        rest_idx = -1
-        for i, item in enumerate(items):
-            if isinstance(item, Symbol) and item.name == "&":
-                rest_idx = i
-                break
-        has_rest = rest_idx >= 0
+            # Handle guard if present (for type patterns with inline guards)
+            if guard is not None:
+                # The guard will be handled at the outer level
+                pass
 
-        # Create a temp variable to hold the value
-        temp = gensym("__match_seq_")
-        stmts.append(
-            ast.Assign(
-                targets=[ast.Name(id=temp, ctx=ast.Store())],
-                value=value_expr,
-            )
-        )
-        temp_load = ast.Name(id=temp, ctx=ast.Load())
+            continue
 
-        if has_rest:
-            # [p1 p2 ... pk & rest]: check len >= k
-            pre_rest_count = rest_idx
-            check = ast.If(
-                test=ast.BoolOp(
-                    op=ast.And(),
-                    values=[
-                        ast.Name(id=ok_var, ctx=ast.Load()),
-                        ast.UnaryOp(
-                            op=ast.Not(),
-                            operand=ast.BoolOp(
-                                op=ast.And(),
-                                values=[
-                                    ast.Call(
-                                        func=ast.Name(id="hasattr", ctx=ast.Load()),
-                                        args=[
-                                            temp_load,
-                                            ast.Constant(value="__iter__"),
-                                        ],
-                                        keywords=[],
-                                    ),
-                                    ast.Compare(
-                                        left=ast.Call(
-                                            func=ast.Name(id="len", ctx=ast.Load()),
-                                            args=[temp_load],
-                                            keywords=[],
-                                        ),
-                                        ops=[ast.GtE()],
-                                        comparators=[
-                                            ast.Constant(value=pre_rest_count)
-                                        ],
-                                    ),
-                                ],
-                            ),
-                        ),
-                    ],
-                ),
-                body=[
-                    ast.Assign(
-                        targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                        value=ast.Constant(value=False),
-                    )
-                ],
-                orelse=[],
-            )
-            set_location(check, loc)
-            stmts.append(check)
+        # VectorLiteral pattern: [p1 p2 ... pn] or [p1 p2 ... pk & rest]
+        if isinstance(pattern, VectorLiteral):
+            items = pattern.items
+            if not items:
+                stmts.append(
+                    _make_empty_seq_check(ok_var, value_expr, loc, known_iterable)
+                )
+                continue
 
-            # Match pre-rest patterns
-            for i in range(pre_rest_count):
-                elem_expr = ast.Call(
-                    func=ast.Name(id="nth", ctx=ast.Load()),
-                    args=[temp_load, ast.Constant(value=i)],
+            # Split off the positional sub-patterns and find & rest in one pass
+            rest_idx = -1
+            positional = []
+            for i, item in enumerate(items):
+                if type(item) is Symbol and item.name == "&":
+                    rest_idx = i
+                    break
+                positional.append((ast.Constant(value=i), item))
+
+            # [p1 ... pk & rest] needs len >= k, [p1 ... pn] needs len == n
+            temp = gensym("__match_seq_")
+            temp_load = ast.Name(id=temp, ctx=_LOAD)
+            op = ast.GtE() if rest_idx >= 0 else ast.Eq()
+            n = rest_idx if rest_idx >= 0 else len(items)
+            if known_iterable:
+                # Already a sequence: test the length only, indexing a plain
+                # name directly rather than through a temp
+                if isinstance(value_expr, ast.Name):
+                    temp_load = value_expr
+                else:
+                    stmts.append(
+                        ast.Assign(
+                            targets=[ast.Name(id=temp, ctx=_STORE)],
+                            value=value_expr,
+                        )
+                    )
+                stmts.append(_make_len_check(ok_var, temp_load, op, n, loc, True))
+            else:
+                # t = _match_seq_eq(value, n)  (None if the shape is wrong)
+                # The helper hands back an indexable sequence, so the
+                # elements below are read with t[i] rather than nth(t, i).
+                helper = "_match_seq_ge" if rest_idx >= 0 else "_match_seq_eq"
+                seq_value = ast.Call(
+                    func=ast.Name(id=helper, ctx=_LOAD),
+                    args=[value_expr, ast.Constant(value=n)],
                     keywords=[],
                 )
-                stmts.extend(
-                    compile_pattern_check(items[i], elem_expr, ok_var, bindings_list)
+                if ok_var is not None:
+                    seq_value = ast.IfExp(
+                        test=ast.Name(id=ok_var, ctx=_LOAD),
+                        body=seq_value,
+                        orelse=ast.Constant(value=None),
+                    )
+                stmts.append(
+                    ast.Assign(
+                        targets=[ast.Name(id=temp, ctx=_STORE)],
+                        value=seq_value,
+                    )
+                )
+                failed = ast.Compare(
+                    left=temp_load,
+                    ops=[ast.Is()],
+                    comparators=[ast.Constant(value=None)],
+                )
+                stmts.append(_make_fail_check(ok_var, failed, loc))
+
+            # [a b c] of plain names: the length is known to be exactly n,
+            # so bind them all with one `a, b, c = t`
+            if rest_idx < 0 and all(
+                type(item) is Symbol
+                and not is_wildcard_pattern(item)
+                and not is_literal_pattern(item)
+                for item in items
+            ):
+                bindings_list.append(
+                    (tuple(item.name for item in items), temp_load, None)
                 )
+                continue
+
+            # Runs of two or more literal sub-patterns are tested together:
+            #   (t[i], t[i+1], ...) != (lit_i, lit_i+1, ...)
+            # Other sub-patterns are matched against t[i]
+            children = []
+            literal_run = []
+            positional.append((None, None))  # flushes a trailing literal run
+            for idx_const, sub_pattern in positional:
+                if idx_const is not None and is_literal_pattern(sub_pattern):
+                    literal_run.append((idx_const, sub_pattern))
+                    continue
+                if len(literal_run) > 1:
+                    stmts.append(
+                        _make_literal_run_check(ok_var, temp_load, literal_run, loc)
+                    )
+                else:
+                    children.extend(
+                        (
+                            lit_pattern,
+                            ast.Subscript(value=temp_load, slice=lit_idx, ctx=_LOAD),
+                            None,
+                            False,
+                        )
+                        for lit_idx, lit_pattern in literal_run
+                    )
+                literal_run = []
+                if idx_const is not None:
+                    children.append(
+                        (
+                            sub_pattern,
+                            ast.Subscript(value=temp_load, slice=idx_const, ctx=_LOAD),
+                            None,
+                            False,
+                        )
+                    )
 
             # Match rest pattern
-            if rest_idx + 1 < len(items):
+            if 0 <= rest_idx < len(items) - 1:
                 rest_pattern = items[rest_idx + 1]
                 # Note: drop signature is (drop n coll), realize with vec
                 drop_call = ast.Call(
-                    func=ast.Name(id="drop", ctx=ast.Load()),
-                    args=[ast.Constant(value=pre_rest_count), temp_load],
+                    func=ast.Name(id="drop", ctx=_LOAD),
+                    args=[ast.Constant(value=rest_idx), temp_load],
                     keywords=[],
                 )
                 rest_expr = ast.Call(
-                    func=ast.Name(id="vec", ctx=ast.Load()),
+                    func=ast.Name(id="vec", ctx=_LOAD),
                     args=[drop_call],
                     keywords=[],
                 )
-                stmts.extend(
-                    compile_pattern_check(
-                        rest_pattern, rest_expr, ok_var, bindings_list
-                    )
-                )
-        else:
-            # [p1 p2 ... pn]: check len == n
-            n = len(items)
-            check = ast.If(
-                test=ast.BoolOp(
-                    op=ast.And(),
-                    values=[
-                        ast.Name(id=ok_var, ctx=ast.Load()),
-                        ast.UnaryOp(
-                            op=ast.Not(),
-                            operand=ast.BoolOp(
-                                op=ast.And(),
-                                values=[
-                                    ast.Call(
-                                        func=ast.Name(id="hasattr", ctx=ast.Load()),
-                                        args=[
-                                            temp_load,
-                                            ast.Constant(value="__iter__"),
-                                        ],
-                                        keywords=[],
-                                    ),
-                                    ast.Compare(
-                                        left=ast.Call(
-                                            func=ast.Name(id="len", ctx=ast.Load()),
-                                            args=[temp_load],
-                                            keywords=[],
-                                        ),
-                                        ops=[ast.Eq()],
-                                        comparators=[ast.Constant(value=n)],
-                                    ),
-                                ],
-                            ),
-                        ),
-                    ],
-                ),
-                body=[
-                    ast.Assign(
-                        targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                        value=ast.Constant(value=False),
-                    )
-                ],
-                orelse=[],
-            )
-            set_location(check, loc)
-            stmts.append(check)
-
-            # Match each sub-pattern
-            for i, sub_pattern in enumerate(items):
-                elem_expr = ast.Call(
-                    func=ast.Name(id="nth", ctx=ast.Load()),
-                    args=[temp_load, ast.Constant(value=i)],
-                    keywords=[],
-                )
-                stmts.extend(
-                    compile_pattern_check(sub_pattern, elem_expr, ok_var, bindings_list)
-                )
+                # The rest is always a Vector, so no iterable probe is needed
+                children.append((rest_pattern, rest_expr, None, True))
 
-        return stmts
+            work.extend(reversed(children))
+            continue
 
-    # Map pattern: {:keys [k1 k2]} or {local :key}
-    if isinstance(pattern, MapLiteral):
-        # Create a temp variable to hold the value
-        temp = gensym("__match_map_")
-        stmts.append(
-            ast.Assign(
-                targets=[ast.Name(id=temp, ctx=ast.Store())],
-                value=value_expr,
-            )
-        )
-        temp_load = ast.Name(id=temp, ctx=ast.Load())
-
-        # Check that value is map-like (has __getitem__ or is dict/Map)
-        check = ast.If(
-            test=ast.BoolOp(
-                op=ast.And(),
-                values=[
-                    ast.Name(id=ok_var, ctx=ast.Load()),
-                    ast.UnaryOp(
-                        op=ast.Not(),
-                        operand=ast.Call(
-                            func=ast.Name(id="hasattr", ctx=ast.Load()),
-                            args=[temp_load, ast.Constant(value="__getitem__")],
-                            keywords=[],
-                        ),
-                    ),
-                ],
-            ),
-            body=[
+        # Map pattern: {:keys [k1 k2]} or {local :key}
+        if isinstance(pattern, MapLiteral):
+            # Create a temp variable to hold the value
+            temp = gensym("__match_map_")
+            stmts.append(
                 ast.Assign(
-                    targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                    value=ast.Constant(value=False),
+                    targets=[ast.Name(id=temp, ctx=_STORE)],
+                    value=value_expr,
                 )
-            ],
-            orelse=[],
-        )
-        set_location(check, loc)
-        stmts.append(check)
+            )
+            temp_load = ast.Name(id=temp, ctx=_LOAD)
 
-        # Process each key-value pair in the pattern
-        for key, value in pattern.pairs:
-            if isinstance(key, Keyword) and key.name == "keys":
-                # :keys [k1 k2 k3] syntax - look up by Keyword objects
-                if isinstance(value, VectorLiteral):
-                    for sym in value.items:
-                        if not isinstance(sym, Symbol):
-                            raise SyntaxError(":keys must contain symbols")
-                        key_expr = make_keyword_expr(sym.name)
-                        # Check key exists
-                        key_check = ast.If(
-                            test=ast.BoolOp(
-                                op=ast.And(),
-                                values=[
-                                    ast.Name(id=ok_var, ctx=ast.Load()),
-                                    ast.Compare(
-                                        left=ast.Call(
-                                            func=ast.Name(id="get", ctx=ast.Load()),
-                                            args=[
-                                                temp_load,
-                                                key_expr,
-                                                ast.Name(id="_MISSING", ctx=ast.Load()),
-                                            ],
-                                            keywords=[],
-                                        ),
-                                        ops=[ast.Is()],
-                                        comparators=[
-                                            ast.Name(id="_MISSING", ctx=ast.Load())
-                                        ],
-                                    ),
-                                ],
-                            ),
-                            body=[
-                                ast.Assign(
-                                    targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                                    value=ast.Constant(value=False),
-                                )
-                            ],
-                            orelse=[],
-                        )
-                        set_location(key_check, loc)
-                        stmts.append(key_check)
-                        # Bind the value
-                        bindings_list.append(
-                            (
-                                sym.name,
-                                ast.Call(
-                                    func=ast.Name(id="get", ctx=ast.Load()),
-                                    args=[temp_load, make_keyword_expr(sym.name)],
-                                    keywords=[],
-                                ),
-                            )
-                        )
-                else:
-                    raise SyntaxError(":keys value must be a vector of symbols")
-            elif isinstance(key, Symbol):
-                # Clojure-style: {a :x} means bind 'a' to value at key :x
-                if isinstance(value, Keyword):
-                    lookup_expr = make_keyword_expr(value.name)
-                elif isinstance(value, str):
-                    lookup_expr = ast.Constant(value=value)
-                else:
-                    raise SyntaxError(
-                        f"Map pattern key must be a keyword or string, got {type(value)}"
-                    )
-                # Check key exists
-                key_check = ast.If(
-                    test=ast.BoolOp(
-                        op=ast.And(),
-                        values=[
-                            ast.Name(id=ok_var, ctx=ast.Load()),
-                            ast.Compare(
-                                left=ast.Call(
-                                    func=ast.Name(id="get", ctx=ast.Load()),
-                                    args=[
-                                        temp_load,
-                                        lookup_expr,
-                                        ast.Name(id="_MISSING", ctx=ast.Load()),
-                                    ],
-                                    keywords=[],
-                                ),
-                                ops=[ast.Is()],
-                                comparators=[ast.Name(id="_MISSING", ctx=ast.Load())],
-                            ),
-                        ],
-                    ),
-                    body=[
-                        ast.Assign(
-                            targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                            value=ast.Constant(value=False),
+            # Check that value is map-like (has __getitem__ or is dict/Map)
+            failed = ast.UnaryOp(
+                op=_NOT_OP, operand=_make_hasattr_call(temp_load, "__getitem__")
+            )
+            stmts.append(_make_fail_check(ok_var, failed, loc))
+
+            # Collect (sub_pattern, lookup_expr, is_keys_binding) for every key
+            entries = []
+            for key, value in pattern.pairs:
+                if isinstance(key, Keyword) and key.name == "keys":
+                    # :keys [k1 k2 k3] syntax - look up by Keyword objects
+                    if isinstance(value, VectorLiteral):
+                        for sym in value.items:
+                            if not isinstance(sym, Symbol):
+                                raise SyntaxError(":keys must contain symbols")
+                            entries.append((sym, make_keyword_expr(sym.name), True))
+                    else:
+                        raise SyntaxError(":keys value must be a vector of symbols")
+                elif isinstance(key, Symbol):
+                    # Clojure-style: {a :x} means bind 'a' to value at key :x
+                    if isinstance(value, Keyword):
+                        lookup_expr = make_keyword_expr(value.name)
+                    elif isinstance(value, str):
+                        lookup_expr = ast.Constant(value=value)
+                    else:
+                        raise SyntaxError(
+                            f"Map pattern key must be a keyword or string, got {type(value)}"
                         )
-                    ],
-                    orelse=[],
-                )
-                set_location(key_check, loc)
-                stmts.append(key_check)
-                # Bind or match the value pattern
-                if isinstance(value, Keyword):
-                    lookup_expr2 = make_keyword_expr(value.name)
-                elif isinstance(value, str):
-                    lookup_expr2 = ast.Constant(value=value)
+                    entries.append((key, lookup_expr, False))
+                elif isinstance(key, Keyword):
+                    # Reverse syntax: {:x a} means bind 'a' to value at key :x
+                    entries.append((value, make_keyword_expr(key.name), False))
                 else:
-                    lookup_expr2 = lookup_expr
-                elem_expr = ast.Call(
-                    func=ast.Name(id="get", ctx=ast.Load()),
-                    args=[temp_load, lookup_expr2],
-                    keywords=[],
-                )
-                stmts.extend(
-                    compile_pattern_check(key, elem_expr, ok_var, bindings_list)
-                )
-            elif isinstance(key, Keyword):
-                # Reverse syntax: {:x a} means bind 'a' to value at key :x
-                lookup_expr = make_keyword_expr(key.name)
-                # Check key exists
-                key_check = ast.If(
-                    test=ast.BoolOp(
-                        op=ast.And(),
-                        values=[
-                            ast.Name(id=ok_var, ctx=ast.Load()),
-                            ast.Compare(
-                                left=ast.Call(
-                                    func=ast.Name(id="get", ctx=ast.Load()),
-                                    args=[
-                                        temp_load,
-                                        lookup_expr,
-                                        ast.Name(id="_MISSING", ctx=ast.Load()),
-                                    ],
-                                    keywords=[],
-                                ),
-                                ops=[ast.Is()],
-                                comparators=[ast.Name(id="_MISSING", ctx=ast.Load())],
-                            ),
-                        ],
-                    ),
-                    body=[
-                        ast.Assign(
-                            targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-                            value=ast.Constant(value=False),
-                        )
-                    ],
-                    orelse=[],
+                    raise SyntaxError(f"Invalid map pattern key: {key!r}")
+
+            if not entries:
+                continue
+
+            # Look each key up once into its own temp and bind from it:
+            #   v = get(t, k, _MISSING)
+            #   if v is _MISSING: <fail>
+            # In ok_var mode the lookup is skipped once a check has failed.
+            get_func = ast.Name(id="get", ctx=_LOAD)
+            missing = ast.Name(id="_MISSING", ctx=_LOAD)
+            children = []
+            for sub_pattern, lookup_expr, is_keys_binding in entries:
+                val = gensym("__match_val_")
+                val_load = ast.Name(id=val, ctx=_LOAD)
+                lookup = ast.Call(
+                    func=get_func, args=[temp_load, lookup_expr, missing], keywords=[]
                 )
-                set_location(key_check, loc)
-                stmts.append(key_check)
-                # Bind or match the value pattern
-                elem_expr = ast.Call(
-                    func=ast.Name(id="get", ctx=ast.Load()),
-                    args=[temp_load, make_keyword_expr(key.name)],
-                    keywords=[],
+                if ok_var is not None:
+                    lookup = ast.IfExp(
+                        test=ast.Name(id=ok_var, ctx=_LOAD),
+                        body=lookup,
+                        orelse=missing,
+                    )
+                stmts.append(
+                    ast.Assign(targets=[ast.Name(id=val, ctx=_STORE)], value=lookup)
                 )
-                stmts.extend(
-                    compile_pattern_check(value, elem_expr, ok_var, bindings_list)
+                failed = ast.Compare(
+                    left=val_load, ops=[ast.Is()], comparators=[missing]
                 )
-            else:
-                raise SyntaxError(f"Invalid map pattern key: {key!r}")
+                stmts.append(_make_fail_check(ok_var, failed, loc))
+                if is_keys_binding:
+                    children.append(
+                        (_KEYS_BINDING, (sub_pattern.name, val_load), None, False)
+                    )
+                else:
+                    children.append((sub_pattern, val_load, None, False))
 
-        return stmts
+            # Bind or match each value pattern against its temp
+            work.extend(reversed(children))
+            continue
 
-    # Guarded pattern at top level: (pat :when guard)
-    if is_guarded_pattern(pattern):
+        # Guarded pattern at top level: (pat :when guard)
         inner_pattern, guard = parse_guarded_pattern(pattern)
-        # Just match the inner pattern; guard is handled by caller
-        stmts.extend(
-            compile_pattern_check(inner_pattern, value_expr, ok_var, bindings_list)
-        )
-        return stmts
+        if guard is not None:
+            # Just match the inner pattern; guard is handled by caller
+            work.append((inner_pattern, value_expr, None, known_iterable))
+            continue
 
-    raise SyntaxError(f"Invalid pattern: {pattern!r}")
+        raise SyntaxError(f"Invalid pattern: {pattern!r}")
+
+    return stmts
 
 
-def compile_match_case(pattern, result_expr, target_var, result_var, matched_var):
+def compile_match_case(pattern, result_expr, target_var):
     """
     Compile a single match case.
 
-    Returns a list of AST statements that:
+    The checks run inside a single-pass `while True` loop so that the first
+    failing check exits the case with `break` and falls through to the next
+    one. Returns a list of AST statements that:
     1. Check if pattern matches target_var
-    2. If match succeeds (and guard passes), evaluate result_expr and set result_var, matched_var
+    2. If match succeeds (and guard passes), return result_expr from the
+       enclosing match function
     """
-    stmts = []
-    ok_var = gensym("__match_ok_")
     bindings_list = []
+    ctx = get_compile_context()
 
     # Parse guard if present
     inner_pattern, guard_expr = parse_guarded_pattern(pattern)
 
-    # Initialize match ok flag
-    stmts.append(
-        ast.Assign(
-            targets=[ast.Name(id=ok_var, ctx=ast.Store())],
-            value=ast.Constant(value=True),
-        )
-    )
-
     # Compile pattern checks
-    target_load = ast.Name(id=target_var, ctx=ast.Load())
-    stmts.extend(
-        compile_pattern_check(inner_pattern, target_load, ok_var, bindings_list)
-    )
-
-    # Build the body that runs when pattern matches
-    match_body = []
+    target_load = _load(target_var)
+    stmts = compile_pattern_check(inner_pattern, target_load, None, bindings_list)
+    refutable = bool(stmts)
 
-    # Add bindings - handle both 2-tuple and 3-tuple formats
-    for binding in bindings_list:
-        if len(binding) == 3:
-            name, val_expr, type_annotation = binding
-        else:
-            # Backward compatibility with 2-tuple format
-            name, val_expr = binding
-            type_annotation = None
-
-        if type_annotation is not None:
-            # Emit annotated assignment: x: int = value
-            match_body.append(
-                ast.AnnAssign(
-                    target=ast.Name(id=normalize_name(name), ctx=ast.Store()),
-                    annotation=type_annotation,
-                    value=val_expr,
-                    simple=1,
-                )
-            )
-        else:
-            match_body.append(
-                ast.Assign(
-                    targets=[ast.Name(id=normalize_name(name), ctx=ast.Store())],
-                    value=val_expr,
-                )
-            )
+    # Add bindings
+    stmts.extend(_make_binding_stmt(binding) for binding in bindings_list)
 
     # Save nested functions count before compiling result/guard
-    ctx = get_compile_context()
     saved_funcs_count = len(ctx.nested_functions)
 
-    # Compile guard check and result
-    if guard_expr is not None:
-        # if guard_expr: result_var = result_expr; matched_var = True
-        guard_compiled = compile_expr(guard_expr)
-        result_compiled = compile_expr(result_expr)
-
-        # Extract nested functions generated during compilation
-        nested_funcs = ctx.nested_functions[saved_funcs_count:]
-        ctx.nested_functions = ctx.nested_functions[:saved_funcs_count]
+    guard_compiled = compile_expr(guard_expr) if guard_expr is not None else None
+    result_return = ast.Return(value=compile_expr(result_expr))
 
-        # Add nested function definitions before the guard check
-        match_body.extend(nested_funcs)
+    # Extract nested functions generated during compilation and add them
+    # before the guard check / return, truncating the context list in place
+    stmts.extend(ctx.nested_functions[saved_funcs_count:])
+    del ctx.nested_functions[saved_funcs_count:]
 
-        guard_if = ast.If(
-            test=guard_compiled,
-            body=[
-                ast.Assign(
-                    targets=[ast.Name(id=result_var, ctx=ast.Store())],
-                    value=result_compiled,
-                ),
-                ast.Assign(
-                    targets=[ast.Name(id=matched_var, ctx=ast.Store())],
-                    value=ast.Constant(value=True),
-                ),
-            ],
-            orelse=[],
-        )
-        match_body.append(guard_if)
+    if guard_compiled is None:
+        # No guard: return result_expr
+        stmts.append(result_return)
+        # Irrefutable pattern: nothing can fail, so no loop is needed
+        if not refutable:
+            return stmts
     else:
-        # No guard: result_var = result_expr; matched_var = True
-        result_compiled = compile_expr(result_expr)
+        # if guard_expr: return result_expr
+        stmts.append(ast.If(test=guard_compiled, body=[result_return], orelse=[]))
+        stmts.append(ast.Break())
 
-        # Extract nested functions generated during compilation
-        nested_funcs = ctx.nested_functions[saved_funcs_count:]
-        ctx.nested_functions = ctx.nested_functions[:saved_funcs_count]
+    return [ast.While(test=ast.Constant(value=True), body=stmts, orelse=[])]
 
-        # Add nested function definitions before the result assignment
-        match_body.extend(nested_funcs)
 
-        match_body.append(
-            ast.Assign(
-                targets=[ast.Name(id=result_var, ctx=ast.Store())],
-                value=result_compiled,
-            )
+# Minimum run of consecutive literal cases compiled as a table switch
+_LITERAL_SWITCH_MIN_CASES = 3
+
+
+def _case_index_tree(case_var, bodies, lo, hi):
+    """
+    Build a binary if-tree selecting bodies[lo:hi] by the value of case_var.
+    case_var is -1 (no match) or a valid index, so only the leftmost leaf
+    needs an equality test.
+    """
+    case_load = ast.Name(id=case_var, ctx=_LOAD)
+    if hi - lo == 1:
+        if lo > 0:
+            return bodies[lo]
+        test = ast.Compare(
+            left=case_load, ops=[ast.Eq()], comparators=[ast.Constant(value=lo)]
         )
-        match_body.append(
-            ast.Assign(
-                targets=[ast.Name(id=matched_var, ctx=ast.Store())],
-                value=ast.Constant(value=True),
-            )
+        return [ast.If(test=test, body=bodies[lo], orelse=[])]
+    mid = (lo + hi) // 2
+    test = ast.Compare(
+        left=case_load, ops=[ast.Lt()], comparators=[ast.Constant(value=mid)]
+    )
+    return [
+        ast.If(
+            test=test,
+            body=_case_index_tree(case_var, bodies, lo, mid),
+            orelse=_case_index_tree(case_var, bodies, mid, hi),
         )
+    ]
 
-    # Wrap in: if not matched_var: if ok_var: <match_body>
-    inner_if = ast.If(
-        test=ast.Name(id=ok_var, ctx=ast.Load()),
-        body=match_body if match_body else [ast.Pass()],
-        orelse=[],
-    )
 
-    outer_if = ast.If(
-        test=ast.UnaryOp(
-            op=ast.Not(),
-            operand=ast.Name(id=matched_var, ctx=ast.Load()),
+def compile_literal_switch(cases, target_var):
+    """
+    Compile a run of literal-keyed match cases into one table lookup.
+
+    The literals go into a module-level {literal: index} dict; the target is
+    looked up once and a binary if-tree over the index picks the case:
+
+        __match_case_N = (__match_switch_M.get(t, -1)
+                          if type(t) in _MATCH_LITERAL_TYPES
+                          else _match_literal_case(t, __match_switch_M))
+
+    Targets of other types fall back to ordered != comparisons so user
+    __eq__ methods behave as in an unswitched match. Repeated literals are
+    unreachable and dropped, as the first case with that literal wins.
+    """
+    ctx = get_compile_context()
+    seen = set()
+    keys = []
+    bodies = []
+    for pattern, result in cases:
+        literal = case_discriminator(pattern)
+        if literal in seen:
+            continue
+        seen.add(literal)
+        keys.append(compile_literal_pattern_value(pattern))
+        bodies.append(compile_match_case(Symbol("_"), result, target_var))
+
+    table = ctx.hoist_constant(
+        "__match_switch_",
+        ast.Dict(keys=keys, values=[ast.Constant(value=i) for i in range(len(keys))]),
+    )
+    target_load = _load(target_var)
+    table_load = _load(table)
+    case_var = gensym("__match_case_")
+    lookup = ast.IfExp(
+        test=ast.Compare(
+            left=ast.Call(
+                func=_load("type"),
+                args=[target_load],
+                keywords=[],
+            ),
+            ops=[ast.In()],
+            comparators=[_load("_MATCH_LITERAL_TYPES")],
+        ),
+        body=ast.Call(
+            func=ast.Attribute(value=table_load, attr="get", ctx=_LOAD),
+            args=[target_load, ast.Constant(value=-1)],
+            keywords=[],
+        ),
+        orelse=ast.Call(
+            func=_load("_match_literal_case"),
+            args=[target_load, table_load],
+            keywords=[],
         ),
-        body=stmts + [inner_if],
-        orelse=[],
     )
+    stmts = [ast.Assign(targets=[_store(case_var)], value=lookup)]
+    stmts.extend(_case_index_tree(case_var, bodies, 0, len(bodies)))
+    return stmts
+
 
-    return [outer_if]
+def _iter_match_case_stmts(cases, target_var):
+    """
+    Yield the statements of each (pattern, result) match case in order, one
+    list per case. Runs of literal cases become a table switch when
+    module-level constants are available to hold the table.
+    """
+    can_switch = get_compile_context().keyword_constants is not None
+    discriminators = [case_discriminator(pattern) for pattern, _ in cases]
+    i = 0
+    while i < len(cases):
+        run_end = i
+        while run_end < len(cases) and discriminators[run_end] is not None:
+            run_end += 1
+        if can_switch and run_end - i >= _LITERAL_SWITCH_MIN_CASES:
+            yield compile_literal_switch(cases[i:run_end], target_var)
+            i = run_end
+            continue
+        pattern, result = cases[i]
+        yield compile_match_case(pattern, result, target_var)
+        i += 1
 
 
 def compile_match_expr(args, form_loc=None):
     """
     Compile (match expr pattern1 result1 pattern2 result2 ...).
 
-    Returns an AST expression using IIFE pattern.
+    Returns an AST expression using IIFE pattern: a call of a nested
+    __match_fn_N(target) whose cases return their result directly.
     """
     if len(args) < 1:
         raise SyntaxError("match requires at least an expression")
@@ -4245,84 +4730,30 @@ def compile_match_expr(args, form_loc=None):
 
     # Generate variable names
     target_var = gensym("__match_target_")
-    result_var = gensym("__match_result_")
-    matched_var = gensym("__match_matched_")
     fn_name = gensym("__match_fn_")
 
-    # Build function body
-    body_stmts = []
+    # The target is evaluated at the call site and passed in, so it is a
+    # plain fast local inside the match function
+    target_value = compile_expr(target_expr)
 
-    # target_var = expr
-    body_stmts.append(
-        ast.Assign(
-            targets=[ast.Name(id=target_var, ctx=ast.Store())],
-            value=compile_expr(target_expr),
-        )
+    # Compile each case; a matching case returns its result directly
+    body_stmts = list(
+        itertools.chain.from_iterable(_iter_match_case_stmts(cases, target_var))
     )
 
-    # matched_var = False
-    body_stmts.append(
-        ast.Assign(
-            targets=[ast.Name(id=matched_var, ctx=ast.Store())],
-            value=ast.Constant(value=False),
+    # No case returned: raise MatchError(...), unless the last case is
+    # irrefutable and always returns
+    if not (body_stmts and isinstance(body_stmts[-1], ast.Return)):
+        body_stmts.append(
+            _make_match_error_raise("No pattern matched in match expression")
         )
-    )
 
-    # result_var = None (placeholder)
-    body_stmts.append(
-        ast.Assign(
-            targets=[ast.Name(id=result_var, ctx=ast.Store())],
-            value=ast.Constant(value=None),
-        )
-    )
-
-    # Compile each case
-    for pattern, result in cases:
-        case_stmts = compile_match_case(
-            pattern, result, target_var, result_var, matched_var
-        )
-        body_stmts.extend(case_stmts)
-
-    # if not matched_var: raise MatchError(...)
-    body_stmts.append(
-        ast.If(
-            test=ast.UnaryOp(
-                op=ast.Not(),
-                operand=ast.Name(id=matched_var, ctx=ast.Load()),
-            ),
-            body=[
-                ast.Raise(
-                    exc=ast.Call(
-                        func=ast.Name(id="MatchError", ctx=ast.Load()),
-                        args=[
-                            ast.Constant(value="No pattern matched in match expression")
-                        ],
-                        keywords=[],
-                    ),
-                    cause=None,
-                )
-            ],
-            orelse=[],
-        )
-    )
-
-    # return result_var
-    body_stmts.append(ast.Return(value=ast.Name(id=result_var, ctx=ast.Load())))
-
-    # Create the wrapper function
-    fn_def = ast.FunctionDef(
-        name=fn_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
-        body=body_stmts,
-        decorator_list=[],
+    # Create the wrapper function
+    fn_def = ast.FunctionDef(
+        name=fn_name,
+        args=_one_arg(target_var),
+        body=body_stmts,
+        decorator_list=[],
     )
 
     # Register the function
@@ -4330,8 +4761,8 @@ def compile_match_expr(args, form_loc=None):
 
     # Return call to the function
     return ast.Call(
-        func=ast.Name(id=fn_name, ctx=ast.Load()),
-        args=[],
+        func=_load(fn_name),
+        args=[target_value],
         keywords=[],
     )
 
@@ -4344,62 +4775,31 @@ def compile_stmt(form):
     form_loc = get_source_location(form)
     if isinstance(form, list) and form:
         head = form[0]
-        if is_symbol(head, "if"):
-            return compile_if_stmt(form[1:], form_loc)
-        if is_symbol(head, "do"):
-            # At statement level: (do s1 s2 s3) → emit multiple statements
-            inner = form[1:]
-            if not inner:
-                node = ast.Pass()
-                set_location(node, form_loc)
-                return node
-            stmts = []
-            for f in inner:
-                s = compile_stmt(f)
-                stmts.extend(flatten_stmts([s]))
-            return stmts
-        if is_symbol(head, "def"):
-            return compile_def(form[1:], form_loc)
-        if is_symbol(head, "defn"):
-            return compile_defn(form[1:], form_loc)
-        if is_symbol(head, "defclass"):
-            return compile_defclass(form[1:], form_loc)
-        if is_symbol(head, "let"):
-            return compile_let_stmt(form[1:], form_loc)
-        if is_symbol(head, "while"):
-            return compile_while(form[1:], form_loc)
-        if is_symbol(head, "for"):
-            return compile_for(form[1:], form_loc)
-        if is_symbol(head, "async-for"):
-            return compile_async_for(form[1:], form_loc)
-        if is_symbol(head, "await"):
-            return compile_await(form[1:], form_loc)
-        if is_symbol(head, "loop"):
-            return compile_loop(form[1:], form_loc)
-        if is_symbol(head, "with"):
-            return compile_with(form[1:], form_loc)
-        if is_symbol(head, "async-with"):
-            return compile_async_with(form[1:], form_loc)
-        if is_symbol(head, "yield"):
-            return compile_yield(form[1:], form_loc)
-        if is_symbol(head, "yield-from"):
-            return compile_yield_from(form[1:], form_loc)
-        if is_symbol(head, "try"):
-            return compile_try(form[1:], form_loc)
-        if is_symbol(head, "return"):
-            return compile_return(form[1:], form_loc)
-        if is_symbol(head, "throw"):
-            return compile_throw(form[1:], form_loc)
-        if is_symbol(head, "set!"):
-            return compile_set(form[1:], form_loc)
-        if is_symbol(head, "recur"):
-            raise SyntaxError("recur can only be used in tail position within a loop")
+        if isinstance(head, Symbol):
+            compile_special = _STMT_DISPATCH.get(head.name)
+            if compile_special is not None:
+                return compile_special(form[1:], form_loc)
+            if head.name == "recur":
+                raise SyntaxError(
+                    "recur can only be used in tail position within a loop"
+                )
     # Default: compile as expression statement
     node = ast.Expr(value=compile_expr(form))
     set_location(node, form_loc)
     return node
 
 
+def compile_do_stmt(args, form_loc=None):
+    """At statement level: (do s1 s2 s3) → emit multiple statements."""
+    if not args:
+        node = ast.Pass()
+        set_location(node, form_loc)
+        return node
+    stmts = []
+    _compile_stmts(args, stmts)
+    return stmts
+
+
 def compile_if_stmt(args, form_loc=None):
     # (if test then else)
     if len(args) not in (2, 3):
@@ -4408,8 +4808,11 @@ def compile_if_stmt(args, form_loc=None):
     then_form = args[1]
     else_form = args[2] if len(args) == 3 else None
     test = compile_expr(test_form)
-    body = flatten_stmts([compile_stmt(then_form)])
-    orelse = flatten_stmts([compile_stmt(else_form)]) if else_form is not None else []
+    body = []
+    _extend_stmt(body, compile_stmt(then_form))
+    orelse = []
+    if else_form is not None:
+        _extend_stmt(orelse, compile_stmt(else_form))
     # Ensure body is not empty
     if not body:
         body.append(ast.Pass())
@@ -4418,12 +4821,14 @@ def compile_if_stmt(args, form_loc=None):
     return node
 
 
-def compile_if_expr(args):
+def compile_if_expr(args, form_loc=None):
     """
     Compile (if test then else) in expression context.
 
-    Uses block-with-result pattern: wraps in IIFE with _spork_ret variable.
-    This allows any form (including while/for) in branches.
+    When both branches are expressions this is a plain conditional
+    expression. Otherwise it uses the block-with-result pattern: wraps in
+    IIFE with _spork_ret variable, which allows while/for/set!/throw/return
+    as a branch.
     """
     if len(args) not in (2, 3):
         raise SyntaxError("if requires test, then, optional else")
@@ -4432,8 +4837,19 @@ def compile_if_expr(args):
     then_form = args[1]
     else_form = args[2] if len(args) == 3 else None
 
+    if not (_is_block_stmt_form(then_form) or _is_block_stmt_form(else_form)):
+        # then_expr if test else else_expr
+        test_expr = compile_expr(test_form)
+        then_expr = compile_expr(then_form)
+        else_expr = (
+            compile_expr(else_form)
+            if else_form is not None
+            else ast.Constant(value=None)
+        )
+        return ast.IfExp(test=test_expr, body=then_expr, orelse=else_expr)
+
     ctx = get_compile_context()
-    saved_funcs = ctx.nested_functions[:]
+    saved_funcs_count = len(ctx.nested_functions)
 
     test_expr = compile_expr(test_form)
     ret_name = "_spork_ret"
@@ -4445,24 +4861,24 @@ def compile_if_expr(args):
     )
 
     # Get any nested functions generated
-    nested_funcs = ctx.nested_functions[len(saved_funcs) :]
-    ctx.nested_functions = saved_funcs
+    nested_funcs = ctx.nested_functions[saved_funcs_count:]
+    del ctx.nested_functions[saved_funcs_count:]
 
     # Generate wrapper function
     wrapper_name = gen_fn_name()
 
-    body = []
-    body.extend(nested_funcs)
-
-    # Initialize return variable to None
-    body.append(
-        ast.Assign(
-            targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-            value=ast.Constant(value=None),
+    # Nested functions, then _spork_ret = None (unless both branches set
+    # it), the if statement, and return _spork_ret
+    body = list(nested_funcs)
+    if not (
+        _assigns_name(then_block, ret_name) and _assigns_name(else_block, ret_name)
+    ):
+        body.append(
+            ast.Assign(
+                targets=[_store(ret_name)],
+                value=ast.Constant(value=None),
+            )
         )
-    )
-
-    # Add if statement
     body.append(
         ast.If(
             test=test_expr,
@@ -4470,22 +4886,12 @@ def compile_if_expr(args):
             orelse=else_block if else_block else [ast.Pass()],
         )
     )
-
-    # Return the result
-    body.append(ast.Return(value=ast.Name(id=ret_name, ctx=ast.Load())))
+    body.append(ast.Return(value=_load(ret_name)))
 
     # Create wrapper function
     wrapper_func = ast.FunctionDef(
         name=wrapper_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
+        args=_EMPTY_ARGS,
         body=body,
         decorator_list=[],
     )
@@ -4493,99 +4899,101 @@ def compile_if_expr(args):
     ctx.add_function(wrapper_func)
 
     return ast.Call(
-        func=ast.Name(id=wrapper_name, ctx=ast.Load()),
+        func=_load(wrapper_name),
         args=[],
         keywords=[],
     )
 
 
-def compile_let_stmt(args, form_loc=None):
-    """
-    Compile (let [x 1 y 2] body...) in statement context.
-    Emits sequential assignments followed by body statements.
-
-    Supports destructuring patterns:
-    - Vector patterns: [a b c] for sequence destructuring
-    - Dict patterns: {:keys [x y]} or {:x a :y b} for map destructuring
-    """
-    if len(args) < 1:
-        raise SyntaxError("let requires bindings vector")
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("let bindings must be a vector")
-    body_forms = args[1:]
-
-    items = bindings.items
-    if len(items) % 2 != 0:
-        raise SyntaxError("let bindings must have even number of forms")
-
-    # Collect binding names for scope tracking
-    def collect_binding_names(pattern):
-        """Recursively collect all variable names from a binding pattern."""
-        names = set()
+def _collect_binding_names(pattern):
+    """Collect all variable names from a (possibly nested) binding pattern."""
+    names = []
+    stack = [pattern]
+    while stack:
+        pattern = stack.pop()
         if isinstance(pattern, Symbol):
-            names.add(normalize_name(pattern.name))
+            names.append(normalize_name(pattern.name))
         elif isinstance(pattern, VectorLiteral):
             for item in pattern.items:
                 if isinstance(item, Symbol) and item.name == "&":
                     continue  # Skip the & itself
-                names.update(collect_binding_names(item))
+                stack.append(item)
         elif isinstance(pattern, MapLiteral):
+            # Test the value's type first; most pairs are {:key var}
             for k, v in pattern.pairs:
-                if isinstance(k, Keyword) and k.name == "keys":
+                if isinstance(v, Symbol):
+                    if not (isinstance(k, Keyword) and k.name == "keys"):
+                        # {:key var} form - var is the binding
+                        names.append(normalize_name(v.name))
+                elif (
+                    isinstance(v, VectorLiteral)
+                    and isinstance(k, Keyword)
+                    and k.name == "keys"
+                ):
                     # {:keys [a b c]} form
-                    if isinstance(v, VectorLiteral):
-                        for sym in v.items:
-                            if isinstance(sym, Symbol):
-                                names.add(normalize_name(sym.name))
-                elif isinstance(v, Symbol):
-                    # {:key var} form - var is the binding
-                    names.add(normalize_name(v.name))
-        return names
-
-    # Collect all binding names
-    binding_names = set()
-    for i in range(0, len(items), 2):
-        pattern = items[i]
-        binding_names.update(collect_binding_names(pattern))
-
-    # Push scope with the binding names for nested do/let nonlocal tracking
-    ctx = get_compile_context()
-    ctx.push_scope(binding_names)
-
-    stmts = []
-
-    # Compile bindings and collect any nested function definitions
-    for i in range(0, len(items), 2):
-        pattern = items[i]
-        value_form = items[i + 1]
-        value = compile_expr(value_form)
-
-        # Inject any nested function definitions before the assignment
-        nested_funcs = get_compile_context().get_and_clear_functions()
-        if nested_funcs:
-            stmts.extend(nested_funcs)
-
-        # Use destructuring for all patterns (handles both simple symbols and complex patterns)
-        stmts.extend(compile_destructure(pattern, value, form_loc))
-
-    if not body_forms:
-        stmts.append(ast.Pass())
-    else:
-        for f in body_forms:
-            s = compile_stmt(f)
-            stmts.extend(flatten_stmts([s]))
+                    names.extend(
+                        normalize_name(sym.name)
+                        for sym in v.items
+                        if isinstance(sym, Symbol)
+                    )
+    return set(names)
 
-    # Pop the scope we pushed
-    ctx.pop_scope()
 
-    return stmts
+def _let_as_lambda_call(bind_pairs, body_stmts, ret_name):
+    """
+    Lower an expression let to `(lambda x, y: body)(x_value, y_value)` when
+    that is equivalent to the wrapper function: plain distinct names, a
+    single expression body, and no binding value reading a name the let
+    binds (the values are evaluated outside the lambda, not in sequence).
+    Returns None when the let needs the full wrapper.
+    """
+    if len(body_stmts) != 1:
+        return None
+    body_stmt = body_stmts[0]
+    if not (
+        isinstance(body_stmt, ast.Assign)
+        and isinstance(body_stmt.targets[0], ast.Name)
+        and body_stmt.targets[0].id == ret_name
+    ):
+        return None
+    names = []
+    for pattern, _ in bind_pairs:
+        if type(pattern) is not Symbol:
+            return None
+        names.append(normalize_name(pattern.name))
+    if len(set(names)) != len(names):
+        return None
+    bound = set(names)
+    for _, value in bind_pairs:
+        for node in ast.walk(value):
+            if isinstance(node, ast.Name) and node.id in bound:
+                return None
+    lambda_node = ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name, annotation=None) for name in names],
+            vararg=None,
+            kwonlyargs=[],
+            kw_defaults=[],
+            kwarg=None,
+            defaults=[],
+        ),
+        body=body_stmt.value,
+    )
+    return ast.Call(
+        func=lambda_node, args=[value for _, value in bind_pairs], keywords=[]
+    )
 
 
-def compile_let_stmt_with_return(args):
+def _compile_let_core(args, mode, form_loc=None):
     """
-    Compile (let [x 1 y 2] body...) in tail position of function.
-    Like compile_let_stmt but the last body form is returned.
+    Compile (let [x 1 y 2] body...). The mode picks the context:
+    - "stmt": sequential assignments followed by body statements
+    - "tail": like "stmt", but the last body form is returned
+    - "expr": block-with-result pattern, wrapped in an IIFE with a
+      _spork_ret variable so any forms (including while/for/try) work in
+      the body; a let of plain names around one expression becomes a
+      lambda call instead
 
     Supports destructuring patterns:
     - Vector patterns: [a b c] for sequence destructuring
@@ -4602,684 +5010,213 @@ def compile_let_stmt_with_return(args):
     if len(items) % 2 != 0:
         raise SyntaxError("let bindings must have even number of forms")
 
-    # Collect binding names for scope tracking
-    def collect_binding_names(pattern):
-        """Recursively collect all variable names from a binding pattern."""
-        names = set()
-        if isinstance(pattern, Symbol):
-            names.add(normalize_name(pattern.name))
-        elif isinstance(pattern, VectorLiteral):
-            for item in pattern.items:
-                if isinstance(item, Symbol) and item.name == "&":
-                    continue  # Skip the & itself
-                names.update(collect_binding_names(item))
-        elif isinstance(pattern, MapLiteral):
-            for k, v in pattern.pairs:
-                if isinstance(k, Keyword) and k.name == "keys":
-                    # {:keys [a b c]} form
-                    if isinstance(v, VectorLiteral):
-                        for sym in v.items:
-                            if isinstance(sym, Symbol):
-                                names.add(normalize_name(sym.name))
-                elif isinstance(v, Symbol):
-                    # {:key var} form - var is the binding
-                    names.add(normalize_name(v.name))
-        return names
+    # Split the bindings into patterns and value forms once
+    patterns = items[0::2]
+    value_forms = items[1::2]
 
     # Collect all binding names
     binding_names = set()
-    for i in range(0, len(items), 2):
-        pattern = items[i]
-        binding_names.update(collect_binding_names(pattern))
+    for pattern in patterns:
+        binding_names.update(_collect_binding_names(pattern))
 
     # Push scope with the binding names for nested do/let nonlocal tracking
     ctx = get_compile_context()
     ctx.push_scope(binding_names)
 
-    stmts = []
-    for i in range(0, len(items), 2):
-        pattern = items[i]
-        value_form = items[i + 1]
-        value = compile_expr(value_form)
-
-        # Inject any nested function definitions before the assignment
-        nested_funcs = get_compile_context().get_and_clear_functions()
-        if nested_funcs:
-            stmts.extend(nested_funcs)
+    if mode == "expr":
+        # Save current nested functions state and open a nonlocal frame
+        saved_funcs_count = len(ctx.nested_functions)
+        ctx.push_nonlocal_frame()
 
-        # Use destructuring for all patterns (handles both simple symbols and complex patterns)
-        stmts.extend(compile_destructure(pattern, value))
+        # Compile bindings - collect pattern/value pairs for destructuring
+        bind_pairs = [
+            (pattern, compile_expr(value_form))
+            for pattern, value_form in zip(patterns, value_forms)
+        ]
 
-    if not body_forms:
-        stmts.append(ast.Return(value=ast.Constant(value=None)))
-    else:
-        # Compile all but last as statements
-        for f in body_forms[:-1]:
-            s = compile_stmt(f)
-            stmts.extend(flatten_stmts([s]))
+        # Compile body using block-with-result pattern
+        ret_name = "_spork_ret"
+        body_stmts = compile_block_with_result(body_forms, ret_name)
 
-        # Last form: check if it's a statement or expression
-        last_form = body_forms[-1]
-        if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
-            head_name = last_form[0].name
-            if head_name == "try":
-                # Try form - compile with return
-                s = compile_try_stmt_with_return(last_form[1:])
-                stmts.extend(flatten_stmts([s]))
-            elif head_name == "with":
-                # With form - compile with return
-                s = compile_with_stmt_with_return(last_form[1:])
-                stmts.append(s)
-            elif head_name == "loop":
-                # Loop form - compile with return
-                s = compile_loop_stmt_with_return(last_form[1:])
-                stmts.extend(flatten_stmts([s]))
-            elif head_name in ("while", "for", "set!"):
-                # Statement form - compile as statement, return None
-                s = compile_stmt(last_form)
-                stmts.extend(flatten_stmts([s]))
-                stmts.append(ast.Return(value=ast.Constant(value=None)))
-            elif head_name == "return":
-                # Already a return
-                s = compile_stmt(last_form)
-                stmts.extend(flatten_stmts([s]))
-            else:
-                # Expression - return it
-                stmts.append(ast.Return(value=compile_expr(last_form)))
-        else:
-            # Simple expression - return it
-            stmts.append(ast.Return(value=compile_expr(last_form)))
+        # Get all nested functions that were generated
+        nested_funcs = ctx.nested_functions[saved_funcs_count:]
+        del ctx.nested_functions[saved_funcs_count:]  # Reset
+
+        # Get nonlocal declarations needed and pop the frames
+        nonlocals = ctx.pop_nonlocal_frame()
+        ctx.pop_scope()
+
+        if not nested_funcs and not nonlocals:
+            call_node = _let_as_lambda_call(bind_pairs, body_stmts, ret_name)
+            if call_node is not None:
+                if form_loc:
+                    set_location(call_node, form_loc)
+                return call_node
+
+        # Generate wrapper function name
+        wrapper_name = gen_fn_name()
+
+        # Build wrapper function body: nonlocal declarations, nested function
+        # definitions, destructured bindings, _spork_ret = None (unless the body
+        # always sets it), the body, and return _spork_ret
+        ret_init = (
+            []
+            if _assigns_name(body_stmts, ret_name)
+            else [
+                ast.Assign(targets=[_store(ret_name)], value=ast.Constant(value=None))
+            ]
+        )
+        stmts = [
+            *([ast.Nonlocal(names=sorted(nonlocals))] if nonlocals else []),
+            *nested_funcs,
+            *itertools.chain.from_iterable(
+                compile_destructure(pattern, value) for pattern, value in bind_pairs
+            ),
+            *ret_init,
+            *body_stmts,
+            ast.Return(value=_load(ret_name)),
+        ]
 
-    # Pop the scope we pushed
-    ctx.pop_scope()
+        # Create wrapper function
+        wrapper_func = ast.FunctionDef(
+            name=wrapper_name,
+            args=_EMPTY_ARGS,
+            body=stmts,
+            decorator_list=[],
+        )
 
-    return stmts
+        # Set source location on wrapper function
+        if form_loc:
+            set_location(wrapper_func, form_loc)
 
+        # Add wrapper to context
+        ctx.add_function(wrapper_func)
 
-def compile_do_stmt_with_return(args):
-    """
-    Compile (do s1 s2 s3) in tail position of function.
-    All forms are statements except the last which is returned.
-    """
-    if not args:
-        return ast.Return(value=ast.Constant(value=None))
+        # Return call to wrapper
+        call_node = ast.Call(
+            func=_load(wrapper_name),
+            args=[],
+            keywords=[],
+        )
+        if form_loc:
+            set_location(call_node, form_loc)
+        return call_node
 
-    stmts = []
-    # Compile all but last as statements
-    for f in args[:-1]:
-        s = compile_stmt(f)
-        stmts.extend(flatten_stmts([s]))
+    # Compile bindings; each one contributes any nested function definitions
+    # its value needed, then its (possibly destructuring) assignment.
+    # Functions pending before the let belong to the enclosing code
+    saved_funcs_count = len(ctx.nested_functions)
+    pieces = []
+    for pattern, value_form in zip(patterns, value_forms):
+        value = compile_expr(value_form)
+        pieces.append(ctx.nested_functions[saved_funcs_count:])
+        del ctx.nested_functions[saved_funcs_count:]
+        pieces.append(compile_destructure(pattern, value, form_loc))
+    stmts = list(itertools.chain.from_iterable(pieces))
 
-    # Last form: check if it's a statement or expression
-    last_form = args[-1]
-    if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
-        head_name = last_form[0].name
-        if head_name == "try":
-            # Try form - compile with return
-            s = compile_try_stmt_with_return(last_form[1:])
-            stmts.extend(flatten_stmts([s]))
-        elif head_name == "with":
-            # With form - compile with return
-            s = compile_with_stmt_with_return(last_form[1:])
-            stmts.append(s)
-        elif head_name in ("while", "for", "set!"):
-            # Statement form - compile as statement, return None
-            s = compile_stmt(last_form)
-            stmts.extend(flatten_stmts([s]))
-            stmts.append(ast.Return(value=ast.Constant(value=None)))
-        elif head_name == "return":
-            # Already a return
-            s = compile_stmt(last_form)
-            stmts.extend(flatten_stmts([s]))
+    if mode == "stmt":
+        if not body_forms:
+            stmts.append(ast.Pass())
         else:
-            # Expression - return it
-            stmts.append(ast.Return(value=compile_expr(last_form)))
+            for f in body_forms:
+                _extend_stmt(stmts, compile_stmt(f))
+    elif not body_forms:
+        stmts.append(ast.Return(value=None))
     else:
-        # Simple expression - return it
-        stmts.append(ast.Return(value=compile_expr(last_form)))
+        # Compile all but last as statements, then return the last form
+        last_form = _compile_leading_stmts(body_forms, stmts)
+        stmts.extend(_compile_tail_return(last_form))
+
+    # Pop the scope we pushed
+    ctx.pop_scope()
 
     return stmts
 
 
-def compile_let_expr(args, form_loc=None):
+def compile_let_stmt(args, form_loc=None):
     """
-    Compile (let [x 1 y 2] body...) in expression context.
-
-    Uses block-with-result pattern: wraps in IIFE with _spork_ret variable.
-    This allows any forms (including while/for/try) in let bodies.
-
-    Supports destructuring patterns:
-    - Vector patterns: [a b c] for sequence destructuring
-    - Dict patterns: {:keys [x y]} or {:x a :y b} for map destructuring
+    Compile (let [x 1 y 2] body...) in statement context.
+    Emits sequential assignments followed by body statements.
     """
-    if len(args) < 1:
-        raise SyntaxError("let requires bindings vector")
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("let bindings must be a vector")
-    body_forms = args[1:]
-
-    items = bindings.items
-    if len(items) % 2 != 0:
-        raise SyntaxError("let bindings must have even number of forms")
+    return _compile_let_core(args, "stmt", form_loc)
 
-    # Save current nested functions state
-    ctx = get_compile_context()
-    saved_funcs = ctx.nested_functions[:]
 
-    # Collect binding names for scope tracking
-    def collect_binding_names(pattern):
-        """Recursively collect all variable names from a binding pattern."""
-        names = set()
-        if isinstance(pattern, Symbol):
-            names.add(normalize_name(pattern.name))
-        elif isinstance(pattern, VectorLiteral):
-            for item in pattern.items:
-                if isinstance(item, Symbol) and item.name == "&":
-                    continue  # Skip the & itself
-                names.update(collect_binding_names(item))
-        elif isinstance(pattern, MapLiteral):
-            for k, v in pattern.pairs:
-                if isinstance(k, Keyword) and k.name == "keys":
-                    # {:keys [a b c]} form
-                    if isinstance(v, VectorLiteral):
-                        for sym in v.items:
-                            if isinstance(sym, Symbol):
-                                names.add(normalize_name(sym.name))
-                elif isinstance(v, Symbol):
-                    # {:key var} form - var is the binding
-                    names.add(normalize_name(v.name))
-        return names
-
-    # Collect all binding names
-    binding_names = set()
-    for i in range(0, len(items), 2):
-        pattern = items[i]
-        binding_names.update(collect_binding_names(pattern))
-
-    # Push a new scope with the binding names, and a nonlocal frame
-    ctx.push_scope(binding_names)
-    ctx.push_nonlocal_frame()
-
-    # Compile bindings - collect pattern/value pairs for destructuring
-    bind_pairs = []
-    for i in range(0, len(items), 2):
-        pattern = items[i]
-        value = compile_expr(items[i + 1])
-        bind_pairs.append((pattern, value))
-
-    # Compile body using block-with-result pattern
-    ret_name = "_spork_ret"
-    body_stmts = compile_block_with_result(body_forms, ret_name)
-
-    # Get all nested functions that were generated
-    nested_funcs = ctx.nested_functions[len(saved_funcs) :]
-    ctx.nested_functions = saved_funcs  # Reset
-
-    # Get nonlocal declarations needed and pop the frames
-    nonlocals = ctx.pop_nonlocal_frame()
-    ctx.pop_scope()
-
-    # Generate wrapper function name
-    wrapper_name = gen_fn_name()
-
-    # Build wrapper function body
-    stmts = []
-
-    # Add nonlocal declarations first if needed
-    if nonlocals:
-        stmts.append(ast.Nonlocal(names=sorted(nonlocals)))
-
-    # Add nested function definitions first
-    stmts.extend(nested_funcs)
-
-    # Add binding assignments using destructuring
-    for pattern, value in bind_pairs:
-        stmts.extend(compile_destructure(pattern, value))
-
-    # Initialize return variable to None
-    stmts.append(
-        ast.Assign(
-            targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-            value=ast.Constant(value=None),
-        )
-    )
-
-    # Add body statements
-    stmts.extend(body_stmts)
-
-    # Return the result
-    stmts.append(ast.Return(value=ast.Name(id=ret_name, ctx=ast.Load())))
-
-    # Create wrapper function
-    wrapper_func = ast.FunctionDef(
-        name=wrapper_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
-        body=stmts,
-        decorator_list=[],
-    )
-
-    # Set source location on wrapper function
-    if form_loc:
-        set_location(wrapper_func, form_loc)
-
-    # Add wrapper to context
-    ctx.add_function(wrapper_func)
-
-    # Return call to wrapper
-    call_node = ast.Call(
-        func=ast.Name(id=wrapper_name, ctx=ast.Load()),
-        args=[],
-        keywords=[],
-    )
-    if form_loc:
-        set_location(call_node, form_loc)
-    return call_node
-
-
-def parse_with_bindings(items):
-    """Parse with bindings from vector items.
-
-    Returns list of (pattern_or_none, context_manager_expr_form) tuples.
-
-    Supports:
-    - [name expr] - bind cm to name
-    - [name1 expr1 name2 expr2] - multiple bindings
-    - [expr] - no binding (just evaluate context manager)
-    - [[a b] expr] - destructuring binding
-    """
-    result = []
-    i = 0
-    while i < len(items):
-        item = items[i]
-
-        # Check if this is a binding pattern or a context manager expression
-        # Binding patterns are: Symbol, Vector (for destructuring), MapLiteral (for dict destructuring)
-        # Context manager expressions are: list (function call), or other expressions
-        if isinstance(item, (Symbol, VectorLiteral, MapLiteral)):
-            # This is a binding pattern, next item is the cm expression
-            if i + 1 >= len(items):
-                raise SyntaxError(
-                    "with binding pattern must be followed by context manager expression"
-                )
-            pattern = item
-            cm_form = items[i + 1]
-            result.append((pattern, cm_form))
-            i += 2
-        else:
-            # This is a context manager expression with no binding
-            result.append((None, item))
-            i += 1
-
-    return result
-
-
-def compile_with(args, form_loc=None):
-    """
-    Compile (with [bindings] body...) to ast.With.
-
-    Supports:
-    - Simple binding: (with [f (open "file.txt" "r")] ...)
-    - Multiple bindings: (with [f1 (open "in.txt") f2 (open "out.txt")] ...)
-    - No binding: (with [(open "file.txt")] ...)
-    - Destructuring: (with [[a b] (some-context-manager)] ...)
-    """
-    if len(args) < 1:
-        raise SyntaxError("with requires bindings vector")
-
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("with bindings must be a vector")
-
-    body_forms = args[1:]
-
-    # Parse bindings
-    parsed = parse_with_bindings(bindings.items)
-    if not parsed:
-        raise SyntaxError("with requires at least one context manager")
-
-    # Build withitems
-    withitems = []
-    destructure_stmts = []
-
-    for pattern, cm_form in parsed:
-        cm_expr = compile_expr(cm_form)
-
-        if pattern is None:
-            # No binding
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=None))
-        elif isinstance(pattern, Symbol):
-            # Simple binding
-            target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-        else:
-            # Destructuring binding - use temp var and destructure in body
-            temp = gensym("__with_item_")
-            target = ast.Name(id=temp, ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
-            destructure_stmts.extend(compile_destructure(pattern, temp_load))
-
-    # Compile body
-    body = []
-    body.extend(destructure_stmts)
-
-    if not body_forms:
-        if not body:
-            body.append(ast.Pass())
-    else:
-        for f in body_forms:
-            s = compile_stmt(f)
-            body.extend(flatten_stmts([s]))
-        if not body:
-            body.append(ast.Pass())
-
-    node = ast.With(items=withitems, body=body)
-    set_location(node, form_loc)
-    return node
-
-
-def compile_with_stmt_with_return(args):
-    """
-    Compile (with [bindings] body...) in tail position of function.
-    Like compile_with but the last body form is returned.
-    """
-    if len(args) < 1:
-        raise SyntaxError("with requires bindings vector")
-
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("with bindings must be a vector")
-
-    body_forms = args[1:]
-
-    # Parse bindings
-    parsed = parse_with_bindings(bindings.items)
-    if not parsed:
-        raise SyntaxError("with requires at least one context manager")
-
-    # Build withitems
-    withitems = []
-    destructure_stmts = []
-
-    for pattern, cm_form in parsed:
-        cm_expr = compile_expr(cm_form)
-
-        if pattern is None:
-            # No binding
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=None))
-        elif isinstance(pattern, Symbol):
-            # Simple binding
-            target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-        else:
-            # Destructuring binding - use temp var and destructure in body
-            temp = gensym("__with_item_")
-            target = ast.Name(id=temp, ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
-            destructure_stmts.extend(compile_destructure(pattern, temp_load))
-
-    # Compile body with return for last form
-    body = []
-    body.extend(destructure_stmts)
-
-    if not body_forms:
-        body.append(ast.Return(value=ast.Constant(value=None)))
-    else:
-        # Compile all but last as statements
-        for f in body_forms[:-1]:
-            s = compile_stmt(f)
-            body.extend(flatten_stmts([s]))
-
-        # Last form: check if it's a statement or expression
-        last_form = body_forms[-1]
-        if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
-            head_name = last_form[0].name
-            if head_name == "try":
-                # Try form - compile with return
-                s = compile_try_stmt_with_return(last_form[1:])
-                body.extend(flatten_stmts([s]))
-            elif head_name == "with":
-                # Nested with - compile with return
-                s = compile_with_stmt_with_return(last_form[1:])
-                body.append(s)
-            elif head_name == "async-with":
-                # Nested async-with - compile with return
-                s = compile_async_with_stmt_with_return(last_form[1:])
-                body.append(s)
-            elif head_name in ("while", "for", "async-for", "set!"):
-                # Statement form - compile as statement, return None
-                s = compile_stmt(last_form)
-                body.extend(flatten_stmts([s]))
-                body.append(ast.Return(value=ast.Constant(value=None)))
-            elif head_name == "return":
-                # Already a return
-                s = compile_stmt(last_form)
-                body.extend(flatten_stmts([s]))
-            else:
-                # Expression - return it
-                body.append(ast.Return(value=compile_expr(last_form)))
-        else:
-            # Simple expression - return it
-            body.append(ast.Return(value=compile_expr(last_form)))
-
-    return ast.With(items=withitems, body=body)
-
-
-def compile_with_expr(args):
-    """
-    Compile (with [bindings] body...) as an expression.
-    Uses IIFE (immediately invoked function expression) pattern.
-    """
-    if len(args) < 1:
-        raise SyntaxError("with requires bindings vector")
-
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("with bindings must be a vector")
-
-    body_forms = args[1:]
-
-    # Parse bindings
-    parsed = parse_with_bindings(bindings.items)
-    if not parsed:
-        raise SyntaxError("with requires at least one context manager")
-
-    # Build withitems
-    withitems = []
-    destructure_stmts = []
-
-    for pattern, cm_form in parsed:
-        cm_expr = compile_expr(cm_form)
-
-        if pattern is None:
-            # No binding
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=None))
-        elif isinstance(pattern, Symbol):
-            # Simple binding
-            target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-        else:
-            # Destructuring binding - use temp var and destructure in body
-            temp = gensym("__with_item_")
-            target = ast.Name(id=temp, ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
-            destructure_stmts.extend(compile_destructure(pattern, temp_load))
-
-    # Build IIFE wrapper
-    ctx = get_compile_context()
-    saved_funcs = ctx.nested_functions[:]
-
-    ret_name = gensym("__with_ret_")
-
-    # Body of the with statement
-    with_body = []
-    with_body.extend(destructure_stmts)
-
-    if not body_forms:
-        with_body.append(
-            ast.Assign(
-                targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-                value=ast.Constant(value=None),
-            )
-        )
-    else:
-        # Compile all but last as statements
-        for f in body_forms[:-1]:
-            s = compile_stmt(f)
-            with_body.extend(flatten_stmts([s]))
-
-        # Last form: assign to ret_name
-        last_form = body_forms[-1]
-        with_body.append(
-            ast.Assign(
-                targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-                value=compile_expr(last_form),
-            )
-        )
-
-    # Create the with statement
-    with_stmt = ast.With(items=withitems, body=with_body)
-
-    # Get any nested functions generated
-    nested_funcs = ctx.nested_functions[len(saved_funcs) :]
-    ctx.nested_functions = saved_funcs
-
-    # Generate wrapper function
-    wrapper_name = gen_fn_name()
-
-    wrapper_body = []
-    wrapper_body.extend(nested_funcs)
-    wrapper_body.append(
-        ast.Assign(
-            targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-            value=ast.Constant(value=None),
-        )
-    )
-    wrapper_body.append(with_stmt)
-    wrapper_body.append(ast.Return(value=ast.Name(id=ret_name, ctx=ast.Load())))
-
-    wrapper_def = ast.FunctionDef(
-        name=wrapper_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
-        body=wrapper_body,
-        decorator_list=[],
-    )
-
-    # Add wrapper to context for injection
-    get_compile_context().add_function(wrapper_def)
-
-    # Return call to wrapper
-    return ast.Call(
-        func=ast.Name(id=wrapper_name, ctx=ast.Load()),
-        args=[],
-        keywords=[],
-    )
-
-
-def compile_async_with(args, form_loc=None):
+def compile_let_stmt_with_return(args):
     """
-    Compile (async-with [bindings] body...) to ast.AsyncWith.
-
-    Supports:
-    - Simple binding: (async-with [session (aiohttp.ClientSession)] ...)
-    - Multiple bindings: (async-with [s1 (cm1) s2 (cm2)] ...)
-    - No binding: (async-with [(some-async-cm)] ...)
-    - Destructuring: (async-with [[a b] (some-async-context-manager)] ...)
+    Compile (let [x 1 y 2] body...) in tail position of function.
+    Like compile_let_stmt but the last body form is returned.
     """
-    if len(args) < 1:
-        raise SyntaxError("async-with requires bindings vector")
-
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("async-with bindings must be a vector")
-
-    body_forms = args[1:]
-
-    # Parse bindings
-    parsed = parse_with_bindings(bindings.items)
-    if not parsed:
-        raise SyntaxError("async-with requires at least one context manager")
-
-    # Build withitems
-    withitems = []
-    destructure_stmts = []
-
-    for pattern, cm_form in parsed:
-        cm_expr = compile_expr(cm_form)
-
-        if pattern is None:
-            # No binding
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=None))
-        elif isinstance(pattern, Symbol):
-            # Simple binding
-            target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-        else:
-            # Destructuring binding - use temp var and destructure in body
-            temp = gensym("__async_with_item_")
-            target = ast.Name(id=temp, ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
-            destructure_stmts.extend(compile_destructure(pattern, temp_load))
+    return _compile_let_core(args, "tail")
 
-    # Compile body
-    body = []
-    body.extend(destructure_stmts)
 
-    if not body_forms:
-        if not body:
-            body.append(ast.Pass())
-    else:
-        for f in body_forms:
-            s = compile_stmt(f)
-            body.extend(flatten_stmts([s]))
-        if not body:
-            body.append(ast.Pass())
+def compile_do_stmt_with_return(args):
+    """
+    Compile (do s1 s2 s3) in tail position of function.
+    All forms are statements except the last which is returned.
+    """
+    if not args:
+        return ast.Return(value=None)
 
-    node = ast.AsyncWith(items=withitems, body=body)
-    set_location(node, form_loc)
-    return node
+    # Compile all but last as statements, then return the last form
+    stmts = []
+    last_form = _compile_leading_stmts(args, stmts)
+    stmts.extend(_compile_tail_return(last_form))
+
+    return stmts
 
 
-def compile_async_with_stmt_with_return(args):
+def compile_let_expr(args, form_loc=None):
     """
-    Compile (async-with [bindings] body...) in tail position of function.
-    Like compile_async_with but the last body form is returned.
+    Compile (let [x 1 y 2] body...) in expression context.
     """
-    if len(args) < 1:
-        raise SyntaxError("async-with requires bindings vector")
+    return _compile_let_core(args, "expr", form_loc)
 
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("async-with bindings must be a vector")
 
-    body_forms = args[1:]
+def parse_with_bindings(items):
+    """Parse with bindings from vector items.
+
+    Returns list of (pattern_or_none, context_manager_expr_form) tuples.
+
+    Supports:
+    - [name expr] - bind cm to name
+    - [name1 expr1 name2 expr2] - multiple bindings
+    - [expr] - no binding (just evaluate context manager)
+    - [[a b] expr] - destructuring binding
+    """
+    result = []
+    i = 0
+    while i < len(items):
+        item = items[i]
+
+        # Check if this is a binding pattern or a context manager expression
+        # Binding patterns are: Symbol, Vector (for destructuring), MapLiteral (for dict destructuring)
+        # Context manager expressions are: list (function call), or other expressions
+        if isinstance(item, (Symbol, VectorLiteral, MapLiteral)):
+            # This is a binding pattern, next item is the cm expression
+            if i + 1 >= len(items):
+                raise SyntaxError(
+                    "with binding pattern must be followed by context manager expression"
+                )
+            pattern = item
+            cm_form = items[i + 1]
+            result.append((pattern, cm_form))
+            i += 2
+        else:
+            # This is a context manager expression with no binding
+            result.append((None, item))
+            i += 1
+
+    return result
 
-    # Parse bindings
-    parsed = parse_with_bindings(bindings.items)
-    if not parsed:
-        raise SyntaxError("async-with requires at least one context manager")
 
-    # Build withitems
+def _build_withitems(parsed):
+    """
+    Compile parsed with bindings to (withitems, destructure_stmts).
+
+    Symbols bind the context manager's value directly; destructuring
+    patterns bind a temp var that destructure_stmts unpacks at the start
+    of the body.
+    """
     withitems = []
     destructure_stmts = []
 
@@ -5289,187 +5226,216 @@ def compile_async_with_stmt_with_return(args):
         if pattern is None:
             # No binding
             withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=None))
-        elif isinstance(pattern, Symbol):
+        elif type(pattern) is Symbol:
             # Simple binding
-            target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
+            target = _store(normalize_name(pattern.name))
             withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
         else:
             # Destructuring binding - use temp var and destructure in body
-            temp = gensym("__async_with_item_")
-            target = ast.Name(id=temp, ctx=ast.Store())
+            temp = gensym("__with_item_")
+            target = _store(temp)
             withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
+            temp_load = _load(temp)
             destructure_stmts.extend(compile_destructure(pattern, temp_load))
 
-    # Compile body with return for last form
-    body = []
-    body.extend(destructure_stmts)
-
-    if not body_forms:
-        body.append(ast.Return(value=ast.Constant(value=None)))
-    else:
-        # Compile all but last as statements
-        for f in body_forms[:-1]:
-            s = compile_stmt(f)
-            body.extend(flatten_stmts([s]))
-
-        # Last form: check if it's a statement or expression
-        last_form = body_forms[-1]
-        if isinstance(last_form, list) and last_form and is_symbol(last_form[0]):
-            head_name = last_form[0].name
-            if head_name == "try":
-                # Try form - compile with return
-                s = compile_try_stmt_with_return(last_form[1:])
-                body.extend(flatten_stmts([s]))
-            elif head_name == "with":
-                # Nested with - compile with return
-                s = compile_with_stmt_with_return(last_form[1:])
-                body.append(s)
-            elif head_name == "async-with":
-                # Nested async-with - compile with return
-                s = compile_async_with_stmt_with_return(last_form[1:])
-                body.append(s)
-            elif head_name in ("while", "for", "async-for", "set!"):
-                # Statement form - compile as statement, return None
-                s = compile_stmt(last_form)
-                body.extend(flatten_stmts([s]))
-                body.append(ast.Return(value=ast.Constant(value=None)))
-            elif head_name == "return":
-                # Already a return
-                s = compile_stmt(last_form)
-                body.extend(flatten_stmts([s]))
-            else:
-                # Expression - return it
-                body.append(ast.Return(value=compile_expr(last_form)))
-        else:
-            # Simple expression - return it
-            body.append(ast.Return(value=compile_expr(last_form)))
-
-    return ast.AsyncWith(items=withitems, body=body)
+    return withitems, destructure_stmts
 
 
-def compile_async_with_expr(args):
+def _compile_with_common(args, is_async, mode, form_loc=None):
     """
-    Compile (async-with [bindings] body...) as an expression.
-    Uses async IIFE (immediately invoked function expression) pattern.
+    Compile (with [bindings] body...) or (async-with [bindings] body...).
+    The mode picks the context:
+    - "stmt": a plain with statement
+    - "tail": like "stmt", but the last body form is returned
+    - "expr": the with statement inside a wrapper function (awaited for
+      async-with) that returns the last body form's value
     """
+    head = "async-with" if is_async else "with"
     if len(args) < 1:
-        raise SyntaxError("async-with requires bindings vector")
+        raise SyntaxError(f"{head} requires bindings vector")
 
     bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("async-with bindings must be a vector")
+    if type(bindings) is not VectorLiteral:
+        raise SyntaxError(f"{head} bindings must be a vector")
 
     body_forms = args[1:]
 
     # Parse bindings
     parsed = parse_with_bindings(bindings.items)
     if not parsed:
-        raise SyntaxError("async-with requires at least one context manager")
+        raise SyntaxError(f"{head} requires at least one context manager")
 
-    # Build withitems
-    withitems = []
-    destructure_stmts = []
+    withitems, body = _build_withitems(parsed)
+    with_node = ast.AsyncWith if is_async else ast.With
 
-    for pattern, cm_form in parsed:
-        cm_expr = compile_expr(cm_form)
+    if mode == "stmt":
+        for f in body_forms:
+            _extend_stmt(body, compile_stmt(f))
+        if not body:
+            body.append(ast.Pass())
+        node = with_node(items=withitems, body=body)
+        set_location(node, form_loc)
+        return node
 
-        if pattern is None:
-            # No binding
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=None))
-        elif isinstance(pattern, Symbol):
-            # Simple binding
-            target = ast.Name(id=normalize_name(pattern.name), ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
+    if mode == "tail":
+        if not body_forms:
+            body.append(ast.Return(value=None))
         else:
-            # Destructuring binding - use temp var and destructure in body
-            temp = gensym("__async_with_item_")
-            target = ast.Name(id=temp, ctx=ast.Store())
-            withitems.append(ast.withitem(context_expr=cm_expr, optional_vars=target))
-            temp_load = ast.Name(id=temp, ctx=ast.Load())
-            destructure_stmts.extend(compile_destructure(pattern, temp_load))
+            # Compile all but last as statements, then return the last form
+            last_form = _compile_leading_stmts(body_forms, body)
+            body.extend(_compile_tail_return(last_form))
+        return with_node(items=withitems, body=body)
 
-    # Build async IIFE wrapper
+    # Expression: build the wrapper function
     ctx = get_compile_context()
-    saved_funcs = ctx.nested_functions[:]
-
-    ret_name = gensym("__async_with_ret_")
-
-    # Body of the async with statement
-    with_body = []
-    with_body.extend(destructure_stmts)
+    saved_funcs_count = len(ctx.nested_functions)
 
+    wrapper_body = []
     if not body_forms:
-        with_body.append(
-            ast.Assign(
-                targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-                value=ast.Constant(value=None),
-            )
-        )
+        # Nothing to capture: the wrapper just returns None
+        if not body:
+            body.append(ast.Pass())
+        wrapper_body.append(with_node(items=withitems, body=body))
+        wrapper_body.append(ast.Return(value=None))
     else:
-        # Compile all but last as statements
-        for f in body_forms[:-1]:
-            s = compile_stmt(f)
-            with_body.extend(flatten_stmts([s]))
+        ret_name = gensym("__with_ret_")
 
-        # Last form: assign to ret_name
-        last_form = body_forms[-1]
-        with_body.append(
+        # Compile all but last as statements, then assign the last to ret_name
+        last_form = _compile_leading_stmts(body_forms, body)
+        body.append(
             ast.Assign(
-                targets=[ast.Name(id=ret_name, ctx=ast.Store())],
+                targets=[_store(ret_name)],
                 value=compile_expr(last_form),
             )
         )
 
-    # Create the async with statement
-    with_stmt = ast.AsyncWith(items=withitems, body=with_body)
+        # ret_name starts out as None: a context manager that suppresses
+        # an exception skips the assignment above
+        wrapper_body.append(
+            ast.Assign(
+                targets=[_store(ret_name)],
+                value=ast.Constant(value=None),
+            )
+        )
+        wrapper_body.append(with_node(items=withitems, body=body))
+        wrapper_body.append(ast.Return(value=_load(ret_name)))
 
-    # Get any nested functions generated
-    nested_funcs = ctx.nested_functions[len(saved_funcs) :]
-    ctx.nested_functions = saved_funcs
+    # Nested functions generated by the body go ahead of the with statement
+    nested_funcs = ctx.nested_functions[saved_funcs_count:]
+    del ctx.nested_functions[saved_funcs_count:]
+    wrapper_body[:0] = nested_funcs
 
-    # Generate async wrapper function
+    # Generate wrapper function
     wrapper_name = gen_fn_name()
 
-    wrapper_body = []
-    wrapper_body.extend(nested_funcs)
-    wrapper_body.append(
-        ast.Assign(
-            targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-            value=ast.Constant(value=None),
-        )
-    )
-    wrapper_body.append(with_stmt)
-    wrapper_body.append(ast.Return(value=ast.Name(id=ret_name, ctx=ast.Load())))
-
-    wrapper_def = ast.AsyncFunctionDef(
+    wrapper_def = (ast.AsyncFunctionDef if is_async else ast.FunctionDef)(
         name=wrapper_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
+        args=_EMPTY_ARGS,
         body=wrapper_body,
         decorator_list=[],
     )
 
     # Add wrapper to context for injection
-    get_compile_context().add_function(wrapper_def)
+    ctx.add_function(wrapper_def)
 
-    # Return await of call to async wrapper
-    return ast.Await(
-        value=ast.Call(
-            func=ast.Name(id=wrapper_name, ctx=ast.Load()),
-            args=[],
-            keywords=[],
-        )
+    # Return call to wrapper, awaited for async-with
+    call_node = ast.Call(
+        func=_load(wrapper_name),
+        args=[],
+        keywords=[],
+    )
+    return ast.Await(value=call_node) if is_async else call_node
+
+
+def compile_with(args, form_loc=None):
+    """
+    Compile (with [bindings] body...) to ast.With.
+
+    Supports:
+    - Simple binding: (with [f (open "file.txt" "r")] ...)
+    - Multiple bindings: (with [f1 (open "in.txt") f2 (open "out.txt")] ...)
+    - No binding: (with [(open "file.txt")] ...)
+    - Destructuring: (with [[a b] (some-context-manager)] ...)
+    """
+    return _compile_with_common(args, False, "stmt", form_loc)
+
+
+def compile_with_stmt_with_return(args):
+    """
+    Compile (with [bindings] body...) in tail position of function.
+    Like compile_with but the last body form is returned.
+    """
+    return _compile_with_common(args, False, "tail")
+
+
+def compile_with_expr(args, form_loc=None):
+    """
+    Compile (with [bindings] body...) as an expression.
+    Uses IIFE (immediately invoked function expression) pattern.
+    """
+    return _compile_with_common(args, False, "expr")
+
+
+def compile_async_with(args, form_loc=None):
+    """
+    Compile (async-with [bindings] body...) to ast.AsyncWith.
+
+    Supports:
+    - Simple binding: (async-with [session (aiohttp.ClientSession)] ...)
+    - Multiple bindings: (async-with [s1 (cm1) s2 (cm2)] ...)
+    - No binding: (async-with [(some-async-cm)] ...)
+    - Destructuring: (async-with [[a b] (some-async-context-manager)] ...)
+    """
+    return _compile_with_common(args, True, "stmt", form_loc)
+
+
+def compile_async_with_stmt_with_return(args):
+    """
+    Compile (async-with [bindings] body...) in tail position of function.
+    Like compile_async_with but the last body form is returned.
+    """
+    return _compile_with_common(args, True, "tail")
+
+
+def compile_async_with_expr(args, form_loc=None):
+    """
+    Compile (async-with [bindings] body...) as an expression.
+    Uses async IIFE (immediately invoked function expression) pattern.
+    """
+    return _compile_with_common(args, True, "expr")
+
+
+# Heads of forms that compile_block_with_result emits as plain statements
+# when they end a block, leaving the block value as None
+_BLOCK_STMT_HEADS = _interned({"while", "for", "set!", "throw", "return"})
+
+
+def _is_block_stmt_form(form):
+    """Check if form is a statement-only construct at the end of a block."""
+    return (
+        isinstance(form, list)
+        and bool(form)
+        and isinstance(form[0], Symbol)
+        and form[0].name in _BLOCK_STMT_HEADS
     )
 
 
+def _assigns_name(stmts, name):
+    """
+    Check if a plain `name = ...` is one of stmts itself (not nested in a
+    compound statement), so name is always bound once stmts finish.
+    """
+    for stmt in stmts:
+        if (
+            type(stmt) is ast.Assign
+            and len(stmt.targets) == 1
+            and type(stmt.targets[0]) is ast.Name
+            and stmt.targets[0].id == name
+        ):
+            return True
+    return False
+
+
 def compile_block_with_result(forms, ret_name="_spork_ret"):
     """
     Compile a list of forms into statements that manage a return value.
@@ -5490,30 +5456,17 @@ def compile_block_with_result(forms, ret_name="_spork_ret"):
         return stmts
 
     # All but last: statement context
-    for f in forms[:-1]:
-        s = compile_stmt(f)
-        stmts.extend(flatten_stmts([s]))
-
-    last = forms[-1]
+    last = _compile_leading_stmts(forms, stmts)
 
-    # Check if last form is a statement-only construct
-    is_stmt_only = False
-    if isinstance(last, list) and last and is_symbol(last[0]):
-        head = last[0].name
-        if head in ("while", "for", "set!", "throw", "return"):
-            is_stmt_only = True
-
-    if is_stmt_only:
+    if _is_block_stmt_form(last):
         # Pure statement: compile it, don't touch ret_name
         s = compile_stmt(last)
-        stmts.extend(flatten_stmts([s]))
+        _extend_stmt(stmts, s)
         # ret_name keeps its current value (likely None)
     else:
         # Expression-producing form: assign its value to ret_name
         value_expr = compile_expr(last)
-        assign_stmt = ast.Assign(
-            targets=[ast.Name(id=ret_name, ctx=ast.Store())], value=value_expr
-        )
+        assign_stmt = ast.Assign(targets=[_store(ret_name)], value=value_expr)
         # Preserve source location from the last form
         last_loc = get_source_location(last)
         set_location(assign_stmt, last_loc)
@@ -5553,7 +5506,7 @@ def compile_loop(args, form_loc=None):
     if len(args) < 1:
         raise SyntaxError("loop requires bindings vector")
     bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
+    if type(bindings) is not VectorLiteral:
         raise SyntaxError("loop bindings must be a vector")
     body_forms = args[1:]
 
@@ -5567,14 +5520,12 @@ def compile_loop(args, form_loc=None):
     for i in range(0, len(items), 2):
         pattern = items[i]
         value_form = items[i + 1]
-        if not isinstance(pattern, Symbol):
+        if type(pattern) is not Symbol:
             raise SyntaxError("loop bindings must be simple symbols (no destructuring)")
         var_name = normalize_name(pattern.name)
         var_names.append(var_name)
         value = compile_expr(value_form)
-        assign = ast.Assign(
-            targets=[ast.Name(id=var_name, ctx=ast.Store())], value=value
-        )
+        assign = ast.Assign(targets=[_store(var_name)], value=value)
         set_location(assign, get_source_location(pattern))
         init_stmts.append(assign)
 
@@ -5609,7 +5560,7 @@ def compile_loop_stmt_with_return(args):
     if len(args) < 1:
         raise SyntaxError("loop requires bindings vector")
     bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
+    if type(bindings) is not VectorLiteral:
         raise SyntaxError("loop bindings must be a vector")
     body_forms = args[1:]
 
@@ -5623,14 +5574,12 @@ def compile_loop_stmt_with_return(args):
     for i in range(0, len(items), 2):
         pattern = items[i]
         value_form = items[i + 1]
-        if not isinstance(pattern, Symbol):
+        if type(pattern) is not Symbol:
             raise SyntaxError("loop bindings must be simple symbols (no destructuring)")
         var_name = normalize_name(pattern.name)
         var_names.append(var_name)
         value = compile_expr(value_form)
-        assign = ast.Assign(
-            targets=[ast.Name(id=var_name, ctx=ast.Store())], value=value
-        )
+        assign = ast.Assign(targets=[_store(var_name)], value=value)
         set_location(assign, get_source_location(pattern))
         init_stmts.append(assign)
 
@@ -5660,12 +5609,13 @@ def compile_loop_expr(args, form_loc=None):
     """
     Compile (loop [bindings] body...) in expression context.
 
-    Uses a result variable to capture the loop's return value.
+    The loop runs inside a generated function, so non-recur exits
+    simply return their value.
     """
     if len(args) < 1:
         raise SyntaxError("loop requires bindings vector")
     bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
+    if type(bindings) is not VectorLiteral:
         raise SyntaxError("loop bindings must be a vector")
     body_forms = args[1:]
 
@@ -5673,41 +5623,37 @@ def compile_loop_expr(args, form_loc=None):
     if len(items) % 2 != 0:
         raise SyntaxError("loop bindings must have even number of forms")
 
-    # Generate result variable name
-    result_var = gensym("__loop_result_")
-
-    # Initialize result variable to None
-    result_init = ast.Assign(
-        targets=[ast.Name(id=result_var, ctx=ast.Store())],
-        value=ast.Constant(value=None),
-    )
+    # Nested functions generated from here on belong inside the loop function;
+    # anything before the watermark belongs to enclosing code
+    ctx = get_compile_context()
+    saved_funcs_count = len(ctx.nested_functions)
 
     # Parse bindings and create initialization statements
-    init_stmts = [result_init]
+    init_stmts = []
     var_names = []
     for i in range(0, len(items), 2):
         pattern = items[i]
         value_form = items[i + 1]
-        if not isinstance(pattern, Symbol):
+        if type(pattern) is not Symbol:
             raise SyntaxError("loop bindings must be simple symbols (no destructuring)")
         var_name = normalize_name(pattern.name)
         var_names.append(var_name)
         value = compile_expr(value_form)
-        assign = ast.Assign(
-            targets=[ast.Name(id=var_name, ctx=ast.Store())], value=value
-        )
+        assign = ast.Assign(targets=[_store(var_name)], value=value)
         set_location(assign, get_source_location(pattern))
         init_stmts.append(assign)
 
+    # Functions needed by the initial values are defined before them
+    init_funcs = ctx.nested_functions[saved_funcs_count:]
+    del ctx.nested_functions[saved_funcs_count:]
+
     # Set up loop context for recur detection
     loop_ctx = LoopContext(var_names=var_names)
     prev_ctx = set_loop_context(loop_ctx)
 
     try:
-        # Compile loop body with result variable assignment for non-recur exits
-        body_stmts = compile_loop_body(
-            body_forms, var_names, mode="result", result_var=result_var
-        )
+        # Non-recur exits return straight out of the loop function
+        body_stmts = compile_loop_body(body_forms, var_names, mode="return")
     finally:
         set_loop_context(prev_ctx)
 
@@ -5725,79 +5671,59 @@ def compile_loop_expr(args, form_loc=None):
 
     # Inject any nested function definitions (from inner loops) AFTER variable initialization
     # so that nested functions can reference the loop variables
-    nested_funcs = get_compile_context().get_and_clear_functions()
+    nested_funcs = ctx.nested_functions[saved_funcs_count:]
+    del ctx.nested_functions[saved_funcs_count:]
 
     fn_body: list[ast.stmt] = []
+    fn_body.extend(cast(list[ast.stmt], init_funcs))
     fn_body.extend(cast(list[ast.stmt], init_stmts))
     fn_body.extend(cast(list[ast.stmt], nested_funcs))
     fn_body.append(while_node)
-    fn_body.append(ast.Return(value=ast.Name(id=result_var, ctx=ast.Load())))
 
     fn_def = ast.FunctionDef(
         name=fn_name,
-        args=ast.arguments(
-            posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]
-        ),
+        args=_EMPTY_ARGS,
         body=fn_body,
         decorator_list=[],
     )
     set_location(fn_def, form_loc)
 
     # Register this function to be injected at the appropriate scope
-    get_compile_context().add_function(fn_def)
+    ctx.add_function(fn_def)
 
     # Return call to the function
-    call = ast.Call(func=ast.Name(id=fn_name, ctx=ast.Load()), args=[], keywords=[])
+    call = ast.Call(func=_load(fn_name), args=[], keywords=[])
     return set_location(call, form_loc)
 
 
 def compile_loop_body(
-    body_forms,
-    var_names: list[str],
-    mode: str = "break",
-    result_var: Optional[str] = None,
+    body_forms, var_names: list[str], mode: str = "break"
 ) -> list[ast.stmt]:
     """
     Compile the body of a loop, handling recur in tail position.
 
     mode can be:
     - 'break': non-recur exits use break (statement context)
-    - 'return': non-recur exits use return (function tail context)
-    - 'result': non-recur exits assign to result_var and break (expression context)
+    - 'return': non-recur exits use return (function tail and expression context)
     """
     if not body_forms:
         # Empty body - just break/return None
         if mode == "return":
-            return [ast.Return(value=ast.Constant(value=None))]
-        elif mode == "result" and result_var is not None:
-            return [
-                ast.Assign(
-                    targets=[ast.Name(id=result_var, ctx=ast.Store())],
-                    value=ast.Constant(value=None),
-                ),
-                ast.Break(),
-            ]
+            return [ast.Return(value=None)]
         else:
             return [ast.Break()]
 
     stmts: list[ast.stmt] = []
 
-    # Compile all but the last form as statements
-    for f in body_forms[:-1]:
-        s = compile_stmt(f)
-        stmts.extend(flatten_stmts([s]))
-
-    # Handle the last form specially for tail position
-    last_form = body_forms[-1]
-    tail_stmts = compile_loop_tail(last_form, var_names, mode, result_var)
+    # Compile all but the last form as statements; the last is in tail position
+    last_form = _compile_leading_stmts(body_forms, stmts)
+    tail_stmts = compile_loop_tail(last_form, var_names, mode)
     stmts.extend(tail_stmts)
 
     return stmts
 
 
-def compile_loop_tail(
-    form, var_names: list[str], mode: str, result_var: Optional[str] = None
-) -> list[ast.stmt]:
+def compile_loop_tail(form, var_names: list[str], mode: str) -> list[ast.stmt]:
     """
     Compile a form in tail position of a loop.
 
@@ -5805,27 +5731,14 @@ def compile_loop_tail(
     """
     form_loc = get_source_location(form)
 
-    # Check for recur
-    if isinstance(form, list) and form and is_symbol(form[0], "recur"):
-        return compile_recur(form[1:], var_names, form_loc)
-
-    # Check for special forms that have their own tail positions
-    if isinstance(form, list) and form and isinstance(form[0], Symbol):
+    # recur, and special forms that have their own tail positions
+    if isinstance(form, list) and form and type(form[0]) is Symbol:
         head_name = form[0].name
-
-        if head_name == "if":
-            return compile_loop_tail_if(form[1:], var_names, mode, result_var, form_loc)
-
-        if head_name == "let":
-            return compile_loop_tail_let(form[1:], var_names, mode, result_var)
-
-        if head_name == "do":
-            return compile_loop_tail_do(form[1:], var_names, mode, result_var)
-
-        if head_name == "cond":
-            return compile_loop_tail_cond(
-                form[1:], var_names, mode, result_var, form_loc
-            )
+        if head_name == "recur":
+            return compile_recur(form[1:], var_names, form_loc)
+        handler = _LOOP_TAIL_HANDLERS.get(head_name)
+        if handler is not None:
+            return handler(form[1:], var_names, mode, form_loc)
 
     # Not a special form - compile as expression and exit the loop
     expr = compile_expr(form)
@@ -5833,21 +5746,31 @@ def compile_loop_tail(
         ret = ast.Return(value=expr)
         set_location(ret, form_loc)
         return [ret]
-    elif mode == "result" and result_var is not None:
-        assign = ast.Assign(
-            targets=[ast.Name(id=result_var, ctx=ast.Store())], value=expr
-        )
-        set_location(assign, form_loc)
-        brk = ast.Break()
-        set_location(brk, form_loc)
-        return [assign, brk]
     else:  # mode == 'break'
         # Evaluate the expression (for side effects) then break
-        expr_stmt = ast.Expr(value=expr)
-        set_location(expr_stmt, form_loc)
-        brk = ast.Break()
-        set_location(brk, form_loc)
-        return [expr_stmt, brk]
+        return _set_locations([ast.Expr(value=expr), ast.Break()], form_loc)
+
+
+def _names_read(expr) -> Optional[set[str]]:
+    """
+    Collect the names expr loads, or None if evaluating it might touch
+    other variables too: it calls something (possibly a closure over
+    them) or assigns with :=.
+    """
+    names = set()
+    for node in ast.walk(expr):
+        node_type = type(node)
+        if node_type is ast.Name:
+            names.add(node.id)
+        elif node_type in _OPAQUE_EXPR_TYPES:
+            return None
+    return names
+
+
+# Expression nodes that can run arbitrary code or rebind variables
+_OPAQUE_EXPR_TYPES = frozenset(
+    {ast.Call, ast.Await, ast.Yield, ast.YieldFrom, ast.NamedExpr}
+)
 
 
 def compile_recur(
@@ -5857,45 +5780,51 @@ def compile_recur(
     Compile (recur arg1 arg2 ...) to variable reassignment + continue.
 
     Uses temporary variables to handle cases like (recur y x) where
-    we need to swap values.
+    we need to swap values. A loop variable is assigned directly when no
+    later argument might read it, so the last one never needs a temporary.
     """
     if len(args) != len(var_names):
         raise SyntaxError(f"recur requires {len(var_names)} arguments, got {len(args)}")
 
-    stmts: list[ast.stmt] = []
+    values = [compile_expr(arg) for arg in args]
+
+    # A loop variable needs a temporary while a later argument may still
+    # read its old value
+    reads = [_names_read(value) for value in values]
+    needs_temp = [
+        any(r is None or var_name in r for r in reads[i + 1 :])
+        for i, var_name in enumerate(var_names)
+    ]
+    temp_names = iter(
+        gensym_batch(
+            [f"__{v}_new_" for v, needed in zip(var_names, needs_temp) if needed]
+        )
+    )
 
-    # First, compute all new values into temporaries
-    temp_names: list[str] = []
-    for i, arg in enumerate(args):
-        temp = gensym(f"__{var_names[i]}_new_")
-        temp_names.append(temp)
-        value = compile_expr(arg)
-        assign = ast.Assign(targets=[ast.Name(id=temp, ctx=ast.Store())], value=value)
-        set_location(assign, form_loc)
-        stmts.append(assign)
+    stmts: list[ast.stmt] = []
+    deferred: list[tuple[str, str]] = []
+    for var_name, value, needed in zip(var_names, values, needs_temp):
+        if needed:
+            temp = next(temp_names)
+            stmts.append(ast.Assign(targets=[_store(temp)], value=value))
+            deferred.append((var_name, temp))
+        else:
+            stmts.append(ast.Assign(targets=[_store(var_name)], value=value))
 
     # Then assign temporaries to the actual loop variables
-    for var_name, temp_name in zip(var_names, temp_names):
-        assign = ast.Assign(
-            targets=[ast.Name(id=var_name, ctx=ast.Store())],
-            value=ast.Name(id=temp_name, ctx=ast.Load()),
-        )
-        set_location(assign, form_loc)
-        stmts.append(assign)
+    for var_name, temp_name in deferred:
+        stmts.append(ast.Assign(targets=[_store(var_name)], value=_load(temp_name)))
 
     # Add continue to restart the loop
-    cont = ast.Continue()
-    set_location(cont, form_loc)
-    stmts.append(cont)
+    stmts.append(ast.Continue())
 
-    return stmts
+    return _set_locations(stmts, form_loc)
 
 
 def compile_loop_tail_if(
     args,
     var_names: list[str],
     mode: str,
-    result_var: Optional[str],
     form_loc: Optional[SourceLocation] = None,
 ) -> list[ast.stmt]:
     """
@@ -5910,25 +5839,15 @@ def compile_loop_tail_if(
     else_form = args[2] if len(args) == 3 else None
 
     test = compile_expr(test_form)
-    then_stmts: list[ast.stmt] = compile_loop_tail(
-        then_form, var_names, mode, result_var
-    )
+    then_stmts: list[ast.stmt] = compile_loop_tail(then_form, var_names, mode)
     else_stmts: list[ast.stmt]
 
     if else_form is not None:
-        else_stmts = compile_loop_tail(else_form, var_names, mode, result_var)
+        else_stmts = compile_loop_tail(else_form, var_names, mode)
     else:
         # No else branch - default to None exit
         if mode == "return":
-            else_stmts = [ast.Return(value=ast.Constant(value=None))]
-        elif mode == "result" and result_var is not None:
-            else_stmts = [
-                ast.Assign(
-                    targets=[ast.Name(id=result_var, ctx=ast.Store())],
-                    value=ast.Constant(value=None),
-                ),
-                ast.Break(),
-            ]
+            else_stmts = [ast.Return(value=None)]
         else:
             else_stmts = [ast.Break()]
 
@@ -5938,7 +5857,10 @@ def compile_loop_tail_if(
 
 
 def compile_loop_tail_let(
-    args, var_names: list[str], mode: str, result_var: Optional[str]
+    args,
+    var_names: list[str],
+    mode: str,
+    form_loc: Optional[SourceLocation] = None,
 ) -> list[ast.stmt]:
     """
     Compile (let [bindings] body...) in tail position of a loop.
@@ -5947,7 +5869,7 @@ def compile_loop_tail_let(
     if len(args) < 1:
         raise SyntaxError("let requires bindings vector")
     bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
+    if type(bindings) is not VectorLiteral:
         raise SyntaxError("let bindings must be a vector")
     body_forms = args[1:]
 
@@ -5964,22 +5886,22 @@ def compile_loop_tail_let(
 
     if not body_forms:
         # Empty body - exit with None
-        tail_stmts = compile_loop_tail(None, var_names, mode, result_var)
+        tail_stmts = compile_loop_tail(None, var_names, mode)
         stmts.extend(tail_stmts)
     else:
-        # Compile all but last as statements
-        for f in body_forms[:-1]:
-            s = compile_stmt(f)
-            stmts.extend(flatten_stmts([s]))
-        # Last form is a loop tail
-        tail_stmts = compile_loop_tail(body_forms[-1], var_names, mode, result_var)
+        # Compile all but last as statements; the last form is a loop tail
+        last_form = _compile_leading_stmts(body_forms, stmts)
+        tail_stmts = compile_loop_tail(last_form, var_names, mode)
         stmts.extend(tail_stmts)
 
     return stmts
 
 
 def compile_loop_tail_do(
-    args, var_names: list[str], mode: str, result_var: Optional[str]
+    args,
+    var_names: list[str],
+    mode: str,
+    form_loc: Optional[SourceLocation] = None,
 ) -> list[ast.stmt]:
     """
     Compile (do body...) in tail position of a loop.
@@ -5987,15 +5909,12 @@ def compile_loop_tail_do(
     """
     if not args:
         # Empty do - exit with None
-        return compile_loop_tail(None, var_names, mode, result_var)
+        return compile_loop_tail(None, var_names, mode)
 
     stmts: list[ast.stmt] = []
-    # Compile all but last as statements
-    for f in args[:-1]:
-        s = compile_stmt(f)
-        stmts.extend(flatten_stmts([s]))
-    # Last form is a loop tail
-    tail_stmts = compile_loop_tail(args[-1], var_names, mode, result_var)
+    # Compile all but last as statements; the last form is a loop tail
+    last_form = _compile_leading_stmts(args, stmts)
+    tail_stmts = compile_loop_tail(last_form, var_names, mode)
     stmts.extend(tail_stmts)
 
     return stmts
@@ -6005,7 +5924,6 @@ def compile_loop_tail_cond(
     args,
     var_names: list[str],
     mode: str,
-    result_var: Optional[str],
     form_loc: Optional[SourceLocation] = None,
 ) -> list[ast.stmt]:
     """
@@ -6017,37 +5935,28 @@ def compile_loop_tail_cond(
 
     if not args:
         # Empty cond - exit with None
-        return compile_loop_tail(None, var_names, mode, result_var)
+        return compile_loop_tail(None, var_names, mode)
 
     # Build nested if statements from the end
     # Start with the default case (None if no :else)
     result: Optional[list[ast.stmt]] = None
 
-    pairs = list(zip(args[::2], args[1::2]))
-    for test_form, expr_form in reversed(pairs):
+    for i in range(len(args) - 2, -1, -2):
+        test_form = args[i]
+        expr_form = args[i + 1]
         # Check for :else keyword
         if isinstance(test_form, Keyword) and test_form.name == "else":
             # :else branch - just the expression
-            result = compile_loop_tail(expr_form, var_names, mode, result_var)
+            result = compile_loop_tail(expr_form, var_names, mode)
         else:
             test = compile_expr(test_form)
-            then_stmts: list[ast.stmt] = compile_loop_tail(
-                expr_form, var_names, mode, result_var
-            )
+            then_stmts: list[ast.stmt] = compile_loop_tail(expr_form, var_names, mode)
             else_stmts: list[ast.stmt]
 
             if result is None:
                 # No else branch yet - default to None exit
                 if mode == "return":
-                    else_stmts = [ast.Return(value=ast.Constant(value=None))]
-                elif mode == "result" and result_var is not None:
-                    else_stmts = [
-                        ast.Assign(
-                            targets=[ast.Name(id=result_var, ctx=ast.Store())],
-                            value=ast.Constant(value=None),
-                        ),
-                        ast.Break(),
-                    ]
+                    else_stmts = [ast.Return(value=None)]
                 else:
                     else_stmts = [ast.Break()]
             else:
@@ -6057,7 +5966,19 @@ def compile_loop_tail_cond(
             set_location(if_node, form_loc)
             result = [if_node]
 
-    return result if result else compile_loop_tail(None, var_names, mode, result_var)
+    return result if result else compile_loop_tail(None, var_names, mode)
+
+
+# Loop tail compilers for special forms with their own tail positions,
+# keyed by head name; each takes (args, var_names, mode, form_loc)
+_LOOP_TAIL_HANDLERS = _interned(
+    {
+        "if": compile_loop_tail_if,
+        "let": compile_loop_tail_let,
+        "do": compile_loop_tail_do,
+        "cond": compile_loop_tail_cond,
+    }
+)
 
 
 def compile_while(args, form_loc=None):
@@ -6072,31 +5993,36 @@ def compile_while(args, form_loc=None):
     if not body_forms:
         body.append(ast.Pass())
     else:
-        for f in body_forms:
-            s = compile_stmt(f)
-            body.extend(flatten_stmts([s]))
+        _compile_stmts(body_forms, body)
 
     node = ast.While(test=test, body=body, orelse=[])
     set_location(node, form_loc)
     return node
 
 
-def compile_for(args, form_loc=None):
+def _compile_for_target(var_form, temp_prefix):
     """
-    Compile (for [x xs] body...) to ast.For.
+    Compile a for-style loop variable to (target, destructure_stmts).
 
-    Supports destructuring patterns in the loop variable:
-    - Simple: (for [x items] ...)
-    - Vector destructuring: (for [[a b] pairs] ...)
-    - Dict destructuring: (for [{:keys [k v]} items] ...)
+    A symbol is the loop target itself; a destructuring pattern binds a
+    temp var that destructure_stmts unpacks at the start of the body.
     """
+    if isinstance(var_form, Symbol):
+        return _store(normalize_name(var_form.name)), []
+    temp = gensym(temp_prefix)
+    return _store(temp), compile_destructure(var_form, _load(temp))
+
+
+def _compile_for_common(args, is_async, form_loc=None):
+    """Compile (for [x xs] body...) or (async-for [x xs] body...)."""
+    head = "async-for" if is_async else "for"
     if len(args) < 1:
-        raise SyntaxError("for requires binding vector")
+        raise SyntaxError(f"{head} requires binding vector")
     bindings = args[0]
     if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("for binding must be a vector")
+        raise SyntaxError(f"{head} binding must be a vector")
     if len(bindings.items) != 2:
-        raise SyntaxError("for binding must have exactly 2 elements [var seq]")
+        raise SyntaxError(f"{head} binding must have exactly 2 elements [var seq]")
 
     var_form = bindings.items[0]
     seq_form = bindings.items[1]
@@ -6104,68 +6030,68 @@ def compile_for(args, form_loc=None):
 
     iter_expr = compile_expr(seq_form)
 
-    # Check if we need destructuring
-    if isinstance(var_form, Symbol):
-        # Simple case: no destructuring needed
-        target = ast.Name(id=normalize_name(var_form.name), ctx=ast.Store())
+    # Destructuring assignments (if any) come first, then the actual body
+    target, body = _compile_for_target(
+        var_form, "__async_for_item_" if is_async else "__for_item_"
+    )
+    _compile_stmts(body_forms, body)
 
-        body = []
-        if not body_forms:
-            body.append(ast.Pass())
-        else:
-            for f in body_forms:
-                s = compile_stmt(f)
-                body.extend(flatten_stmts([s]))
+    # Ensure body is not empty
+    if not body:
+        body.append(ast.Pass())
 
-        node = ast.For(target=target, iter=iter_expr, body=body, orelse=[])
-        set_location(node, form_loc)
-        return node
-    else:
-        # Destructuring case: use a temp variable and destructure in body
-        temp = gensym("__for_item_")
-        target = ast.Name(id=temp, ctx=ast.Store())
-        temp_load = ast.Name(id=temp, ctx=ast.Load())
+    node = (ast.AsyncFor if is_async else ast.For)(
+        target=target, iter=iter_expr, body=body, orelse=[]
+    )
+    set_location(node, form_loc)
+    return node
 
-        body = []
-        # First, add destructuring assignments
-        body.extend(compile_destructure(var_form, temp_load))
 
-        # Then add the actual body
-        if not body_forms:
-            pass  # Destructuring is enough, no need for Pass
-        else:
-            for f in body_forms:
-                s = compile_stmt(f)
-                body.extend(flatten_stmts([s]))
+def compile_for(args, form_loc=None):
+    """
+    Compile (for [x xs] body...) to ast.For.
 
-        # Ensure body is not empty
-        if not body:
-            body.append(ast.Pass())
+    Supports destructuring patterns in the loop variable:
+    - Simple: (for [x items] ...)
+    - Vector destructuring: (for [[a b] pairs] ...)
+    - Dict destructuring: (for [{:keys [k v]} items] ...)
+    """
+    return _compile_for_common(args, False, form_loc)
 
-        node = ast.For(target=target, iter=iter_expr, body=body, orelse=[])
-        set_location(node, form_loc)
-        return node
+
+def _kv_pairs(options, head):
+    """
+    Yield the (option, value) pairs of a flat option list, raising a
+    SyntaxError naming head if the last option has no value.
+    """
+    it = iter(options)
+    for opt in it:
+        value = next(it, _MISSING)
+        if value is _MISSING:
+            raise SyntaxError(f"{head} option {opt} requires a value")
+        yield opt, value
 
 
-def compile_vector_comprehension(for_form, body_expr, form):
+# Sentinel for an option with no value (nil is a valid option value)
+_MISSING = object()
+
+
+def _compile_collection_comprehension(
+    for_form, body_expr, form, head, func_prefix, make_transient
+):
     """
-    Compile [for [x coll] expr] to efficient vector building using transients.
+    Shared builder for [for ...] and [sorted-for ...] comprehensions.
 
-    Always generates an IIFE to ensure proper scoping:
-        def _vec_comp():
-            _t = EMPTY_VECTOR.transient()
-            for x in coll:
-                _t.conj_mut(expr)
-            return _t.persistent()
-        _vec_comp()
+    make_transient() compiles the expression for the empty transient the
+    loop conjoins into; helper functions it needs land in the IIFE too.
     """
     # Parse the for form: (for [var coll] ...) - we ignore extra body forms in for
     if len(for_form) < 2:
-        raise SyntaxError("for in vector comprehension requires [var coll]")
+        raise SyntaxError(f"{head} in vector comprehension requires [var coll]")
 
     bindings = for_form[1]
     if not isinstance(bindings, VectorLiteral) or len(bindings.items) != 2:
-        raise SyntaxError("for binding must be [var coll]")
+        raise SyntaxError(f"{head} binding must be [var coll]")
 
     var_form = bindings.items[0]
     coll_form = bindings.items[1]
@@ -6173,68 +6099,33 @@ def compile_vector_comprehension(for_form, body_expr, form):
     iter_expr = compile_expr(coll_form)
 
     # Generate unique names
-    func_name = gensym("_vec_comp_")
-    transient_name = gensym("_t_")
+    func_name, transient_name = gensym_batch([func_prefix, "_t_"])
 
     # Save the current nested functions state so we can capture any new ones
     ctx = get_compile_context()
     saved_funcs_count = len(ctx.nested_functions)
 
-    # Build the function body
-    func_body = []
-
-    # _t = EMPTY_VECTOR.transient()
+    # _t = <empty collection>.transient()
     transient_init = ast.Assign(
-        targets=[ast.Name(id=transient_name, ctx=ast.Store())],
-        value=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id="EMPTY_VECTOR", ctx=ast.Load()),
-                attr="transient",
-                ctx=ast.Load(),
-            ),
-            args=[],
-            keywords=[],
-        ),
+        targets=[_store(transient_name)], value=make_transient()
     )
-    func_body.append(transient_init)
 
-    # Build the for loop body
-    loop_body = []
-
-    # Handle destructuring if needed
-    if isinstance(var_form, Symbol):
-        # Simple case
-        target = ast.Name(id=normalize_name(var_form.name), ctx=ast.Store())
-    else:
-        # Destructuring case
-        item_temp = gensym("_item_")
-        target = ast.Name(id=item_temp, ctx=ast.Store())
-        item_load = ast.Name(id=item_temp, ctx=ast.Load())
-        loop_body.extend(compile_destructure(var_form, item_load))
+    # Build the for loop body, starting with any destructuring
+    target, loop_body = _compile_for_target(var_form, "_item_")
 
     # Compile body expression INSIDE the loop context (after variable is bound)
     body_compiled = compile_expr(body_expr)
 
-    # Capture any nested functions that were generated during body compilation
-    # These need to be defined INSIDE our function, not at module level
-    nested_funcs = ctx.nested_functions[saved_funcs_count:]
-    ctx.nested_functions = ctx.nested_functions[:saved_funcs_count]
-
-    # Add captured nested functions at the start of our function body
-    for nf in nested_funcs:
-        func_body.append(nf)
+    # Capture any nested functions that were generated during compilation.
+    # These need to be defined INSIDE our function, not at module level,
+    # ahead of the transient init and loop that may call them
+    func_body = ctx.nested_functions[saved_funcs_count:]
+    del ctx.nested_functions[saved_funcs_count:]
+    func_body.append(transient_init)
 
     # _t.conj_mut(expr)
     conj_call = ast.Expr(
-        value=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id=transient_name, ctx=ast.Load()),
-                attr="conj_mut",
-                ctx=ast.Load(),
-            ),
-            args=[body_compiled],
-            keywords=[],
-        )
+        value=_attr_call(_load(transient_name), "conj_mut", [body_compiled])
     )
     loop_body.append(conj_call)
 
@@ -6243,31 +6134,13 @@ def compile_vector_comprehension(for_form, body_expr, form):
     func_body.append(for_loop)
 
     # return _t.persistent()
-    return_stmt = ast.Return(
-        value=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id=transient_name, ctx=ast.Load()),
-                attr="persistent",
-                ctx=ast.Load(),
-            ),
-            args=[],
-            keywords=[],
-        )
-    )
+    return_stmt = ast.Return(value=_attr_call(_load(transient_name), "persistent"))
     func_body.append(return_stmt)
 
     # Build the IIFE function definition
     func_def = ast.FunctionDef(
         name=func_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
+        args=_EMPTY_ARGS,
         body=func_body,
         decorator_list=[],
         returns=None,
@@ -6277,13 +6150,33 @@ def compile_vector_comprehension(for_form, body_expr, form):
     ctx.add_function(func_def)
 
     # Return a call to the function
-    call_expr = ast.Call(
-        func=ast.Name(id=func_name, ctx=ast.Load()), args=[], keywords=[]
-    )
+    call_expr = ast.Call(func=_load(func_name), args=[], keywords=[])
 
     return copy_location(call_expr, form)
 
 
+def compile_vector_comprehension(for_form, body_expr, form):
+    """
+    Compile [for [x coll] expr] to efficient vector building using transients.
+
+    Always generates an IIFE to ensure proper scoping:
+        def _vec_comp():
+            _t = EMPTY_VECTOR.transient()
+            for x in coll:
+                _t.conj_mut(expr)
+            return _t.persistent()
+        _vec_comp()
+    """
+    return _compile_collection_comprehension(
+        for_form,
+        body_expr,
+        form,
+        "for",
+        "_vec_comp_",
+        lambda: _attr_call(_load("EMPTY_VECTOR"), "transient"),
+    )
+
+
 def compile_sorted_vector_comprehension(for_form, body_expr, options, form):
     """
     Compile [sorted-for [x coll] expr :key key-fn :reverse bool] to sorted vector building.
@@ -6300,64 +6193,23 @@ def compile_sorted_vector_comprehension(for_form, body_expr, options, form):
         :key <fn>      - Key function for sorting
         :reverse <bool> - Whether to sort in reverse order
     """
-    # Parse the for form: (sorted-for [var coll] ...)
-    if len(for_form) < 2:
-        raise SyntaxError("sorted-for in vector comprehension requires [var coll]")
-
-    bindings = for_form[1]
-    if not isinstance(bindings, VectorLiteral) or len(bindings.items) != 2:
-        raise SyntaxError("sorted-for binding must be [var coll]")
-
-    var_form = bindings.items[0]
-    coll_form = bindings.items[1]
-
-    iter_expr = compile_expr(coll_form)
-
     # Parse options (:key and :reverse)
     key_fn = None
     reverse_val = None
-    i = 0
-    while i < len(options):
-        opt = options[i]
-        if is_keyword(opt, "key") and i + 1 < len(options):
-            key_fn = options[i + 1]
-            i += 2
-        elif is_keyword(opt, "reverse") and i + 1 < len(options):
-            reverse_val = options[i + 1]
-            i += 2
+    for opt, value in _kv_pairs(options, "sorted-for"):
+        name = opt.name if isinstance(opt, Keyword) else None
+        if name == "key":
+            key_fn = value
+        elif name == "reverse":
+            reverse_val = value
         else:
             raise SyntaxError(f"Unknown option in sorted-for: {opt}")
 
-    # Generate unique names
-    func_name = gensym("_sorted_vec_comp_")
-    transient_name = gensym("_t_")
-
-    # Save the current nested functions state so we can capture any new ones
-    ctx = get_compile_context()
-    saved_funcs_count = len(ctx.nested_functions)
-
-    # Build the function body
-    func_body = []
-
-    # Build the sorted_vec() call with options
-    # If no options, use EMPTY_SORTED_VECTOR.transient()
-    # If options, use sorted_vec(*{:key key_fn, :reverse reverse_val}).transient()
-    if key_fn is None and reverse_val is None:
-        # _t = EMPTY_SORTED_VECTOR.transient()
-        transient_init = ast.Assign(
-            targets=[ast.Name(id=transient_name, ctx=ast.Store())],
-            value=ast.Call(
-                func=ast.Attribute(
-                    value=ast.Name(id="EMPTY_SORTED_VECTOR", ctx=ast.Load()),
-                    attr="transient",
-                    ctx=ast.Load(),
-                ),
-                args=[],
-                keywords=[],
-            ),
-        )
-    else:
-        # _t = sorted_vec(*{:key ..., :reverse ...}).transient()
+    def make_transient():
+        # No options: EMPTY_SORTED_VECTOR.transient()
+        if key_fn is None and reverse_val is None:
+            return _attr_call(_load("EMPTY_SORTED_VECTOR"), "transient")
+        # Otherwise sorted_vec(key=..., reverse=...).transient()
         sorted_vec_keywords = []
         if key_fn is not None:
             sorted_vec_keywords.append(
@@ -6367,108 +6219,19 @@ def compile_sorted_vector_comprehension(for_form, body_expr, options, form):
             sorted_vec_keywords.append(
                 ast.keyword(arg="reverse", value=compile_expr(reverse_val))
             )
-        transient_init = ast.Assign(
-            targets=[ast.Name(id=transient_name, ctx=ast.Store())],
-            value=ast.Call(
-                func=ast.Attribute(
-                    value=ast.Call(
-                        func=ast.Name(id="sorted_vec", ctx=ast.Load()),
-                        args=[],
-                        keywords=sorted_vec_keywords,
-                    ),
-                    attr="transient",
-                    ctx=ast.Load(),
-                ),
+        return _attr_call(
+            ast.Call(
+                func=_load("sorted_vec"),
                 args=[],
-                keywords=[],
-            ),
-        )
-    func_body.append(transient_init)
-
-    # Build the for loop body
-    loop_body = []
-
-    # Handle destructuring if needed
-    if isinstance(var_form, Symbol):
-        # Simple case
-        target = ast.Name(id=normalize_name(var_form.name), ctx=ast.Store())
-    else:
-        # Destructuring case
-        item_temp = gensym("_item_")
-        target = ast.Name(id=item_temp, ctx=ast.Store())
-        item_load = ast.Name(id=item_temp, ctx=ast.Load())
-        loop_body.extend(compile_destructure(var_form, item_load))
-
-    # Compile body expression INSIDE the loop context (after variable is bound)
-    body_compiled = compile_expr(body_expr)
-
-    # Capture any nested functions that were generated during body compilation
-    nested_funcs = ctx.nested_functions[saved_funcs_count:]
-    ctx.nested_functions = ctx.nested_functions[:saved_funcs_count]
-
-    # Add captured nested functions at the start of our function body
-    for nf in nested_funcs:
-        func_body.append(nf)
-
-    # _t.conj_mut(expr)
-    conj_call = ast.Expr(
-        value=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id=transient_name, ctx=ast.Load()),
-                attr="conj_mut",
-                ctx=ast.Load(),
-            ),
-            args=[body_compiled],
-            keywords=[],
-        )
-    )
-    loop_body.append(conj_call)
-
-    # for var in coll: ...
-    for_loop = ast.For(target=target, iter=iter_expr, body=loop_body, orelse=[])
-    func_body.append(for_loop)
-
-    # return _t.persistent()
-    return_stmt = ast.Return(
-        value=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id=transient_name, ctx=ast.Load()),
-                attr="persistent",
-                ctx=ast.Load(),
+                keywords=sorted_vec_keywords,
             ),
-            args=[],
-            keywords=[],
+            "transient",
         )
-    )
-    func_body.append(return_stmt)
-
-    # Build the IIFE function definition
-    func_def = ast.FunctionDef(
-        name=func_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
-        body=func_body,
-        decorator_list=[],
-        returns=None,
-    )
-
-    # Register the function to be added at module/function level
-    ctx.add_function(func_def)
 
-    # Return a call to the function
-    call_expr = ast.Call(
-        func=ast.Name(id=func_name, ctx=ast.Load()), args=[], keywords=[]
+    return _compile_collection_comprehension(
+        for_form, body_expr, form, "sorted-for", "_sorted_vec_comp_", make_transient
     )
 
-    return copy_location(call_expr, form)
-
 
 def compile_async_for(args, form_loc=None):
     """
@@ -6479,61 +6242,35 @@ def compile_async_for(args, form_loc=None):
     - Vector destructuring: (async-for [[a b] pairs] ...)
     - Dict destructuring: (async-for [{:keys [k v]} items] ...)
     """
-    if len(args) < 1:
-        raise SyntaxError("async-for requires binding vector")
-    bindings = args[0]
-    if not isinstance(bindings, VectorLiteral):
-        raise SyntaxError("async-for binding must be a vector")
-    if len(bindings.items) != 2:
-        raise SyntaxError("async-for binding must have exactly 2 elements [var seq]")
+    return _compile_for_common(args, True, form_loc)
 
-    var_form = bindings.items[0]
-    seq_form = bindings.items[1]
-    body_forms = args[1:]
-
-    iter_expr = compile_expr(seq_form)
-
-    # Check if we need destructuring
-    if isinstance(var_form, Symbol):
-        # Simple case: no destructuring needed
-        target = ast.Name(id=normalize_name(var_form.name), ctx=ast.Store())
 
-        body = []
-        if not body_forms:
-            body.append(ast.Pass())
-        else:
-            for f in body_forms:
-                s = compile_stmt(f)
-                body.extend(flatten_stmts([s]))
+# Heads of the clauses that end a try body
+_TRY_CLAUSE_HEADS = _interned({"catch", "finally"})
 
-        node = ast.AsyncFor(target=target, iter=iter_expr, body=body, orelse=[])
-        set_location(node, form_loc)
-        return node
-    else:
-        # Destructuring case: use a temp variable and destructure in body
-        temp = gensym("__async_for_item_")
-        target = ast.Name(id=temp, ctx=ast.Store())
-        temp_load = ast.Name(id=temp, ctx=ast.Load())
 
-        body = []
-        # First, add destructuring assignments
-        body.extend(compile_destructure(var_form, temp_load))
+def _head(form):
+    """Return the head of a non-empty list form, else None."""
+    return form[0] if isinstance(form, list) and form else None
 
-        # Then add the actual body
-        if not body_forms:
-            pass  # Destructuring is enough, no need for Pass
-        else:
-            for f in body_forms:
-                s = compile_stmt(f)
-                body.extend(flatten_stmts([s]))
 
-        # Ensure body is not empty
-        if not body:
-            body.append(ast.Pass())
+def _clause_kind(form):
+    """Return "catch" or "finally" if form is that try clause, else None."""
+    head = _head(form)
+    if type(head) is Symbol and head.name in _TRY_CLAUSE_HEADS:
+        return head.name
+    return None
 
-        node = ast.AsyncFor(target=target, iter=iter_expr, body=body, orelse=[])
-        set_location(node, form_loc)
-        return node
+
+def _split_try_clauses(args):
+    """
+    Split try args into (body_forms, clause_forms) at the first catch or
+    finally clause.
+    """
+    for i, form in enumerate(args):
+        if _clause_kind(form) is not None:
+            return args[:i], args[i:]
+    return args, []
 
 
 def compile_try_stmt_with_return(args):
@@ -6544,20 +6281,7 @@ def compile_try_stmt_with_return(args):
     if len(args) == 0:
         raise SyntaxError("try requires at least a body")
 
-    body_forms = []
-    catch_finally_forms = []
-
-    i = 0
-    while i < len(args):
-        form = args[i]
-        if isinstance(form, list) and len(form) > 0:
-            head = form[0]
-            if is_symbol(head, "catch") or is_symbol(head, "finally"):
-                break
-        body_forms.append(form)
-        i += 1
-
-    catch_finally_forms = args[i:]
+    body_forms, catch_finally_forms = _split_try_clauses(args)
 
     if not body_forms:
         raise SyntaxError("try requires at least one body form")
@@ -6567,12 +6291,12 @@ def compile_try_stmt_with_return(args):
     finalbody = []
 
     for form in catch_finally_forms:
-        if not isinstance(form, list) or len(form) < 1:
+        head = _head(form)
+        if head is None:
             raise SyntaxError("Expected catch or finally clause in try")
+        kind = _clause_kind(form)
 
-        head = form[0]
-
-        if is_symbol(head, "catch"):
+        if kind == "catch":
             if len(form) < 3:
                 raise SyntaxError(
                     "catch requires exception type, variable name, and at least one handler form"
@@ -6585,7 +6309,7 @@ def compile_try_stmt_with_return(args):
             if exc_type_form is None:
                 exc_type = None
             elif isinstance(exc_type_form, Symbol):
-                exc_type = ast.Name(id=exc_type_form.name, ctx=ast.Load())
+                exc_type = _load(exc_type_form.name)
             else:
                 raise SyntaxError("catch exception type must be a symbol or nil")
 
@@ -6595,32 +6319,30 @@ def compile_try_stmt_with_return(args):
 
             # Compile handler body with last form as return
             if not handler_forms:
-                handler_body: list[ast.stmt] = [
-                    ast.Return(value=ast.Constant(value=None))
-                ]
+                handler_body: list[ast.stmt] = [ast.Return(value=None)]
             else:
                 handler_body = []
                 for j, hf in enumerate(handler_forms):
                     if j == len(handler_forms) - 1:
                         # Last handler form: return it
-                        if isinstance(hf, list) and hf and is_symbol(hf[0]):
-                            h_name = hf[0].name
-                            if h_name == "return":
+                        h = _head(hf)
+                        if is_symbol(h):
+                            if h.name == "return":
                                 s = compile_stmt(hf)
-                                handler_body.extend(flatten_stmts([s]))
+                                _extend_stmt(handler_body, s)
                             else:
                                 handler_body.append(ast.Return(value=compile_expr(hf)))
                         else:
                             handler_body.append(ast.Return(value=compile_expr(hf)))
                     else:
                         s = compile_stmt(hf)
-                        handler_body.extend(flatten_stmts([s]))
+                        _extend_stmt(handler_body, s)
 
             handlers.append(
                 ast.ExceptHandler(type=exc_type, name=var_name, body=handler_body)
             )
 
-        elif is_symbol(head, "finally"):
+        elif kind == "finally":
             if len(form) < 2:
                 raise SyntaxError("finally requires at least one form")
 
@@ -6628,9 +6350,7 @@ def compile_try_stmt_with_return(args):
                 raise SyntaxError("try can only have one finally clause")
 
             cleanup_forms = form[1:]
-            for cf in cleanup_forms:
-                s = compile_stmt(cf)
-                finalbody.extend(flatten_stmts([s]))
+            _compile_stmts(cleanup_forms, finalbody)
 
         else:
             raise SyntaxError(f"Expected catch or finally, got {head}")
@@ -6640,21 +6360,21 @@ def compile_try_stmt_with_return(args):
     for j, bf in enumerate(body_forms):
         if j == len(body_forms) - 1:
             # Last body form: return it
-            if isinstance(bf, list) and bf and is_symbol(bf[0]):
-                b_name = bf[0].name
-                if b_name == "return":
+            b = _head(bf)
+            if is_symbol(b):
+                if b.name == "return":
                     s = compile_stmt(bf)
-                    body.extend(flatten_stmts([s]))
+                    _extend_stmt(body, s)
                 else:
                     body.append(ast.Return(value=compile_expr(bf)))
             else:
                 body.append(ast.Return(value=compile_expr(bf)))
         else:
             s = compile_stmt(bf)
-            body.extend(flatten_stmts([s]))
+            _extend_stmt(body, s)
 
     if not body:
-        body = [ast.Return(value=ast.Constant(value=None))]
+        body = [ast.Return(value=None)]
 
     return ast.Try(
         body=body,
@@ -6684,31 +6404,19 @@ def compile_try(args, form_loc=None):
     if len(args) == 0:
         raise SyntaxError("try requires at least a body")
 
-    # Separate body, catch clauses, and finally clause
-    body_forms = []
+    # Separate body (everything before catch/finally) from the clauses
+    body_forms, clause_forms = _split_try_clauses(args)
     handlers = []
     finalbody = []
 
-    i = 0
-    # Parse body (everything before catch/finally)
-    while i < len(args):
-        form = args[i]
-        if isinstance(form, list) and len(form) > 0:
-            head = form[0]
-            if is_symbol(head, "catch") or is_symbol(head, "finally"):
-                break
-        body_forms.append(form)
-        i += 1
-
     # Parse catch and finally clauses
-    while i < len(args):
-        form = args[i]
-        if not isinstance(form, list) or len(form) < 1:
+    for form in clause_forms:
+        head = _head(form)
+        if head is None:
             raise SyntaxError("Expected catch or finally clause in try")
+        kind = _clause_kind(form)
 
-        head = form[0]
-
-        if is_symbol(head, "catch"):
+        if kind == "catch":
             # (catch ExceptionType var handler...)
             if len(form) < 3:
                 raise SyntaxError(
@@ -6723,7 +6431,7 @@ def compile_try(args, form_loc=None):
             if exc_type_form is None:
                 exc_type = None
             elif isinstance(exc_type_form, Symbol):
-                exc_type = ast.Name(id=exc_type_form.name, ctx=ast.Load())
+                exc_type = _load(exc_type_form.name)
             else:
                 raise SyntaxError("catch exception type must be a symbol or nil")
 
@@ -6738,15 +6446,13 @@ def compile_try(args, form_loc=None):
                 handler_body = [ast.Pass()]
             else:
                 handler_body = []
-                for hf in handler_forms:
-                    s = compile_stmt(hf)
-                    handler_body.extend(flatten_stmts([s]))
+                _compile_stmts(handler_forms, handler_body)
 
             handlers.append(
                 ast.ExceptHandler(type=exc_type, name=var_name, body=handler_body)
             )
 
-        elif is_symbol(head, "finally"):
+        elif kind == "finally":
             # (finally cleanup...)
             if len(form) < 2:
                 raise SyntaxError("finally requires at least one form")
@@ -6755,24 +6461,18 @@ def compile_try(args, form_loc=None):
                 raise SyntaxError("try can only have one finally clause")
 
             cleanup_forms = form[1:]
-            for cf in cleanup_forms:
-                s = compile_stmt(cf)
-                finalbody.extend(flatten_stmts([s]))
+            _compile_stmts(cleanup_forms, finalbody)
 
         else:
             raise SyntaxError(f"Expected catch or finally, got {head}")
 
-        i += 1
-
     # Compile body
     compiled_body: list[ast.stmt]
     if not body_forms:
         compiled_body = [ast.Pass()]
     else:
         compiled_body = []
-        for bf in body_forms:
-            s = compile_stmt(bf)
-            compiled_body.extend(flatten_stmts([s]))
+        _compile_stmts(body_forms, compiled_body)
 
     # Create Try node
     node = ast.Try(
@@ -6785,7 +6485,7 @@ def compile_try(args, form_loc=None):
     return node
 
 
-def compile_try_expr(args):
+def compile_try_expr(args, form_loc=None):
     """
     Compile (try body... (catch ...) (finally ...)) as an expression.
     Returns body value or handler value using spork_try helper.
@@ -6793,35 +6493,16 @@ def compile_try_expr(args):
     if len(args) == 0:
         raise SyntaxError("try requires body")
 
-    body_forms = []
-    catch_finally_forms = []
-
-    i = 0
-    while i < len(args):
-        form = args[i]
-        if isinstance(form, list) and form:
-            head = form[0]
-            if is_symbol(head, "catch") or is_symbol(head, "finally"):
-                break
-        body_forms.append(form)
-        i += 1
-
-    catch_finally_forms = args[i:]
+    body_forms, catch_finally_forms = _split_try_clauses(args)
 
     if not body_forms:
         raise SyntaxError("try requires at least one body form")
 
+    ctx = get_compile_context()
+
     # Build body lambda: () -> value
     body_lambda = ast.Lambda(
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
+        args=_EMPTY_ARGS,
         body=compile_do_expr(body_forms),
     )
 
@@ -6830,11 +6511,9 @@ def compile_try_expr(args):
     finally_lambda = None
 
     for form in catch_finally_forms:
-        if not isinstance(form, list) or not form:
-            raise SyntaxError("Expected catch or finally in try")
-        head = form[0]
+        kind = _clause_kind(form)
 
-        if is_symbol(head, "catch"):
+        if kind == "catch":
             if len(form) < 3:
                 raise SyntaxError("catch needs (ExceptionType var body...)")
             exc_type_form = form[1]
@@ -6853,69 +6532,77 @@ def compile_try_expr(args):
                 raise SyntaxError("catch var must be symbol")
             var_name = normalize_name(var_form.name)
 
-            # Compile handler body - for single form, compile directly
+            handler_args = _one_arg(var_name)
+
+            # Compile the handler body in its own scope, where var is bound
+            saved_funcs_count = len(ctx.nested_functions)
+            ctx.push_scope({var_name})
+            ctx.push_nonlocal_frame()
+            handler_body_expr = None
             if len(handler_body_forms) == 1:
                 handler_body_expr = compile_expr(handler_body_forms[0])
             else:
-                form_exprs = [compile_expr(f) for f in handler_body_forms]
-                handler_body_expr = ast.Subscript(
-                    value=ast.Tuple(elts=form_exprs, ctx=ast.Load()),
-                    slice=ast.Constant(value=-1),
-                    ctx=ast.Load(),
+                handler_stmts: list[ast.stmt] = []
+                last_form = _compile_leading_stmts(handler_body_forms, handler_stmts)
+                handler_stmts.extend(_compile_tail_return(last_form))
+            nested_funcs = ctx.nested_functions[saved_funcs_count:]
+            del ctx.nested_functions[saved_funcs_count:]
+            nonlocals = ctx.pop_nonlocal_frame()
+            ctx.pop_scope()
+
+            if handler_body_expr is not None and not nested_funcs and not nonlocals:
+                # A single plain expression: handler lambda (e) -> value
+                handler_fn: ast.expr = ast.Lambda(
+                    args=handler_args, body=handler_body_expr
                 )
+            else:
+                # Statements, or helpers that must see var: a handler function
+                if handler_body_expr is not None:
+                    handler_stmts = [ast.Return(value=handler_body_expr)]
+                handler_body: list[ast.stmt] = []
+                if nonlocals:
+                    handler_body.append(ast.Nonlocal(names=sorted(nonlocals)))
+                handler_body.extend(nested_funcs)
+                handler_body.extend(handler_stmts)
+                handler_name = gen_fn_name()
+                ctx.add_function(
+                    ast.FunctionDef(
+                        name=handler_name,
+                        args=handler_args,
+                        body=handler_body,
+                        decorator_list=[],
+                    )
+                )
+                handler_fn = _load(handler_name)
 
-            # Build handler lambda: (e) -> value
-            handler_lambda = ast.Lambda(
-                args=ast.arguments(
-                    posonlyargs=[],
-                    args=[ast.arg(arg=var_name, annotation=None)],
-                    vararg=None,
-                    kwonlyargs=[],
-                    kw_defaults=[],
-                    kwarg=None,
-                    defaults=[],
-                ),
-                body=handler_body_expr,
-            )
-
-            # Create tuple (exc_type, handler_lambda)
-            handler_elts.append(
-                ast.Tuple(elts=[exc_type_expr, handler_lambda], ctx=ast.Load())
-            )
+            # Create tuple (exc_type, handler_fn)
+            handler_elts.append(ast.Tuple(elts=[exc_type_expr, handler_fn], ctx=_LOAD))
 
-        elif is_symbol(head, "finally"):
+        elif kind == "finally":
             if finally_lambda is not None:
                 raise SyntaxError("multiple finally clauses not allowed")
             cleanup_forms = form[1:] or [None]
             finally_lambda = ast.Lambda(
-                args=ast.arguments(
-                    posonlyargs=[],
-                    args=[],
-                    vararg=None,
-                    kwonlyargs=[],
-                    kw_defaults=[],
-                    kwarg=None,
-                    defaults=[],
-                ),
+                args=_EMPTY_ARGS,
                 body=compile_do_expr(cleanup_forms),
             )
         else:
             raise SyntaxError("Expected catch or finally in try")
 
-    handlers_list = ast.List(elts=handler_elts, ctx=ast.Load())
+    handlers_list = ast.List(elts=handler_elts, ctx=_LOAD)
 
     args_exprs = [body_lambda, handlers_list]
     if finally_lambda is not None:
         args_exprs.append(finally_lambda)
 
     return ast.Call(
-        func=ast.Name(id="spork_try", ctx=ast.Load()),
+        func=_load("spork_try"),
         args=args_exprs,
         keywords=[],
     )
 
 
-def compile_set_expr(args):
+def compile_set_expr(args, form_loc=None):
     """
     Compile (set! target value) as expression using walrus operator.
     Returns the value being set.
@@ -6931,22 +6618,18 @@ def compile_set_expr(args):
         name = target_form.name
         # Handle dotted symbols like self.x -> attribute assignment
         if "." in name:
-            parts = name.split(".")
-            node: ast.expr = ast.Name(id=normalize_name(parts[0]), ctx=ast.Load())
-            for attr in parts[1:-1]:
-                node = ast.Attribute(
-                    value=node, attr=normalize_name(attr), ctx=ast.Load()
-                )
-            attr_name = normalize_name(parts[-1])
+            parts = _dotted_parts(name)
+            node = _attr_chain(parts[:-1])
+            attr_name = parts[-1]
             # Use spork_setattr helper which returns the value
             return ast.Call(
-                func=ast.Name(id="spork_setattr", ctx=ast.Load()),
+                func=_load("spork_setattr"),
                 args=[node, ast.Constant(value=attr_name), value],
                 keywords=[],
             )
         else:
             return ast.NamedExpr(
-                target=ast.Name(id=normalize_name(name), ctx=ast.Store()),
+                target=_store(normalize_name(name)),
                 value=value,
             )
 
@@ -6970,7 +6653,7 @@ def compile_set_expr(args):
 
             # Use spork_setattr helper which returns the value
             return ast.Call(
-                func=ast.Name(id="spork_setattr", ctx=ast.Load()),
+                func=_load("spork_setattr"),
                 args=[base_expr, ast.Constant(value=attr_name), value],
                 keywords=[],
             )
@@ -6981,7 +6664,7 @@ def compile_set_expr(args):
 def compile_return(args, form_loc=None):
     """Compile (return expr) to ast.Return."""
     if len(args) == 0:
-        node = ast.Return(value=ast.Constant(value=None))
+        node = ast.Return(value=None)
     elif len(args) == 1:
         node = ast.Return(value=compile_expr(args[0]))
     else:
@@ -7014,7 +6697,7 @@ def compile_yield(args, form_loc=None):
     return node
 
 
-def compile_yield_expr(args):
+def compile_yield_expr(args, form_loc=None):
     """Compile (yield) or (yield expr) as an expression."""
     if len(args) == 0:
         return ast.Yield(value=None)
@@ -7033,7 +6716,7 @@ def compile_yield_from(args, form_loc=None):
     return node
 
 
-def compile_yield_from_expr(args):
+def compile_yield_from_expr(args, form_loc=None):
     """Compile (yield-from expr) as an expression."""
     if len(args) != 1:
         raise SyntaxError("yield-from requires exactly 1 argument")
@@ -7049,14 +6732,14 @@ def compile_await(args, form_loc=None):
     return node
 
 
-def compile_await_expr(args):
+def compile_await_expr(args, form_loc=None):
     """Compile (await expr) as an expression."""
     if len(args) != 1:
         raise SyntaxError("await requires exactly 1 argument")
     return ast.Await(value=compile_expr(args[0]))
 
 
-def compile_throw_expr(args):
+def compile_throw_expr(args, form_loc=None):
     """
     Compile (throw expr) as an expression.
     Uses an immediately-invoked lambda that raises.
@@ -7066,23 +6749,11 @@ def compile_throw_expr(args):
 
     return ast.Call(
         func=ast.Lambda(
-            args=ast.arguments(
-                posonlyargs=[],
-                args=[],
-                vararg=None,
-                kwonlyargs=[],
-                kw_defaults=[],
-                kwarg=None,
-                defaults=[],
-            ),
-            body=ast.IfExp(
-                test=ast.Constant(value=True),
-                body=ast.Call(
-                    func=ast.Name(id="spork_raise", ctx=ast.Load()),
-                    args=[compile_expr(args[0])],
-                    keywords=[],
-                ),
-                orelse=ast.Constant(value=None),
+            args=_EMPTY_ARGS,
+            body=ast.Call(
+                func=_load("spork_raise"),
+                args=[compile_expr(args[0])],
+                keywords=[],
             ),
         ),
         args=[],
@@ -7107,14 +6778,9 @@ def compile_set(args, form_loc=None):
         name = target_form.name
         # Handle dotted symbols like self.x -> attribute assignment
         if "." in name:
-            parts = name.split(".")
-            node: ast.expr = ast.Name(id=normalize_name(parts[0]), ctx=ast.Load())
-            for attr in parts[1:-1]:
-                node = ast.Attribute(
-                    value=node, attr=normalize_name(attr), ctx=ast.Load()
-                )
+            parts = _dotted_parts(name)
             target = ast.Attribute(
-                value=node, attr=normalize_name(parts[-1]), ctx=ast.Store()
+                value=_attr_chain(parts[:-1]), attr=parts[-1], ctx=_STORE
             )
             stmt = ast.Assign(targets=[target], value=value)
             set_location(stmt, form_loc)
@@ -7129,7 +6795,7 @@ def compile_set(args, form_loc=None):
                     normalized_name
                 ):
                     ctx.mark_nonlocal(normalized_name)
-            target = ast.Name(id=normalized_name, ctx=ast.Store())
+            target = _store(normalized_name)
             stmt = ast.Assign(targets=[target], value=value)
             set_location(stmt, form_loc)
             return stmt
@@ -7151,13 +6817,13 @@ def compile_set(args, form_loc=None):
                 if not isinstance(attr_form, Symbol):
                     raise SyntaxError("attribute names must be symbols")
                 node = ast.Attribute(
-                    value=node, attr=normalize_name(attr_form.name), ctx=ast.Load()
+                    value=node, attr=normalize_name(attr_form.name), ctx=_LOAD
                 )
 
             if not isinstance(attrs[-1], Symbol):
                 raise SyntaxError("attribute names must be symbols")
             target = ast.Attribute(
-                value=node, attr=normalize_name(attrs[-1].name), ctx=ast.Store()
+                value=node, attr=normalize_name(attrs[-1].name), ctx=_STORE
             )
             stmt = ast.Assign(targets=[target], value=value)
             set_location(stmt, form_loc)
@@ -7173,7 +6839,7 @@ def compile_set(args, form_loc=None):
             coll_expr = compile_expr(coll_form)
             idx_expr = compile_expr(idx_form)
 
-            target = ast.Subscript(value=coll_expr, slice=idx_expr, ctx=ast.Store())
+            target = ast.Subscript(value=coll_expr, slice=idx_expr, ctx=_STORE)
             stmt = ast.Assign(targets=[target], value=value)
             set_location(stmt, form_loc)
             return stmt
@@ -7183,7 +6849,7 @@ def compile_set(args, form_loc=None):
     )
 
 
-def compile_do_expr(forms):
+def compile_do_expr(forms, form_loc=None):
     """
     Compile (do e1 e2 e3) in expression context.
 
@@ -7200,7 +6866,7 @@ def compile_do_expr(forms):
         is_statement_form = False
         if isinstance(form, list) and form and isinstance(form[0], Symbol):
             head_name = form[0].name
-            if head_name in ("for", "while", "async-for", "set!"):
+            if head_name in _TAIL_STMT_ONLY:
                 is_statement_form = True
 
         if not is_statement_form:
@@ -7208,7 +6874,7 @@ def compile_do_expr(forms):
         # Fall through to wrapper function creation for statement forms
 
     ctx = get_compile_context()
-    saved_funcs = ctx.nested_functions[:]
+    saved_funcs_count = len(ctx.nested_functions)
 
     # Push a new scope and nonlocal frame for this wrapper function
     ctx.push_scope()
@@ -7218,8 +6884,8 @@ def compile_do_expr(forms):
     body_stmts = compile_block_with_result(forms, ret_name)
 
     # Get any nested functions generated
-    nested_funcs = ctx.nested_functions[len(saved_funcs) :]
-    ctx.nested_functions = saved_funcs
+    nested_funcs = ctx.nested_functions[saved_funcs_count:]
+    del ctx.nested_functions[saved_funcs_count:]
 
     # Get nonlocal declarations needed and pop the frame
     nonlocals = ctx.pop_nonlocal_frame()
@@ -7236,32 +6902,25 @@ def compile_do_expr(forms):
 
     body.extend(nested_funcs)
 
-    # Initialize return variable to None
-    body.append(
-        ast.Assign(
-            targets=[ast.Name(id=ret_name, ctx=ast.Store())],
-            value=ast.Constant(value=None),
+    # Initialize return variable to None, unless the body always sets it
+    if not _assigns_name(body_stmts, ret_name):
+        body.append(
+            ast.Assign(
+                targets=[_store(ret_name)],
+                value=ast.Constant(value=None),
+            )
         )
-    )
 
     # Add body statements
     body.extend(body_stmts)
 
     # Return the result
-    body.append(ast.Return(value=ast.Name(id=ret_name, ctx=ast.Load())))
+    body.append(ast.Return(value=_load(ret_name)))
 
     # Create wrapper function
     wrapper_func = ast.FunctionDef(
         name=wrapper_name,
-        args=ast.arguments(
-            posonlyargs=[],
-            args=[],
-            vararg=None,
-            kwonlyargs=[],
-            kw_defaults=[],
-            kwarg=None,
-            defaults=[],
-        ),
+        args=_EMPTY_ARGS,
         body=body,
         decorator_list=[],
     )
@@ -7269,7 +6928,7 @@ def compile_do_expr(forms):
     ctx.add_function(wrapper_func)
 
     return ast.Call(
-        func=ast.Name(id=wrapper_name, ctx=ast.Load()),
+        func=_load(wrapper_name),
         args=[],
         keywords=[],
     )
@@ -7339,10 +6998,10 @@ def compile_multi_arity_fn_expr(arity_forms, is_async=False, is_generator=False)
     # __n__ = len(__args__)
     body_nodes.append(
         ast.Assign(
-            targets=[ast.Name(id="__n__", ctx=ast.Store())],
+            targets=[_store("__n__")],
             value=ast.Call(
-                func=ast.Name(id="len", ctx=ast.Load()),
-                args=[ast.Name(id="__args__", ctx=ast.Load())],
+                func=_load("len"),
+                args=[_load("__args__")],
                 keywords=[],
             ),
         )
@@ -7351,55 +7010,26 @@ def compile_multi_arity_fn_expr(arity_forms, is_async=False, is_generator=False)
     # Track nested functions created while compiling this fn's body
     before_count = len(get_compile_context().nested_functions)
 
-    # Build if/elif chain for dispatch
-    dispatch_cases = []
-
-    for params, body_forms, min_args, _, has_kwargs in fixed_arities:
-        test = ast.Compare(
-            left=ast.Name(id="__n__", ctx=ast.Load()),
-            ops=[ast.Eq()],
-            comparators=[ast.Constant(value=min_args)],
+    # Generate the body of each arity, fixed arities by arg count first
+    fixed_cases = [
+        (
+            min_args,
+            compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator),
         )
-        arity_body = compile_arity_dispatch_body(
-            params, body_forms, has_kwargs, is_generator
-        )
-        dispatch_cases.append((test, arity_body))
-
+        for params, body_forms, min_args, _, has_kwargs in fixed_arities
+    ]
+    variadic_case = None
     if variadic_arities:
-        params, body_forms, min_args, has_vararg, has_kwargs = variadic_arities[0]
-        test = ast.Compare(
-            left=ast.Name(id="__n__", ctx=ast.Load()),
-            ops=[ast.GtE()],
-            comparators=[ast.Constant(value=min_args)],
-        )
-        arity_body = compile_arity_dispatch_body(
-            params, body_forms, has_kwargs, is_generator
+        params, body_forms, min_args, _, has_kwargs = variadic_arities[0]
+        variadic_case = (
+            min_args,
+            compile_arity_dispatch_body(params, body_forms, has_kwargs, is_generator),
         )
-        dispatch_cases.append((test, arity_body))
 
-    if dispatch_cases:
+    # Dispatch on __n__, raising TypeError when no arity matches
+    if arities:
         error_msg = "fn called with wrong number of arguments"
-        else_body = [
-            ast.Raise(
-                exc=ast.Call(
-                    func=ast.Name(id="TypeError", ctx=ast.Load()),
-                    args=[ast.Constant(value=error_msg)],
-                    keywords=[],
-                ),
-                cause=None,
-            )
-        ]
-
-        current_else: list[ast.stmt] = list(else_body)
-        for test, arity_body in reversed(dispatch_cases):
-            current_if = ast.If(
-                test=test,
-                body=arity_body,
-                orelse=current_else,
-            )
-            current_else = [current_if]
-
-        body_nodes.append(current_else[0])
+        body_nodes.append(_arity_dispatch(fixed_cases, variadic_case, error_msg))
 
     # Check for yield without ^generator annotation
     if contains_yield(body_nodes) and not is_generator:
@@ -7437,10 +7067,10 @@ def compile_multi_arity_fn_expr(arity_forms, is_async=False, is_generator=False)
 
     # Add the function definition to the context to be injected into the enclosing scope
     get_compile_context().add_function(func_def)
-    return ast.Name(id=fn_name, ctx=ast.Load())
+    return _load(fn_name)
 
 
-def compile_fn_expr(args, ctx=None):
+def compile_fn_expr(args, form_loc=None):
     """
     Compile (fn [x y] body...) to a nested function definition.
     This allows statements like set!, for, while, etc. in the function body.
@@ -7499,7 +7129,7 @@ def compile_fn_expr(args, ctx=None):
     # Compile all but the last form as statements
     for f in body_forms[:-1]:
         stmts = compile_stmt(f)
-        body_nodes.extend(flatten_stmts([stmts]))
+        _extend_stmt(body_nodes, stmts)
 
     # Last form: try to return it as an expression, but handle let/do specially
     last_form = body_forms[-1]
@@ -7510,31 +7140,31 @@ def compile_fn_expr(args, ctx=None):
 
         if head_name == "let":
             let_stmts = compile_let_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([let_stmts]))
+            _extend_stmt(body_nodes, let_stmts)
         elif head_name == "do":
             do_stmts = compile_do_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([do_stmts]))
+            _extend_stmt(body_nodes, do_stmts)
         elif head_name == "try":
             try_stmts = compile_try_stmt_with_return(last_form[1:])
-            body_nodes.extend(flatten_stmts([try_stmts]))
+            _extend_stmt(body_nodes, try_stmts)
         elif head_name == "with":
             with_stmt = compile_with_stmt_with_return(last_form[1:])
             body_nodes.append(with_stmt)
-        elif head_name in ("while", "for", "async-for", "set!"):
+        elif head_name in _TAIL_STMT_ONLY:
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
             # Only add return None if not a generator
             if not is_generator:
-                body_nodes.append(ast.Return(value=ast.Constant(value=None)))
+                body_nodes.append(ast.Return(value=None))
         elif head_name == "return":
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             # Regular expression - check if generator
             if is_generator:
                 # Generator function - just add the statement, no return
                 stmts = compile_stmt(last_form)
-                body_nodes.extend(flatten_stmts([stmts]))
+                _extend_stmt(body_nodes, stmts)
             else:
                 # Regular function - add return
                 body_nodes.append(ast.Return(value=compile_expr(last_form)))
@@ -7543,7 +7173,7 @@ def compile_fn_expr(args, ctx=None):
         if is_generator:
             # Generator function - compile as statement, no return
             stmts = compile_stmt(last_form)
-            body_nodes.extend(flatten_stmts([stmts]))
+            _extend_stmt(body_nodes, stmts)
         else:
             # Regular function - return it
             body_nodes.append(ast.Return(value=compile_expr(last_form)))
@@ -7589,7 +7219,7 @@ def compile_fn_expr(args, ctx=None):
     get_compile_context().add_function(func_def)
 
     # Return a reference to the function name
-    return ast.Name(id=fn_name, ctx=ast.Load())
+    return ast.Name(id=fn_name, ctx=_LOAD)
 
 
 # =============================================================================
@@ -7677,7 +7307,7 @@ def compile_anon_fn_literal(form: AnonFnLiteral):
     # Compile all but the last form as statements
     for f in transformed_body[:-1]:
         stmts = compile_stmt(f)
-        body_nodes.extend(flatten_stmts([stmts]))
+        _extend_stmt(body_nodes, stmts)
 
     # Last form: return it
     if transformed_body:
@@ -7687,20 +7317,20 @@ def compile_anon_fn_literal(form: AnonFnLiteral):
             head_name = last_form[0].name
             if head_name == "let":
                 let_stmts = compile_let_stmt_with_return(last_form[1:])
-                body_nodes.extend(flatten_stmts([let_stmts]))
+                _extend_stmt(body_nodes, let_stmts)
             elif head_name == "do":
                 do_stmts = compile_do_stmt_with_return(last_form[1:])
-                body_nodes.extend(flatten_stmts([do_stmts]))
-            elif head_name in ("while", "for", "set!"):
+                _extend_stmt(body_nodes, do_stmts)
+            elif head_name in _TAIL_STMT_ONLY:
                 stmts = compile_stmt(last_form)
-                body_nodes.extend(flatten_stmts([stmts]))
-                body_nodes.append(ast.Return(value=ast.Constant(value=None)))
+                _extend_stmt(body_nodes, stmts)
+                body_nodes.append(ast.Return(value=None))
             else:
                 body_nodes.append(ast.Return(value=compile_expr(last_form)))
         else:
             body_nodes.append(ast.Return(value=compile_expr(last_form)))
     else:
-        body_nodes.append(ast.Return(value=ast.Constant(value=None)))
+        body_nodes.append(ast.Return(value=None))
 
     if not body_nodes:
         body_nodes.append(ast.Pass())
@@ -7729,7 +7359,7 @@ def compile_anon_fn_literal(form: AnonFnLiteral):
     get_compile_context().add_function(func_def)
 
     # Return reference to function with source location
-    name_node = ast.Name(id=fn_name, ctx=ast.Load())
+    name_node = ast.Name(id=fn_name, ctx=_LOAD)
     return set_location(name_node, loc)
 
 
@@ -7798,27 +7428,27 @@ def compile_inst_literal(form: InstLiteral):
             # UTC timezone
             tz_expr = ast.Attribute(
                 value=ast.Attribute(
-                    value=ast.Name(id="datetime", ctx=ast.Load()),
+                    value=ast.Name(id="datetime", ctx=_LOAD),
                     attr="timezone",
-                    ctx=ast.Load(),
+                    ctx=_LOAD,
                 ),
                 attr="utc",
-                ctx=ast.Load(),
+                ctx=_LOAD,
             )
         else:
             # Custom timezone offset
             tz_expr = ast.Call(
                 func=ast.Attribute(
-                    value=ast.Name(id="datetime", ctx=ast.Load()),
+                    value=ast.Name(id="datetime", ctx=_LOAD),
                     attr="timezone",
-                    ctx=ast.Load(),
+                    ctx=_LOAD,
                 ),
                 args=[
                     ast.Call(
                         func=ast.Attribute(
-                            value=ast.Name(id="datetime", ctx=ast.Load()),
+                            value=ast.Name(id="datetime", ctx=_LOAD),
                             attr="timedelta",
-                            ctx=ast.Load(),
+                            ctx=_LOAD,
                         ),
                         args=[],
                         keywords=[
@@ -7834,9 +7464,9 @@ def compile_inst_literal(form: InstLiteral):
 
     node = ast.Call(
         func=ast.Attribute(
-            value=ast.Name(id="datetime", ctx=ast.Load()),
+            value=ast.Name(id="datetime", ctx=_LOAD),
             attr="datetime",
-            ctx=ast.Load(),
+            ctx=_LOAD,
         ),
         args=args,
         keywords=keywords,
@@ -7894,387 +7524,315 @@ def compile_read_time_eval(form: ReadTimeEval):
         return set_location(node, loc)
 
 
-def compile_expr(form):
-    """
-    Compile a form in expression context.
-    Returns an ast.expr node with source location information when available.
-    """
-    # Get source location from form if available
-    loc = get_source_location(form)
-
-    # literals: booleans, nil, numbers, strings
-    if isinstance(form, bool):
-        # Must check bool before int since bool is subclass of int
-        node = ast.Constant(value=form)
-        return set_location(node, loc)
-    if form is None:
-        node = ast.Constant(value=None)
-        return set_location(node, loc)
-    if isinstance(form, (int, float, str)):
-        node = ast.Constant(value=form)
-        return set_location(node, loc)
+def _compile_constant(form):
+    """Compile a literal (bool, nil, number or string); these carry no location."""
+    return ast.Constant(value=form)
 
-    # Handle quote and quasiquote
-    if isinstance(form, list) and len(form) > 0:
-        head = form[0]
 
-        # (quote form) - return the form as data
-        if is_symbol(head, "quote"):
-            if len(form) != 2:
-                raise SyntaxError("quote requires exactly 1 argument")
-            return compile_quote(form[1])
+# Element types of collection literals that compile_module builds once
+_CONST_ITEM_TYPES = (bool, int, float, str, type(None), Keyword)
 
-        # (quasiquote form) - like quote but with unquote/unquote-splicing
-        if is_symbol(head, "quasiquote"):
-            if len(form) != 2:
-                raise SyntaxError("quasiquote requires exactly 1 argument")
-            return compile_quasiquote(form[1])
 
-    # MapLiteral -> Map via hash_map()
+def _is_constant_form(form):
+    """
+    Whether form is a literal, a keyword, or a vector, set or map literal
+    made only of such forms.
+    """
+    if isinstance(form, _CONST_ITEM_TYPES):
+        return True
+    if isinstance(form, (VectorLiteral, SetLiteral)):
+        return all(_is_constant_form(item) for item in form.items)
     if isinstance(form, MapLiteral):
-        # Flatten key-value pairs into args for hash_map(k1, v1, k2, v2, ...)
-        args = []
-        for k, v in form.pairs:
-            # Keywords are now preserved as Keyword objects
-            keyexpr = compile_expr(k)
-            args.append(keyexpr)
-            args.append(compile_expr(v))
-        node = ast.Call(
-            func=ast.Name(id="hash_map", ctx=ast.Load()),
-            args=args,
-            keywords=[],
-        )
-        return copy_location(node, form)
-
-    # SetLiteral -> PSet via hash_set()
-    if isinstance(form, SetLiteral):
-        # Create a list of elements and pass to hash_set
-        elts = [compile_expr(x) for x in form.items]
-        list_node = ast.List(elts=elts, ctx=ast.Load())
-        node = ast.Call(
-            func=ast.Name(id="hash_set", ctx=ast.Load()),
-            args=[list_node],
-            keywords=[],
-        )
-        return copy_location(node, form)
+        return all(_is_constant_form(k) and _is_constant_form(v) for k, v in form.pairs)
+    return False
 
-    # VectorLiteral -> Vector via vec()
-    # Special case: [for [x coll] expr] -> vector comprehension using transients
-    if isinstance(form, VectorLiteral):
-        items = form.items
-        if (
-            len(items) == 3
-            and is_symbol(items[0], "for")
-            and isinstance(items[1], VectorLiteral)
-        ):
-            # Vector comprehension: [for [x coll] expr]
-            # items[0] = 'for', items[1] = [x coll], items[2] = expr
-            for_form = [items[0], items[1]]  # Reconstruct (for [x coll])
-            body_expr = items[2]
-            return compile_vector_comprehension(for_form, body_expr, form)
 
-        # Check for sorted vector comprehension: [sorted-for [x coll] expr :key fn :reverse bool]
-        if (
-            len(items) >= 3
-            and is_symbol(items[0], "sorted-for")
-            and isinstance(items[1], VectorLiteral)
-        ):
-            # Sorted vector comprehension: [sorted-for [x coll] expr ...]
-            # items[0] = 'sorted-for', items[1] = [x coll], items[2] = expr, items[3:] = options
-            for_form = [items[0], items[1]]
-            body_expr = items[2]
-            options = items[3:]  # Remaining items are :key/:reverse options
-            return compile_sorted_vector_comprehension(
-                for_form, body_expr, options, form
-            )
+def _hoist_collection(node, form, items, prefix):
+    """
+    Return node, the constructor call for collection literal form, or, inside
+    compile_module when form has items and is constant, a load of a
+    module-level constant holding it. Persistent collections are immutable,
+    so the module builds the value once instead of on every evaluation.
+    """
+    ctx = get_compile_context()
+    if ctx.keyword_constants is not None and items and _is_constant_form(form):
+        node = _load(ctx.hoist_constant(prefix, node))
+    return copy_location(node, form)
 
-        elts = [compile_expr(x) for x in form.items]
-        node = ast.Call(
-            func=ast.Name(id="vec", ctx=ast.Load()),
-            args=elts,
-            keywords=[],
-        )
-        return copy_location(node, form)
-
-    # Vector (runtime value from macro) -> vec() call
-    if isinstance(form, Vector):
-        elts = [compile_expr(form.nth(i)) for i in range(len(form))]  # type: ignore[attr-defined]
-        node = ast.Call(
-            func=ast.Name(id="vec", ctx=ast.Load()),
-            args=elts,
-            keywords=[],
-        )
-        return set_location(node, loc)
 
-    # Map (runtime value from macro) -> hash_map() call
-    if isinstance(form, Map):
-        args = []
-        for k, v in form.items():  # type: ignore[attr-defined]
-            args.append(compile_expr(k))
-            args.append(compile_expr(v))
-        node = ast.Call(
-            func=ast.Name(id="hash_map", ctx=ast.Load()),
-            args=args,
+def _compile_map_literal(form: MapLiteral):
+    """Compile {k v ...} to hash_map(k, v, ...)."""
+    # Flatten key-value pairs into args for hash_map(k1, v1, k2, v2, ...)
+    args = []
+    for k, v in form.pairs:
+        # Keywords are now preserved as Keyword objects
+        args.append(compile_expr(k))
+        args.append(compile_expr(v))
+    node = ast.Call(func=_load("hash_map"), args=args, keywords=[])
+    return _hoist_collection(node, form, form.pairs, "__const_map_")
+
+
+def _compile_set_literal(form: SetLiteral):
+    """Compile #{x ...} to hash_set([x, ...])."""
+    elts = [compile_expr(x) for x in form.items]
+    list_node = ast.List(elts=elts, ctx=_LOAD)
+    node = ast.Call(func=_load("hash_set"), args=[list_node], keywords=[])
+    return _hoist_collection(node, form, form.items, "__const_set_")
+
+
+def _compile_vector_literal(form: VectorLiteral):
+    """
+    Compile [x ...] to vec(x, ...), or a [for ...] / [sorted-for ...]
+    vector comprehension.
+    """
+    items = form.items
+    if (
+        len(items) == 3
+        and is_symbol(items[0], "for")
+        and isinstance(items[1], VectorLiteral)
+    ):
+        # Vector comprehension: [for [x coll] expr]
+        # items[0] = 'for', items[1] = [x coll], items[2] = expr
+        for_form = [items[0], items[1]]  # Reconstruct (for [x coll])
+        body_expr = items[2]
+        return compile_vector_comprehension(for_form, body_expr, form)
+
+    # Check for sorted vector comprehension: [sorted-for [x coll] expr :key fn :reverse bool]
+    if (
+        len(items) >= 3
+        and is_symbol(items[0], "sorted-for")
+        and isinstance(items[1], VectorLiteral)
+    ):
+        # Sorted vector comprehension: [sorted-for [x coll] expr ...]
+        # items[0] = 'sorted-for', items[1] = [x coll], items[2] = expr, items[3:] = options
+        for_form = [items[0], items[1]]
+        body_expr = items[2]
+        options = items[3:]  # Remaining items are :key/:reverse options
+        return compile_sorted_vector_comprehension(for_form, body_expr, options, form)
+
+    elts = [compile_expr(x) for x in items]
+    node = ast.Call(func=_load("vec"), args=elts, keywords=[])
+    return _hoist_collection(node, form, items, "__const_vec_")
+
+
+def _compile_vector_value(form):
+    """Compile a Vector (runtime value from a macro) to a vec() call."""
+    elts = [compile_expr(form.nth(i)) for i in range(len(form))]
+    node = ast.Call(func=_load("vec"), args=elts, keywords=[])
+    return set_location(node, get_source_location(form))
+
+
+def _compile_map_value(form):
+    """Compile a Map (runtime value from a macro) to a hash_map() call."""
+    args = []
+    for k, v in form.items():
+        args.append(compile_expr(k))
+        args.append(compile_expr(v))
+    node = ast.Call(func=_load("hash_map"), args=args, keywords=[])
+    return set_location(node, get_source_location(form))
+
+
+def _compile_cons_value(form):
+    """Compile a Cons (runtime value from a macro) to a cons() chain."""
+    result = ast.Constant(value=None)
+    # Collect items in a list first
+    items = []
+    curr = form
+    while curr is not None:
+        items.append(curr.first)
+        curr = curr.rest
+    # Build cons chain from right to left
+    for item in reversed(items):
+        result = ast.Call(
+            func=_load("cons"),
+            args=[compile_expr(item), result],
             keywords=[],
         )
-        return set_location(node, loc)
+    return set_location(result, get_source_location(form))
 
-    # Cons (runtime value from macro) -> cons chain
-    if isinstance(form, Cons):
-        result = ast.Constant(value=None)
-        # Collect items in a list first
-        items = []
-        curr = form
-        while curr is not None:
-            items.append(curr.first)  # type: ignore[attr-defined]
-            curr = curr.rest  # type: ignore[attr-defined]
-        # Build cons chain from right to left
-        for item in reversed(items):
-            result = ast.Call(
-                func=ast.Name(id="cons", ctx=ast.Load()),
-                args=[compile_expr(item), result],
-                keywords=[],
-            )
-        return set_location(result, loc)
 
-    # ==========================================================================
-    # Reader Macro Literals
-    # ==========================================================================
+def _compile_slice_literal(form: SliceLiteral):
+    """Compile #[start:stop:step] to slice(start, stop, step)."""
+    start_expr = (
+        ast.Constant(value=None) if form.start is None else compile_expr(form.start)
+    )
+    stop_expr = (
+        ast.Constant(value=None) if form.stop is None else compile_expr(form.stop)
+    )
+    step_expr = (
+        ast.Constant(value=None) if form.step is None else compile_expr(form.step)
+    )
+    node = ast.Call(
+        func=_load("slice"),
+        args=[start_expr, stop_expr, step_expr],
+        keywords=[],
+    )
+    return copy_location(node, form)
 
-    # SliceLiteral -> slice(start, stop, step)
-    if isinstance(form, SliceLiteral):
-        start_expr = (
-            ast.Constant(value=None) if form.start is None else compile_expr(form.start)
-        )
-        stop_expr = (
-            ast.Constant(value=None) if form.stop is None else compile_expr(form.stop)
-        )
-        step_expr = (
-            ast.Constant(value=None) if form.step is None else compile_expr(form.step)
-        )
-        node = ast.Call(
-            func=ast.Name(id="slice", ctx=ast.Load()),
-            args=[start_expr, stop_expr, step_expr],
-            keywords=[],
-        )
-        return copy_location(node, form)
-
-    # AnonFnLiteral -> hoisted function definition
-    if isinstance(form, AnonFnLiteral):
-        return compile_anon_fn_literal(form)
-
-    # FStringLiteral -> ast.JoinedStr (f-string)
-    if isinstance(form, FStringLiteral):
-        return compile_fstring_literal(form)
-
-    # PathLiteral -> pathlib.Path("...")
-    if isinstance(form, PathLiteral):
-        # Generate: pathlib.Path("path")
-        node = ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id="pathlib", ctx=ast.Load()),
-                attr="Path",
-                ctx=ast.Load(),
-            ),
-            args=[ast.Constant(value=form.path)],
-            keywords=[],
-        )
-        return copy_location(node, form)
-
-    # RegexLiteral -> re.compile(r"...")
-    if isinstance(form, RegexLiteral):
-        # Generate: re.compile("pattern")
-        node = ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id="re", ctx=ast.Load()),
-                attr="compile",
-                ctx=ast.Load(),
-            ),
-            args=[ast.Constant(value=form.pattern)],
-            keywords=[],
-        )
-        return copy_location(node, form)
-
-    # UUIDLiteral -> uuid.UUID("...")
-    if isinstance(form, UUIDLiteral):
-        # Generate: uuid.UUID("value")
-        node = ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id="uuid", ctx=ast.Load()),
-                attr="UUID",
-                ctx=ast.Load(),
-            ),
-            args=[ast.Constant(value=form.value)],
-            keywords=[],
-        )
-        return copy_location(node, form)
 
-    # InstLiteral -> datetime.datetime(..., tzinfo=datetime.timezone.utc)
-    if isinstance(form, InstLiteral):
-        return compile_inst_literal(form)
+def _compile_module_call(module, func, value, form):
+    """Compile a literal to module.func(value), e.g. re.compile("...")."""
+    node = ast.Call(
+        func=ast.Attribute(
+            value=_load(module),
+            attr=func,
+            ctx=_LOAD,
+        ),
+        args=[ast.Constant(value=value)],
+        keywords=[],
+    )
+    return copy_location(node, form)
 
-    # ReadTimeEval -> evaluate at compile time and inject result
-    if isinstance(form, ReadTimeEval):
-        return compile_read_time_eval(form)
 
-    # keyword - preserved as Keyword object at runtime
-    if isinstance(form, Keyword):
-        node = ast.Call(
-            func=ast.Name(id="Keyword", ctx=ast.Load()),
-            args=[ast.Constant(value=form.name)],
-            keywords=[],
-        )
-        return copy_location(node, form)
+def _compile_path_literal(form: PathLiteral):
+    """Compile #p"..." to pathlib.Path("...")."""
+    return _compile_module_call("pathlib", "Path", form.path, form)
 
-    # symbol
-    if isinstance(form, Symbol):
-        return compile_symbol_expr(form)
 
-    # list (special forms or function calls)
-    if isinstance(form, list):
-        if not form:
-            return ast.Constant(value=None)
-        head = form[0]
+def _compile_regex_literal(form: RegexLiteral):
+    """Compile #"..." to re.compile("...")."""
+    return _compile_module_call("re", "compile", form.pattern, form)
 
-        # (. base a b c)
-        if is_symbol(head, "."):
-            return compile_dot_form(form[1:])
 
-        # expression if
-        if is_symbol(head, "if"):
-            return compile_if_expr(form[1:])
+def _compile_uuid_literal(form: UUIDLiteral):
+    """Compile #uuid "..." to uuid.UUID("...")."""
+    return _compile_module_call("uuid", "UUID", form.value, form)
 
-        # expression do
-        if is_symbol(head, "do"):
-            return compile_do_expr(form[1:])
 
-        # expression let
-        if is_symbol(head, "let"):
-            return compile_let_expr(form[1:], loc)
+def _compile_keyword_expr(form: Keyword):
+    """Compile a keyword to a Keyword object constructed at runtime."""
+    node = ast.Call(
+        func=_load("Keyword"),
+        args=[ast.Constant(value=form.name)],
+        keywords=[],
+    )
+    return copy_location(node, form)
 
-        # fn literal
-        if is_symbol(head, "fn"):
-            return compile_fn_expr(form[1:])
 
-        # call - method call syntax
-        if is_symbol(head, "call"):
-            return compile_call_form(form[1:])
+def compile_quote_expr(args, form_loc=None):
+    """Compile (quote form): return the form as data."""
+    if len(args) != 1:
+        raise SyntaxError("quote requires exactly 1 argument")
+    return compile_quote(args[0])
 
-        # (.method obj args...) - shorthand method call syntax
-        if (
-            isinstance(head, Symbol)
-            and head.name.startswith(".")
-            and len(head.name) > 1
-        ):
-            return compile_method_call(head.name[1:], form[1:])
 
-        # try as expression: requires statement context
-        if is_symbol(head, "try"):
-            return compile_try_expr(form[1:])
+def compile_quasiquote_expr(args, form_loc=None):
+    """Compile (quasiquote form): like quote but with unquote/unquote-splicing."""
+    if len(args) != 1:
+        raise SyntaxError("quasiquote requires exactly 1 argument")
+    return compile_quasiquote(args[0])
 
-        # with as expression: uses IIFE pattern
-        if is_symbol(head, "with"):
-            return compile_with_expr(form[1:])
 
-        # async-with as expression: uses async IIFE pattern
-        if is_symbol(head, "async-with"):
-            return compile_async_with_expr(form[1:])
+def _compile_list_expr(form):
+    """Compile a list form: a special form, an operator or a function call."""
+    if not form:
+        return ast.Constant(value=None)
+    head = form[0]
 
-        # loop as expression: uses IIFE pattern
-        if is_symbol(head, "loop"):
-            return compile_loop_expr(form[1:], loc)
+    if isinstance(head, Symbol):
+        head_name = head.name
+        compile_special = _EXPR_DISPATCH.get(head_name)
+        if compile_special is not None:
+            return compile_special(form[1:], get_source_location(form))
 
-        # match expression: pattern matching
-        if is_symbol(head, "match"):
-            return compile_match_expr(form[1:], loc)
+        # (.method obj args...) - shorthand method call syntax
+        if head_name.startswith(".") and len(head_name) > 1:
+            return compile_method_call(head_name[1:], form[1:])
 
         # recur outside of loop context
-        if is_symbol(head, "recur"):
+        if head_name == "recur":
             raise SyntaxError("recur can only be used in tail position within a loop")
 
-        # set! as expression: returns the value being set
-        if is_symbol(head, "set!"):
-            return compile_set_expr(form[1:])
-
-        # throw as expression: wrap in lambda that raises
-        if is_symbol(head, "throw"):
-            return compile_throw_expr(form[1:])
-
-        # yield as expression
-        if is_symbol(head, "yield"):
-            return compile_yield_expr(form[1:])
-
-        # yield-from as expression
-        if is_symbol(head, "yield-from"):
-            return compile_yield_from_expr(form[1:])
-
-        # await as expression
-        if is_symbol(head, "await"):
-            return compile_await_expr(form[1:])
-
-        # apply: (apply f args) or (apply f arg1 arg2 args-list)
-        # Compiles to f(*args) or f(arg1, arg2, *args_list)
-        if is_symbol(head, "apply"):
-            return compile_apply(form[1:])
-
         # Binary operators: (+ a b), (- a b), etc.
-        if isinstance(head, Symbol) and head.name in BINARY_OPS:
+        if head_name in BINARY_OPS:
             if len(form) < 2:
                 raise SyntaxError(
-                    f"binary operator {head.name} requires at least 1 argument"
+                    f"binary operator {head_name} requires at least 1 argument"
                 )
             # Single argument: return as-is (useful for generic code)
             if len(form) == 2:
                 return compile_expr(form[1])
+            operands = [compile_expr(arg) for arg in form[1:]]
+            folded = _fold_operator(head_name, operands)
+            if folded is not _NOT_FOLDED:
+                return copy_location(ast.Constant(value=folded), form)
             # Multiple arguments: chain left-to-right
             # (+ 1 2 3) => ((1 + 2) + 3)
-            result = compile_expr(form[1])
-            for arg in form[2:]:
-                result = ast.BinOp(
-                    left=result, op=BINARY_OPS[head.name], right=compile_expr(arg)
-                )
+            result = operands[0]
+            for operand in operands[1:]:
+                result = ast.BinOp(left=result, op=BINARY_OPS[head_name], right=operand)
                 copy_location(result, form)
             return result
 
         # Comparison operators: (= a b), (< a b), etc.
-        if isinstance(head, Symbol) and head.name in COMPARE_OPS:
+        if head_name in COMPARE_OPS:
             if len(form) < 3:
                 raise SyntaxError(
-                    f"comparison operator {head.name} requires at least 2 arguments"
+                    f"comparison operator {head_name} requires at least 2 arguments"
                 )
+            operands = [compile_expr(arg) for arg in form[1:]]
+            folded = _fold_operator(head_name, operands)
+            if folded is not _NOT_FOLDED:
+                return copy_location(ast.Constant(value=folded), form)
             # Python allows chained comparisons: a < b < c
-            left = compile_expr(form[1])
-            ops = []
-            comparators = []
-            for i in range(2, len(form)):
-                ops.append(COMPARE_OPS[head.name])
-                comparators.append(compile_expr(form[i]))
-            node = ast.Compare(left=left, ops=ops, comparators=comparators)
+            node = ast.Compare(
+                left=operands[0],
+                ops=[COMPARE_OPS[head_name]] * (len(operands) - 1),
+                comparators=operands[1:],
+            )
             return copy_location(node, form)
 
         # Boolean operators: (and a b c), (or a b c)
-        if isinstance(head, Symbol) and head.name in BOOL_OPS:
+        if head_name in BOOL_OPS:
             if len(form) < 3:
                 raise SyntaxError(
-                    f"boolean operator {head.name} requires at least 2 arguments"
+                    f"boolean operator {head_name} requires at least 2 arguments"
                 )
             values = [compile_expr(f) for f in form[1:]]
-            node = ast.BoolOp(op=BOOL_OPS[head.name], values=values)
+            folded = _fold_operator(head_name, values)
+            if folded is not _NOT_FOLDED:
+                return copy_location(ast.Constant(value=folded), form)
+            node = ast.BoolOp(op=BOOL_OPS[head_name], values=values)
             return copy_location(node, form)
 
         # Unary not: (not x)
-        if is_symbol(head, "not"):
+        if head_name == "not":
             if len(form) != 2:
                 raise SyntaxError("not requires exactly 1 argument")
-            node = ast.UnaryOp(op=ast.Not(), operand=compile_expr(form[1]))
+            operand = compile_expr(form[1])
+            folded = _fold_operator(head_name, [operand])
+            if folded is not _NOT_FOLDED:
+                return copy_location(ast.Constant(value=folded), form)
+            node = ast.UnaryOp(op=_NOT_OP, operand=operand)
             return copy_location(node, form)
 
-        # function call
-        fn = compile_expr(head)
-        args, keywords = compile_call_args(form[1:])
-        node = ast.Call(func=fn, args=args, keywords=keywords)
-        return copy_location(node, form)
+    # function call
+    fn = compile_expr(head)
+    args, keywords = compile_call_args(form[1:])
+    node = ast.Call(func=fn, args=args, keywords=keywords)
+    return copy_location(node, form)
+
+
+def compile_expr(form):
+    """
+    Compile a form in expression context.
+    Returns an ast.expr node with source location information when available.
+    """
+    compile_form = _EXPR_TYPE_DISPATCH.get(type(form))
+    if compile_form is None:
+        compile_form = _resolve_expr_compiler(form)
+    return compile_form(form)
+
 
+def _resolve_expr_compiler(form):
+    """
+    Find the expression compiler for a form whose exact type is not in
+    _EXPR_TYPE_DISPATCH (a subclass of a known type), and cache it.
+    """
+    for form_type, compile_form in _EXPR_TYPE_DISPATCH.items():
+        if isinstance(form, form_type):
+            _EXPR_TYPE_DISPATCH[type(form)] = compile_form
+            return compile_form
     raise TypeError(f"cannot compile form: {form!r}")
 
 
@@ -8289,17 +7847,16 @@ def compile_symbol_expr(sym: Symbol):
         - Object attributes: self.x
         - Namespace aliases: math.sqrt (where math is a required namespace)
     """
-    name = sym.name
-    parts = name.split(".")
-    node: ast.expr = ast.Name(id=normalize_name(parts[0]), ctx=ast.Load())
+    parts = _dotted_parts(sym.name)
+    node: ast.expr = _load(parts[0])
     copy_location(node, sym)
     for attr in parts[1:]:
-        node = ast.Attribute(value=node, attr=normalize_name(attr), ctx=ast.Load())
+        node = ast.Attribute(value=node, attr=attr, ctx=_LOAD)
         copy_location(node, sym)
     return node
 
 
-def compile_dot_form(args):
+def compile_dot_form(args, form_loc=None):
     """
     Compile (. base attrs...) for attribute access and subscripting.
 
@@ -8326,22 +7883,18 @@ def compile_dot_form(args):
     for at in attrs:
         if isinstance(at, Symbol):
             # Attribute access: obj.attr
-            node = ast.Attribute(
-                value=node, attr=normalize_name(at.name), ctx=ast.Load()
-            )
+            node = ast.Attribute(value=node, attr=normalize_name(at.name), ctx=_LOAD)
         elif isinstance(at, int):
             # Integer indexing: obj[0]
-            node = ast.Subscript(
-                value=node, slice=ast.Constant(value=at), ctx=ast.Load()
-            )
+            node = ast.Subscript(value=node, slice=ast.Constant(value=at), ctx=_LOAD)
         else:
             # General subscript: obj[expr]
-            node = ast.Subscript(value=node, slice=compile_expr(at), ctx=ast.Load())
+            node = ast.Subscript(value=node, slice=compile_expr(at), ctx=_LOAD)
 
     return node
 
 
-def compile_call_form(args):
+def compile_call_form(args, form_loc=None):
     """
     Compile (call obj method arg1 arg2...) to method call.
 
@@ -8365,7 +7918,7 @@ def compile_call_form(args):
     obj_expr = compile_expr(obj_form)
 
     # Access the method as an attribute
-    method_expr = ast.Attribute(value=obj_expr, attr=method_form.name, ctx=ast.Load())
+    method_expr = ast.Attribute(value=obj_expr, attr=method_form.name, ctx=_LOAD)
 
     # Compile call arguments
     compiled_args, compiled_keywords = compile_call_args(call_args)
@@ -8395,7 +7948,7 @@ def compile_method_call(method_name, args):
 
     # Access the method as an attribute (normalize hyphens to underscores)
     method_expr = ast.Attribute(
-        value=obj_expr, attr=normalize_name(method_name), ctx=ast.Load()
+        value=obj_expr, attr=normalize_name(method_name), ctx=_LOAD
     )
 
     # Compile call arguments
@@ -8405,7 +7958,7 @@ def compile_method_call(method_name, args):
     return ast.Call(func=method_expr, args=compiled_args, keywords=compiled_keywords)
 
 
-def compile_apply(args):
+def compile_apply(args, form_loc=None):
     """
     Compile (apply f args) or (apply f arg1 arg2 ... args-seq).
 
@@ -8452,7 +8005,7 @@ def compile_apply(args):
                     # Splat variable: *{opts} -> **spork_kwargs_dict(opts)
                     # Wrap in spork_kwargs_dict to convert Keyword keys to strings
                     wrapped = ast.Call(
-                        func=ast.Name(id="spork_kwargs_dict", ctx=ast.Load()),
+                        func=ast.Name(id="spork_kwargs_dict", ctx=_LOAD),
                         args=[compile_expr(val)],
                         keywords=[],
                     )
@@ -8500,7 +8053,7 @@ def compile_apply(args):
         i += 1
 
     # Add the spread argument as *args
-    compiled_args.append(ast.Starred(value=compile_expr(spread_arg), ctx=ast.Load()))
+    compiled_args.append(ast.Starred(value=compile_expr(spread_arg), ctx=_LOAD))
 
     return ast.Call(func=fn_expr, args=compiled_args, keywords=compiled_keywords)
 
@@ -8544,7 +8097,7 @@ def compile_call_args(forms):
                     # Splat variable: *{opts} -> **spork_kwargs_dict(opts)
                     # Wrap in spork_kwargs_dict to convert Keyword keys to strings
                     wrapped = ast.Call(
-                        func=ast.Name(id="spork_kwargs_dict", ctx=ast.Load()),
+                        func=ast.Name(id="spork_kwargs_dict", ctx=_LOAD),
                         args=[compile_expr(val)],
                         keywords=[],
                     )
@@ -8587,6 +8140,148 @@ def compile_call_args(forms):
     return args, keywords
 
 
+# === Expression dispatch ===
+
+# Special forms with an expression-level compiler, keyed on the head symbol;
+# each takes (args, form_loc). Other list forms are operators or calls.
+_EXPR_DISPATCH = _interned(
+    {
+        "quote": compile_quote_expr,
+        "quasiquote": compile_quasiquote_expr,
+        ".": compile_dot_form,
+        "if": compile_if_expr,
+        "do": compile_do_expr,
+        "let": compile_let_expr,
+        "fn": compile_fn_expr,
+        "call": compile_call_form,
+        "try": compile_try_expr,
+        "with": compile_with_expr,
+        "async-with": compile_async_with_expr,
+        "loop": compile_loop_expr,
+        "match": compile_match_expr,
+        "set!": compile_set_expr,
+        "throw": compile_throw_expr,
+        "yield": compile_yield_expr,
+        "yield-from": compile_yield_from_expr,
+        "await": compile_await_expr,
+        "apply": compile_apply,
+    }
+)
+
+# Expression compilers keyed on the exact type of the form; compile_expr
+# looks a form up here, and _resolve_expr_compiler matches subclasses by
+# isinstance in this order and caches the result
+_EXPR_TYPE_DISPATCH: dict[type, Any] = {
+    bool: _compile_constant,
+    type(None): _compile_constant,
+    int: _compile_constant,
+    float: _compile_constant,
+    str: _compile_constant,
+    SourceList: _compile_list_expr,
+    list: _compile_list_expr,
+    Symbol: compile_symbol_expr,
+    Keyword: _compile_keyword_expr,
+    VectorLiteral: _compile_vector_literal,
+    MapLiteral: _compile_map_literal,
+    SetLiteral: _compile_set_literal,
+    Vector: _compile_vector_value,
+    Map: _compile_map_value,
+    Cons: _compile_cons_value,
+    SliceLiteral: _compile_slice_literal,
+    AnonFnLiteral: compile_anon_fn_literal,
+    FStringLiteral: compile_fstring_literal,
+    PathLiteral: _compile_path_literal,
+    RegexLiteral: _compile_regex_literal,
+    UUIDLiteral: _compile_uuid_literal,
+    InstLiteral: compile_inst_literal,
+    ReadTimeEval: compile_read_time_eval,
+}
+
+
+# === Statement dispatch ===
+
+# Special forms with a statement-level compiler, keyed on the head symbol;
+# compile_stmt looks the head up here, other forms compile as expressions
+_STMT_DISPATCH = _interned(
+    {
+        "if": compile_if_stmt,
+        "do": compile_do_stmt,
+        "def": compile_def,
+        "defn": compile_defn,
+        "defclass": compile_defclass,
+        "let": compile_let_stmt,
+        "while": compile_while,
+        "for": compile_for,
+        "async-for": compile_async_for,
+        "await": compile_await,
+        "loop": compile_loop,
+        "with": compile_with,
+        "async-with": compile_async_with,
+        "yield": compile_yield,
+        "yield-from": compile_yield_from,
+        "try": compile_try,
+        "return": compile_return,
+        "throw": compile_throw,
+        "set!": compile_set,
+    }
+)
+
+# Forms in the tail of a let/do/with body that have a variant returning
+# their own value; _compile_tail_return looks the head up here
+_TAIL_DISPATCH = _interned(
+    {
+        "try": compile_try_stmt_with_return,
+        "with": compile_with_stmt_with_return,
+        "async-with": compile_async_with_stmt_with_return,
+        "loop": compile_loop_stmt_with_return,
+    }
+)
+
+# Statement-only forms: compiled as statements when they end a function body,
+# which then returns None
+_TAIL_STMT_ONLY = _interned({"while", "for", "async-for", "set!"})
+
+
+def _compile_tail_return(last_form):
+    """
+    Compile the last form of a function-wrapped body into statements that
+    return its value.
+    """
+    stmts = []
+    if isinstance(last_form, list) and last_form and isinstance(last_form[0], Symbol):
+        head_name = last_form[0].name
+        compile_fn = _TAIL_DISPATCH.get(head_name)
+        if compile_fn is not None:
+            _extend_stmt(stmts, compile_fn(last_form[1:]))
+            return stmts
+        if head_name in _TAIL_STMT_ONLY:
+            _extend_stmt(stmts, compile_stmt(last_form))
+            stmts.append(ast.Return(value=None))
+            return stmts
+        if head_name == "return":
+            _extend_stmt(stmts, compile_stmt(last_form))
+            return stmts
+    stmts.append(ast.Return(value=compile_expr(last_form)))
+    return stmts
+
+
+def _compile_stmts(forms, out):
+    """Compile each of forms as a statement into out."""
+    for f in forms:
+        _extend_stmt(out, compile_stmt(f))
+
+
+def _compile_leading_stmts(forms, out):
+    """
+    Compile all but the last of a non-empty body's forms as statements
+    into out, and return the last form for the caller to place.
+    """
+    last = len(forms) - 1
+    for i in range(last):
+        _extend_stmt(out, compile_stmt(forms[i]))
+    return forms[last]
+
+
 # === Execution helpers ===
 
 
@@ -8619,7 +8314,8 @@ def compile_forms_to_code(src: str, filename: str = "<string>"):
     # Phase 2: Macroexpand with local macro environment
     forms = macroexpand_all(forms, local_macro_env)
     # Phase 3 & 4: Analyze & Lower
-    mod = compile_module(forms, filename=filename)
+    source_hash = hashlib.sha256(src.encode("utf-8", "surrogatepass")).hexdigest()
+    mod = compile_module(forms, filename=filename, source_hash=source_hash)
     code = compile(mod, filename, "exec")
     return code, local_macro_env
 
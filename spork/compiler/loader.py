@@ -12,6 +12,7 @@ Cache invalidation happens when:
 """
 
 import ast
+import hashlib
 import importlib.abc
 import importlib.util
 import json
@@ -230,7 +231,8 @@ def compile_file_to_python(src: str, src_path: str) -> tuple[str, dict[str, Any]
     forms = macroexpand_all(forms, local_macro_env)
 
     # Phase 3 & 4: Analyze & Lower to AST
-    mod = compile_module(forms, filename=src_path)
+    source_hash = hashlib.sha256(src.encode("utf-8", "surrogatepass")).hexdigest()
+    mod = compile_module(forms, filename=src_path, source_hash=source_hash)
 
     # Generate Python source
     python_source = ast.unparse(mod)
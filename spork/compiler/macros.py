@@ -17,6 +17,9 @@ import os
 from typing import Any, Callable
 
 from spork.runtime.core import (
+    _MATCH_SEQ_TYPES,
+    _match_seq_eq,
+    _match_seq_ge,
     add,
     assoc,
     concat,
@@ -105,12 +108,17 @@ from spork.runtime.pds import (
     vec_i64,
 )
 from spork.runtime.types import (
+    _MATCH_LITERAL_TYPES,
+    _MISSING,
     Decorated,
     Keyword,
     MapLiteral,
+    MatchError,
     SetLiteral,
     Symbol,
     VectorLiteral,
+    _match_literal_case,
+    _match_seq_len_eq,
 )
 
 # =============================================================================
@@ -674,6 +682,15 @@ def init_macro_exec_env():
         "_star_": mul,
         "_slash_": div,
         "apply": lambda f, args: f(*args),
+        # Runtime helpers emitted by match codegen
+        "MatchError": MatchError,
+        "_MISSING": _MISSING,
+        "_match_seq_len_eq": _match_seq_len_eq,
+        "_match_seq_eq": _match_seq_eq,
+        "_match_seq_ge": _match_seq_ge,
+        "_MATCH_SEQ_TYPES": _MATCH_SEQ_TYPES,
+        "_match_literal_case": _match_literal_case,
+        "_MATCH_LITERAL_TYPES": _MATCH_LITERAL_TYPES,
     }
 
 
@@ -23,6 +23,7 @@ The reader produces forms using types from spork.runtime.types:
 """
 
 import ast
+import sys
 from dataclasses import dataclass
 from typing import Any, Optional, TypeVar
 
@@ -909,13 +910,20 @@ class Reader:
             return False
         if tok_value == "nil":
             return None
-        # keyword
+        # keyword (names are interned so the compiler's name tables and
+        # comparisons against them can match by identity)
         if tok_value.startswith(":") and len(tok_value) > 1:
             return Keyword(
-                tok_value[1:], tok_line, tok_col, tok_line, tok_col + len(tok_value)
+                sys.intern(tok_value[1:]),
+                tok_line,
+                tok_col,
+                tok_line,
+                tok_col + len(tok_value),
             )
         # symbol
-        return Symbol(tok_value, tok_line, tok_col, tok_line, tok_col + len(tok_value))
+        return Symbol(
+            sys.intern(tok_value), tok_line, tok_col, tok_line, tok_col + len(tok_value)
+        )
 
 
 # =============================================================================
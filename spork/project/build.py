@@ -27,6 +27,7 @@ SKIP_DIRS = {
     ".git",
     "__pycache__",
     ".spork-out",
+    ".spork-cache",
     "build",
     "dist",
     ".eggs",
@@ -351,28 +352,41 @@ def build_project(
         print(f"Source roots: {[str(r) for r in source_roots]}")
         print()
 
-    # Discover and compile all .spork files
-    results = []
+    # Reuse compiled defn ASTs from previous builds of unchanged sources
+    from spork.compiler.codegen import (
+        disable_ast_cache,
+        enable_ast_cache,
+        get_ast_cache_stats,
+    )
 
-    for source_root in source_roots:
-        if not source_root.exists():
-            continue
+    enable_ast_cache(project_root / ".spork-cache" / "ast")
+    try:
+        # Discover and compile all .spork files
+        results = []
+
+        for source_root in source_roots:
+            if not source_root.exists():
+                continue
+
+            spork_files = discover_spork_files(source_root)
 
-        spork_files = discover_spork_files(source_root)
+            for spork_path in spork_files:
+                if verbose:
+                    rel_path = spork_path.relative_to(project_root)
+                    print(f"Compiling {rel_path}...", end=" ")
 
-        for spork_path in spork_files:
-            if verbose:
-                rel_path = spork_path.relative_to(project_root)
-                print(f"Compiling {rel_path}...", end=" ")
+                result = compile_module(spork_path, source_root, out_dir)
+                results.append(result)
 
-            result = compile_module(spork_path, source_root, out_dir)
-            results.append(result)
+                if verbose:
+                    if result.success:
+                        print("✓")
+                    else:
+                        print(f"✗ {result.error}")
 
-            if verbose:
-                if result.success:
-                    print("✓")
-                else:
-                    print(f"✗ {result.error}")
+        cache_stats = get_ast_cache_stats()
+    finally:
+        disable_ast_cache()
 
     # Generate pyproject.toml
     generate_pyproject_toml(out_dir, project_root)
@@ -387,6 +401,7 @@ def build_project(
     if verbose:
         print()
         print(f"Build complete: {success_count} succeeded, {failure_count} failed")
+        print(f"AST cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
 
     return ProjectBuildResult(
         out_dir=out_dir,
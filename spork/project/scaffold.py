@@ -178,6 +178,7 @@ def generate_gitignore() -> str:
 .venv/
 target/
 dist/
+.spork-cache/
 *.egg-info/
 
 # Python
@@ -20,9 +20,12 @@ from typing import Any, TypeVar, Union
 
 # Re-export core functions
 from spork.runtime.core import (
+    _MATCH_SEQ_TYPES,
     _PROTOCOL_IMPLS,
     _PROTOCOLS,
     LazySeq,
+    _match_seq_eq,
+    _match_seq_ge,
     add,
     assoc,
     assoc_bang,
@@ -169,6 +172,7 @@ from spork.runtime.pds import (  # pyright: ignore[reportMissingModuleSource]
 
 # Re-export types
 from spork.runtime.types import (
+    _MATCH_LITERAL_TYPES,
     _MISSING,
     Decorated,
     Keyword,
@@ -178,6 +182,8 @@ from spork.runtime.types import (
     SetLiteral,
     Symbol,
     VectorLiteral,
+    _match_literal_case,
+    _match_seq_len_eq,
 )
 
 # Re-export utils
@@ -235,6 +241,12 @@ __all__ = [
     "Decorated",
     "MatchError",
     "_MISSING",
+    "_match_seq_len_eq",
+    "_MATCH_SEQ_TYPES",
+    "_match_seq_eq",
+    "_match_seq_ge",
+    "_match_literal_case",
+    "_MATCH_LITERAL_TYPES",
     # Persistent data structures
     "Vector",
     "Map",
@@ -497,6 +497,46 @@ def nth(coll, index, default=_MISSING):
         return default
 
 
+# Sequence types whose truthiness is exactly "has elements" (empty [] patterns)
+_MATCH_SEQ_TYPES = frozenset({list, tuple, Vector})
+
+
+# Unordered collections, which never match a non-empty vector pattern
+_MATCH_UNORDERED_TYPES = (Map, Set, TransientMap, TransientSet, dict, set, frozenset)
+
+
+def _match_seq_eq(v, n):
+    """
+    Vector-pattern helper: return v as something indexable by position if it
+    is an ordered iterable with exactly n elements, else None. Cons cells are
+    copied to a tuple so the pattern can subscript instead of walking with nth.
+    """
+    t = type(v)
+    if t is list or t is tuple:
+        return v if len(v) == n else None
+    if (
+        not hasattr(v, "__iter__")
+        or isinstance(v, _MATCH_UNORDERED_TYPES)
+        or len(v) != n
+    ):
+        return None
+    return tuple(v) if isinstance(v, Cons) else v
+
+
+def _match_seq_ge(v, n):
+    """Like _match_seq_eq, but for patterns with & rest: at least n elements."""
+    t = type(v)
+    if t is list or t is tuple:
+        return v if len(v) >= n else None
+    if (
+        not hasattr(v, "__iter__")
+        or isinstance(v, _MATCH_UNORDERED_TYPES)
+        or len(v) < n
+    ):
+        return None
+    return tuple(v) if isinstance(v, Cons) else v
+
+
 def conj(coll, val):
     """Add an element to a collection."""
     if coll is None:
@@ -1514,6 +1554,9 @@ __all__ = [
     "rest",
     "seq",
     "nth",
+    "_MATCH_SEQ_TYPES",
+    "_match_seq_eq",
+    "_match_seq_ge",
     "conj",
     "assoc",
     "dissoc",
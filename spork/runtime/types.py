@@ -9,6 +9,8 @@ This module contains the fundamental types used by both the runtime and compiler
 - SetLiteral: AST representation of set literals #{...}
 - Decorated: Represents decorator expressions (^decorator or ^(decorator args))
 - MatchError: Exception raised when pattern matching fails
+- _match_seq_len_eq: Sequence-shape check for vector patterns
+- _match_literal_case: Literal-case lookup for switched match expressions
 - normalize_name: Converts Lisp-style names to valid Python identifiers
 
 These types are used by the reader/parser to represent Spork forms,
@@ -16,6 +18,7 @@ and by the runtime for values that exist at execution time.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 # Sentinel for missing values
@@ -28,33 +31,54 @@ class MatchError(Exception):
     pass
 
 
+def _match_seq_len_eq(v: Any, n: int) -> bool:
+    """Check that v is iterable with exactly n elements (vector patterns)."""
+    t = type(v)
+    return (t is list or t is tuple or hasattr(v, "__iter__")) and len(v) == n
+
+
+def _match_literal_case(v: Any, table: dict) -> int:
+    """
+    Find the case index for v in a literal switch table ({literal: index}),
+    comparing in case order with != like an unswitched literal pattern.
+    Returns -1 if no literal matches.
+    """
+    for literal, index in table.items():
+        if not v != literal:
+            return index
+    return -1
+
+
+# Special operator names that are valid Spork symbols but not valid
+# Python identifiers
+_SPECIAL_NAMES = {
+    "+": "_plus_",
+    "-": "_minus_",
+    "*": "_star_",
+    "/": "_slash_",
+    "=": "_eq_",
+    "<": "_lt_",
+    ">": "_gt_",
+    "<=": "_lte_",
+    ">=": "_gte_",
+    "!=": "_neq_",
+    "==": "_eqeq_",
+}
+
+
+@lru_cache(maxsize=65536)
 def normalize_name(name: str) -> str:
     """
     Normalize a Lisp-style identifier to a valid Python identifier.
 
     Converts hyphens to underscores and special characters to safe suffixes.
     This is the single source of truth used by both the compiler (codegen)
-    and the runtime (setup_runtime_env).
+    and the runtime (setup_runtime_env). Results are cached, since a module
+    normalizes the same few names over and over.
     """
-    # Handle special operator names that are valid Spork symbols
-    # but not valid Python identifiers
-    SPECIAL_NAMES = {
-        "+": "_plus_",
-        "-": "_minus_",
-        "*": "_star_",
-        "/": "_slash_",
-        "=": "_eq_",
-        "<": "_lt_",
-        ">": "_gt_",
-        "<=": "_lte_",
-        ">=": "_gte_",
-        "!=": "_neq_",
-        "==": "_eqeq_",
-    }
-
     # Check for exact match first (operators used as values)
-    if name in SPECIAL_NAMES:
-        return SPECIAL_NAMES[name]
+    if name in _SPECIAL_NAMES:
+        return _SPECIAL_NAMES[name]
 
     # Replace hyphens with underscores
     result = name.replace("-", "_")
@@ -343,6 +367,11 @@ class KwargsLiteral:
         return KwargsLiteral(self.pairs, line, col, end_line or line, end_col)
 
 
+# Value types whose == against literal patterns agrees with dict lookup, so
+# switched match expressions can use table.get() for them directly
+_MATCH_LITERAL_TYPES = frozenset({int, float, bool, str, type(None), Keyword})
+
+
 # Type exports
 __all__ = [
     "Symbol",
@@ -354,4 +383,7 @@ __all__ = [
     "KwargsLiteral",
     "MatchError",
     "_MISSING",
+    "_match_seq_len_eq",
+    "_match_literal_case",
+    "_MATCH_LITERAL_TYPES",
 ]
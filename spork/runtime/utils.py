@@ -16,8 +16,11 @@ from typing import Any, Optional
 
 # Import runtime components
 from spork.runtime.core import (
+    _MATCH_SEQ_TYPES,
     _PROTOCOL_IMPLS,
     _PROTOCOLS,
+    _match_seq_eq,
+    _match_seq_ge,
     add,
     assoc,
     assoc_bang,
@@ -137,6 +140,7 @@ from spork.runtime.pds import (  # pyright: ignore[reportMissingModuleSource]
     vec_i64,
 )
 from spork.runtime.types import (
+    _MATCH_LITERAL_TYPES,
     _MISSING,
     Decorated,
     Keyword,
@@ -145,6 +149,8 @@ from spork.runtime.types import (
     SetLiteral,
     Symbol,
     VectorLiteral,
+    _match_literal_case,
+    _match_seq_len_eq,
     normalize_name,
 )
 
@@ -613,6 +619,12 @@ def setup_runtime_env(env: dict[str, Any]) -> None:
     # Pattern matching
     env.setdefault("MatchError", MatchError)
     env.setdefault("_MISSING", _MISSING)
+    env.setdefault("_match_seq_len_eq", _match_seq_len_eq)
+    env.setdefault("_MATCH_SEQ_TYPES", _MATCH_SEQ_TYPES)
+    env.setdefault("_match_seq_eq", _match_seq_eq)
+    env.setdefault("_match_seq_ge", _match_seq_ge)
+    env.setdefault("_match_literal_case", _match_literal_case)
+    env.setdefault("_MATCH_LITERAL_TYPES", _MATCH_LITERAL_TYPES)
 
     # Namespace system runtime helpers
     env.setdefault("__spork_require__", __spork_require__)
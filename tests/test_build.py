@@ -0,0 +1,106 @@
+"""
+Test suite for spork.project.build.
+
+This module tests:
+- The on-disk defn AST cache across repeated project builds
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SOURCE = """\
+(ns app.core)
+
+(defn classify [x]
+  (match x
+    {:kind :point :x px} [:point px]
+    [a b] (+ a b)
+    _ :other))
+
+(defn greet [name]
+  (let [msg (str "hello " name)]
+    (if (= name "") :empty msg)))
+
+(def answer (classify {:kind :point :x 42}))
+"""
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Builds run in a fresh interpreter, as `spork build` does: the name
+# counters that are part of the cache key start from zero in each process.
+BUILD_SCRIPT = """\
+import json, sys
+from pathlib import Path
+from spork.compiler.codegen import get_ast_cache_stats
+from spork.project.build import build_project
+
+result = build_project(project_root=Path(sys.argv[1]), verbose=False)
+print(json.dumps({"success": result.success, "stats": get_ast_cache_stats()}))
+"""
+
+
+class TestAstCache(unittest.TestCase):
+    """Test that repeated builds reuse cached defn ASTs."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        src = self.root / "src" / "app"
+        src.mkdir(parents=True)
+        (src / "core.spork").write_text(SOURCE)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _build(self):
+        proc = subprocess.run(
+            [sys.executable, "-c", BUILD_SCRIPT, str(self.root)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        report = json.loads(proc.stdout)
+        self.assertTrue(report["success"])
+        output = (self.root / ".spork-out" / "app" / "core.py").read_text()
+        return output, report["stats"]
+
+    def test_second_build_hits_cache(self):
+        """Test that a rebuild hits the cache and produces identical output."""
+        first_output, first_stats = self._build()
+        self.assertEqual(first_stats, {"hits": 0, "misses": 2})
+
+        second_output, second_stats = self._build()
+        self.assertEqual(second_stats, {"hits": 2, "misses": 0})
+        self.assertEqual(first_output, second_output)
+
+    def test_cache_disabled_after_failed_build(self):
+        """Test that the cache is switched off even if the build raises."""
+        from spork.compiler import codegen
+        from spork.project.build import build_project
+
+        with mock.patch(
+            "spork.project.build.compile_module", side_effect=KeyboardInterrupt
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                build_project(project_root=self.root, verbose=False)
+        self.assertIsNone(codegen._ast_cache_dir)
+
+    def test_key_depends_on_compiler_sources(self):
+        """Test that changing any spork.compiler module changes the cache key."""
+        from spork.compiler import codegen
+        from spork.compiler.reader import read_str
+
+        form = read_str("(defn f [x] x)")[0]
+        key = codegen._defn_cache_key(form, "source")
+        with mock.patch.object(codegen, "_compiler_digest", return_value="edited"):
+            self.assertNotEqual(codegen._defn_cache_key(form, "source"), key)
+
+
+if __name__ == "__main__":
+    unittest.main()